@@ -0,0 +1,152 @@
+"""Benchmark a full verification run against synthetic pacts served by an in-process broker.
+
+    python -m benchmarks --consumers 20 --interactions 100 --body-depth 3 --rule-density 0.5
+
+Each phase of the run (fetch, emulate, verify, publish, notify) and the run as a whole are timed
+over several repeats, and the fastest and median times are reported. Use --json to get a report
+that can be stored and compared between commits.
+"""
+import argparse
+import json
+import statistics
+from typing import Dict, List
+
+from benchmarks.fake_broker import FakePactBroker
+from benchmarks.synthetic_pacts import generate_pacts
+
+from faaspact_verifier import profiler, use_verifier
+from faaspact_verifier.abc import NotificationGateway as NotificationGatewayABC
+from faaspact_verifier.context import Context, VERIFIER_CLASS_NAME_BY_NAME, verifier_class
+from faaspact_verifier.definitions import Pact, VerificationResult, VerifierOptions
+from faaspact_verifier.gateways import PactBrokerGateway
+from faaspact_verifier.types import EmulatorResult
+from faaspact_verifier.user_defined.loader import load_faasport_module
+
+
+PROVIDER = 'benchmark-provider'
+FAASPORT_MODULE = 'benchmarks.faasport'
+
+
+class SilentNotificationGateway(NotificationGatewayABC):
+
+    def announce_job_results(self,
+                             pacts: List[Pact],
+                             emulator_results_list: List[List[EmulatorResult]],
+                             verification_results_list: List[List[VerificationResult]],
+                             results_published: bool,
+                             succeeded: bool) -> None:
+        pass
+
+
+def main() -> None:
+    args = _parse_args()
+    pacts = generate_pacts(PROVIDER,
+                           args.consumers,
+                           args.interactions,
+                           args.body_depth,
+                           args.rule_density,
+                           args.seed)
+    faasport_module = load_faasport_module(FAASPORT_MODULE)
+
+    durations_by_phase: Dict[str, List[float]] = {}
+    with FakePactBroker(PROVIDER, pacts) as broker:
+        for _ in range(args.repeat):
+            context = Context(
+                notification_gateway=SilentNotificationGateway(),
+                pact_broker_gateway=PactBrokerGateway(broker.host,
+                                                      'benchmark',
+                                                      'benchmark',
+                                                      max_workers=args.fetch_workers,
+                                                      pacts_for_verification=(
+                                                          args.pacts_for_verification
+                                                      )),
+                verifier=verifier_class(args.verifier)()
+            )
+            with profiler.profiling(profiler.Profiler()) as run_profiler:
+                with run_profiler.span('total', 'phase'):
+                    succeeded = use_verifier(
+                        context,
+                        PROVIDER,
+                        faasport_module.provider_state_fixture_by_descriptor,
+                        faasport_module.faasport,
+                        publish_results=not args.no_publish,
+                        failon=frozenset(['master']),
+                        provider_version='benchmark',
+                        options=VerifierOptions(workers=args.workers,
+                                                faasport_module=FAASPORT_MODULE,
+                                                concurrency=args.concurrency,
+                                                stream=args.stream,
+                                                dedupe_interactions=args.dedupe_interactions)
+                    )
+            if not succeeded:
+                raise SystemExit('Verification of the synthetic pacts failed.')
+
+            for span in run_profiler.spans:
+                if span.category == 'phase':
+                    durations_by_phase.setdefault(span.name, []).append(span.duration)
+
+    report = {
+        'parameters': {key: value for key, value in vars(args).items() if key != 'json'},
+        'phases': {phase: {'min': min(durations), 'median': statistics.median(durations)}
+                   for phase, durations in durations_by_phase.items()}
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f'{len(pacts)} pacts x {args.interactions} interactions, '
+              f'best and median of {args.repeat} runs:')
+        for phase, timing in report['phases'].items():
+            print(f'  {phase:<22} {timing["min"] * 1000:>10.1f}ms '
+                  f'{timing["median"] * 1000:>10.1f}ms')
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Benchmark faaspact-verifier runs.')
+    parser.add_argument('--consumers', type=int, default=10, help='Number of pacts. (default=10)')
+    parser.add_argument('--interactions',
+                        type=int,
+                        default=50,
+                        help='Interactions per pact. (default=50)')
+    parser.add_argument('--body-depth',
+                        type=int,
+                        default=3,
+                        help='Levels of nested items in each response body. (default=3)')
+    parser.add_argument('--rule-density',
+                        type=float,
+                        default=0.5,
+                        help='Fraction of response body leaves with a matching rule. (default=0.5)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for matching rules. (default=0)')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs. (default=5)')
+    parser.add_argument('--verifier',
+                        choices=sorted(VERIFIER_CLASS_NAME_BY_NAME),
+                        default='pactman')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--fetch-workers', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--stream', action='store_true', default=False)
+    parser.add_argument('--pacts-for-verification', action='store_true', default=False)
+    parser.add_argument('--dedupe-interactions', action='store_true', default=False)
+    parser.add_argument('--no-publish',
+                        action='store_true',
+                        default=False,
+                        help='If true, don\'t publish verification results to the fake broker.')
+    parser.add_argument('--json',
+                        action='store_true',
+                        default=False,
+                        help='If true, print the report as JSON.')
+    args = parser.parse_args()
+
+    if args.body_depth < 1:
+        raise parser.error('--body-depth must be at least 1')
+
+    if not 0 <= args.rule_density <= 1:
+        raise parser.error('--rule-density must be between 0 and 1')
+
+    if args.repeat < 1:
+        raise parser.error('--repeat must be at least 1')
+
+    return args
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,2 @@
+# Importing the benchmark faasport registers it as the faasport of the whole test session.
+collect_ignore = ['__main__.py', 'faasport.py']
@@ -0,0 +1,20 @@
+from typing import Generator
+
+from benchmarks.synthetic_pacts import item_body, parse_item_path
+
+from faaspact_verifier import faasport, provider_state
+from faaspact_verifier.definitions import Request, Response
+
+
+@provider_state('an item exists')
+def an_item_exists(id: int) -> Generator:
+    yield
+
+
+@faasport
+def port(request: Request) -> Response:
+    return Response(
+        headers={'Content-Type': 'application/json'},
+        status=200,
+        body=item_body(*parse_item_path(request.path))
+    )
@@ -0,0 +1,140 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Dict, List, Optional, Tuple, Type
+
+from benchmarks.synthetic_pacts import SyntheticPact
+
+
+class FakePactBroker:
+    """An in-process stand-in for a pact broker that serves pacts over the HAL routes that
+    PactBrokerGateway uses:
+
+    - GET /pacts/provider/{provider}/latest[/{tag}]
+    - GET /pacts/provider/{provider}/consumer/{consumer}/version/{version}, with ETags
+    - GET /pacticipants/{consumer}/versions/{version}
+    - POST /pacts/provider/{provider}/for-verification, with 'latest' and 'latest for tag'
+      consumer version selectors
+    - POST /pacts/provider/{provider}/consumer/{consumer}/pact-version/{pact_version}/
+      verification-results
+
+    Every pact is the latest pact of its consumer and is tagged 'master'. Published verification
+    results are kept in `verification_results`.
+    """
+
+    def __init__(self, provider: str, pacts: List[SyntheticPact]) -> None:
+        self.provider = provider
+        self.pacts = pacts
+        self.verification_results: List[Tuple[str, Dict]] = []
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.broker = self  # type: ignore
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._responses = self._build_responses()
+
+    @property
+    def host(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def __enter__(self) -> 'FakePactBroker':
+        self._thread.start()
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc: Optional[BaseException],
+                 tb: Optional[TracebackType]) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _build_responses(self) -> Dict[str, Tuple[bytes, Optional[str]]]:
+        """Serialize every response body up front, so serving a request costs as little as
+        possible. Maps paths to bodies and their ETags."""
+        provider_path = f'/pacts/provider/{self.provider}'
+        responses: Dict[str, Tuple[bytes, Optional[str]]] = {}
+        pact_links = []
+        for pact in self.pacts:
+            pact_path = f'{provider_path}/consumer/{pact.consumer}/version/{pact.consumer_version}'
+            consumer_version_path = (f'/pacticipants/{pact.consumer}'
+                                     f'/versions/{pact.consumer_version}')
+            consumer_version_link = {'href': self.host + consumer_version_path,
+                                     'name': pact.consumer_version}
+            publish_path = (f'{provider_path}/consumer/{pact.consumer}'
+                            f'/pact-version/{pact.pact_version}/verification-results')
+            raw_pact = {
+                **pact.pact_json,
+                '_links': {
+                    'pb:consumer-version': consumer_version_link,
+                    'pb:publish-verification-results': {'href': self.host + publish_path}
+                }
+            }
+            responses[pact_path] = (json.dumps(raw_pact).encode(), f'"{pact.pact_version}"')
+            responses[consumer_version_path] = (json.dumps({
+                'number': pact.consumer_version,
+                '_embedded': {'tags': [{'name': 'master'}]}
+            }).encode(), None)
+            pact_links.append({'href': self.host + pact_path})
+
+        latest = json.dumps({'_links': {'pb:pacts': pact_links}}).encode()
+        responses[f'{provider_path}/latest'] = (latest, None)
+        responses[f'{provider_path}/latest/master'] = (latest, None)
+        responses[f'{provider_path}/for-verification'] = (json.dumps({'_embedded': {'pacts': [
+            {'shortDescription': 'latest', '_links': {'self': pact_link}}
+            for pact_link in pact_links
+        ]}}).encode(), None)
+        return responses
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    VERIFICATION_RESULTS_PATH = re.compile(
+        r'/pacts/provider/[^/]+/consumer/[^/]+/pact-version/(?P<pact_version>\w+)'
+        r'/verification-results'
+    )
+
+    def do_GET(self) -> None:
+        broker: FakePactBroker = self.server.broker  # type: ignore
+        if self.path not in broker._responses:
+            self._respond(404, b'{}')
+            return
+
+        body, etag = broker._responses[self.path]
+        if etag and self.headers.get('If-None-Match') == etag:
+            self._respond(304, b'', etag)
+        else:
+            self._respond(200, body, etag)
+
+    def do_POST(self) -> None:
+        broker: FakePactBroker = self.server.broker  # type: ignore
+        raw_body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.endswith('/for-verification') and self.path in broker._responses:
+            selectors = json.loads(raw_body)['consumerVersionSelectors']
+            if all(selector.get('tag') in (None, 'master') for selector in selectors):
+                self._respond(200, broker._responses[self.path][0])
+            else:
+                self._respond(200, b'{"_embedded": {"pacts": []}}')
+            return
+
+        match = self.VERIFICATION_RESULTS_PATH.fullmatch(self.path)
+        if not match:
+            self._respond(404, b'{}')
+            return
+
+        broker.verification_results.append((match.group('pact_version'), json.loads(raw_body)))
+        self._respond(201, raw_body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _respond(self, status: int, body: bytes, etag: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/hal+json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
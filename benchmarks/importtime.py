@@ -0,0 +1,113 @@
+"""Measure how long the faaspact-verifier CLI takes to import, with python -X importtime.
+
+    python -m benchmarks.importtime
+
+The CLI's cumulative import time and the slowest modules it imports are reported, along with any
+heavyweight modules it imports that should only be imported by the phases of a run that need
+them.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import List, NamedTuple
+
+
+CLI_MODULE = 'faaspact_verifier.delivery.cli'
+
+HEAVYWEIGHT_MODULES = frozenset({
+    'asyncio',
+    'colorama',
+    'multiprocessing',
+    'pactman',
+    'requests',
+    'sqlite3'
+})
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure(module: str = CLI_MODULE) -> List[ImportTime]:
+    """Import `module` in a fresh interpreter and return the import times of it and of every
+    module it imported, in the order their imports finished."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               stderr=subprocess.PIPE,
+                               universal_newlines=True,
+                               check=True)
+    import_times = [_parse_line(line)
+                    for line in completed.stderr.splitlines()
+                    if line.startswith('import time:') and 'self [us]' not in line]
+    end = max(index for index, import_time in enumerate(import_times)
+              if import_time.depth == 0 and import_time.module in _parents(module))
+    start = end
+    while start > 0 and import_times[start - 1].depth > 0:
+        start -= 1
+    return import_times[start:end + 1]
+
+
+def heavyweight_imports(import_times: List[ImportTime]) -> List[str]:
+    """The heavyweight modules that import_times include, or include submodules of."""
+    return sorted({import_time.module.split('.')[0] for import_time in import_times}
+                  & HEAVYWEIGHT_MODULES)
+
+
+def _parse_line(line: str) -> ImportTime:
+    """
+    >>> _parse_line('import time:       363 |      38724 |   faaspact_verifier.delivery')
+    ImportTime(module='faaspact_verifier.delivery', self_us=363, cumulative_us=38724, depth=1)
+    """
+    self_us, cumulative_us, name = line[len('import time:'):].split('|')
+    module = name.strip()
+    return ImportTime(module=module,
+                      self_us=int(self_us),
+                      cumulative_us=int(cumulative_us),
+                      depth=(len(name) - len(name.lstrip()) - 1) // 2)
+
+
+def _parents(module: str) -> List[str]:
+    parts = module.split('.')
+    return ['.'.join(parts[:index]) for index in range(1, len(parts) + 1)]
+
+
+def main() -> None:
+    args = _parse_args()
+    import_times = measure(args.module)
+    report = {
+        'module': args.module,
+        'cumulative_ms': sum(import_time.cumulative_us
+                             for import_time in import_times if import_time.depth == 0) / 1000,
+        'slowest': [{'module': import_time.module, 'self_ms': import_time.self_us / 1000}
+                    for import_time in sorted(import_times,
+                                              key=lambda import_time: -import_time.self_us)[:10]],
+        'heavyweight_imports': heavyweight_imports(import_times)
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f'import {args.module}: {report["cumulative_ms"]:.1f}ms')
+    for slow_import in report['slowest']:
+        print(f'  {slow_import["module"]:<50} {slow_import["self_ms"]:>8.1f}ms')
+    if report['heavyweight_imports']:
+        print(f'heavyweight imports: {", ".join(report["heavyweight_imports"])}')
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Measure the import time of a module.')
+    parser.add_argument('--module',
+                        default=CLI_MODULE,
+                        help=f'Module to import. (default={CLI_MODULE})')
+    parser.add_argument('--json',
+                        action='store_true',
+                        default=False,
+                        help='If true, print the report as JSON.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Measure the memory held by one large synthetic pact, as decoded whole and as the broker gateway
+loads it.
+
+    python -m benchmarks.memory --interactions 10000 --body-depth 3 --rule-density 0.5
+
+'decoded' is the pact decoded whole with json.loads, which is the least a pact held when its
+interactions were plucked from, and shared the objects of, its raw pact_json. 'streamed' is the
+pact as the broker gateway loads it: decoded from its body in chunks into compact interactions
+that share interned strings, header mappings and matching rules. For each, the memory still held
+once the pact is loaded and the peak while loading it are reported.
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Callable, Dict, Iterator
+
+from benchmarks.synthetic_pacts import generate_pacts
+
+from faaspact_verifier.definitions import Pact
+from faaspact_verifier.gateways.pact_stream import CHUNK_SIZE, load_pact
+
+
+def measure(interactions: int,
+            body_depth: int,
+            rule_density: float,
+            seed: int = 0) -> Dict[str, Dict[str, int]]:
+    """Bytes held once the pact is loaded, and the peak while loading it, for each way of
+    loading it."""
+    synthetic_pact = generate_pacts('provider', 1, interactions, body_depth, rule_density, seed)[0]
+    body = json.dumps(synthetic_pact.pact_json).encode()
+    del synthetic_pact
+
+    def decoded() -> Pact:
+        return Pact('1', json.loads(body), 'x')
+
+    def streamed() -> Pact:
+        pact_fields, pact_interactions = load_pact(_iter_chunks(body))
+        return Pact.with_interactions(pact_interactions, '1', pact_fields, 'x')
+
+    return {'decoded': _measure_load(decoded), 'streamed': _measure_load(streamed)}
+
+
+def _measure_load(load: Callable[[], Pact]) -> Dict[str, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        pact = load()
+        gc.collect()
+        held, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert pact.interactions
+    return {'held': held, 'peak': peak}
+
+
+def _iter_chunks(body: bytes) -> Iterator[bytes]:
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield body[start:start + CHUNK_SIZE]
+
+
+def main() -> None:
+    args = _parse_args()
+    report = measure(args.interactions, args.body_depth, args.rule_density, args.seed)
+    if args.json:
+        print(json.dumps({'parameters': {key: value for key, value in vars(args).items()
+                                         if key != 'json'},
+                          'memory': report}, indent=2))
+        return
+
+    print(f'1 pact x {args.interactions} interactions:')
+    print(f'  {"":<10} {"held":>10} {"peak":>10}')
+    for way, usage in report.items():
+        print(f'  {way:<10} {usage["held"] / 2 ** 20:>8.1f}MB {usage["peak"] / 2 ** 20:>8.1f}MB')
+    print(f'  streamed holds {report["streamed"]["held"] / report["decoded"]["held"]:.0%} '
+          'of decoded')
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Measure the memory held by a large pact.')
+    parser.add_argument('--interactions',
+                        type=int,
+                        default=10000,
+                        help='Interactions in the pact. (default=10000)')
+    parser.add_argument('--body-depth',
+                        type=int,
+                        default=3,
+                        help='Levels of nested items in each response body. (default=3)')
+    parser.add_argument('--rule-density',
+                        type=float,
+                        default=0.5,
+                        help='Fraction of response body leaves with a matching rule. (default=0.5)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for matching rules. (default=0)')
+    parser.add_argument('--json',
+                        action='store_true',
+                        default=False,
+                        help='If true, print the report as JSON.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main()
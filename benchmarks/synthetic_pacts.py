@@ -0,0 +1,119 @@
+import hashlib
+import json
+import random
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+
+class SyntheticPact(NamedTuple):
+    consumer: str
+    consumer_version: str
+    pact_version: str
+    pact_json: Dict
+
+
+def generate_pacts(provider: str,
+                   consumers: int,
+                   interactions: int,
+                   body_depth: int,
+                   rule_density: float,
+                   seed: int = 0) -> List[SyntheticPact]:
+    """Generate one pact per consumer with `interactions` interactions each. Every response body
+    nests `body_depth` levels of items, and roughly `rule_density` of its leaves have a matching
+    rule. Bodies are derived from the request path alone, so benchmarks.faasport can respond to
+    every interaction without knowing the pacts.
+    """
+    rng = random.Random(seed)
+    pacts: List[SyntheticPact] = []
+    for consumer_index in range(consumers):
+        consumer = f'consumer-{consumer_index}'
+        pact_json = {
+            'consumer': {'name': consumer},
+            'provider': {'name': provider},
+            'interactions': [_generate_interaction(consumer_index, index, body_depth,
+                                                   rule_density, rng)
+                             for index in range(interactions)],
+            'metadata': {'pactSpecification': {'version': '3.0.0'}}
+        }
+        pact_version = hashlib.sha1(json.dumps(pact_json, sort_keys=True).encode()).hexdigest()
+        pacts.append(SyntheticPact(consumer, '1.0.0', pact_version, pact_json))
+    return pacts
+
+
+def item_body(consumer: int, index: int, depth: int) -> Dict:
+    """The body that the provider responds to an item request with.
+
+    >>> item_body(0, 1, 2)['child']['id']
+    2
+    """
+    body = {
+        'id': index,
+        'name': f'item-{consumer}-{index}',
+        'price': index * 0.5 + consumer,
+        'available': index % 2 == 0,
+        'tags': ['new']
+    }
+    if depth > 1:
+        body['child'] = item_body(consumer, index + 1, depth - 1)
+    return body
+
+
+def item_path(consumer: int, index: int, depth: int) -> str:
+    return f'/items/{consumer}/{index}/{depth}'
+
+
+def parse_item_path(path: str) -> Tuple[int, int, int]:
+    """
+    >>> parse_item_path(item_path(3, 14, 2))
+    (3, 14, 2)
+    """
+    _, _, consumer, index, depth = path.split('/')
+    return int(consumer), int(index), int(depth)
+
+
+def _generate_interaction(consumer: int,
+                          index: int,
+                          body_depth: int,
+                          rule_density: float,
+                          rng: random.Random) -> Dict:
+    body = item_body(consumer, index, body_depth)
+    response = {
+        'status': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'body': body
+    }
+    body_rules = {path: {'matchers': [_matcher(value)]}
+                  for path, value in _iter_leaves(body, '$')
+                  if rng.random() < rule_density}
+    if body_rules:
+        response['matchingRules'] = {'body': body_rules}
+
+    return {
+        'description': f'a request for item {index}',
+        'providerStates': [{'name': 'an item exists', 'params': {'id': index}}],
+        'request': {'method': 'GET', 'path': item_path(consumer, index, body_depth)},
+        'response': response
+    }
+
+
+def _iter_leaves(body: Dict, path: str) -> Iterator[Tuple[str, object]]:
+    """
+    >>> list(_iter_leaves({'a': 1, 'b': {'c': [2]}}, '$'))
+    [('$.a', 1), ('$.b.c', [2])]
+    """
+    for key, value in body.items():
+        if isinstance(value, dict):
+            yield from _iter_leaves(value, f'{path}.{key}')
+        else:
+            yield f'{path}.{key}', value
+
+
+def _matcher(value: object) -> Dict:
+    if isinstance(value, bool):
+        return {'match': 'type'}
+    if isinstance(value, int):
+        return {'match': 'integer'}
+    if isinstance(value, float):
+        return {'match': 'decimal'}
+    if isinstance(value, str):
+        return {'regex': r'[\w-]+'}
+    return {'match': 'type', 'min': 1}
@@ -0,0 +1,38 @@
+from benchmarks.fake_broker import FakePactBroker
+from benchmarks.synthetic_pacts import generate_pacts
+
+import pytest
+
+from faaspact_verifier.definitions import VerificationResult
+from faaspact_verifier.gateways import PactBrokerGateway
+
+
+class TestFakePactBroker:
+
+    @pytest.mark.parametrize('pacts_for_verification', [False, True])  # type: ignore
+    def test_serves_pacts_to_and_receives_results_from_pact_broker_gateway(
+            self,
+            pacts_for_verification: bool
+    ) -> None:
+        # Given
+        synthetic_pacts = generate_pacts('provider', consumers=2, interactions=3, body_depth=2,
+                                         rule_density=0.5)
+
+        with FakePactBroker('provider', synthetic_pacts) as broker:
+            gateway = PactBrokerGateway(broker.host, 'username', 'password',
+                                        pacts_for_verification=pacts_for_verification)
+
+            # When
+            pacts = gateway.fetch_provider_pacts('provider')
+            gateway.provide_verification_results('1.0', pacts[0], [VerificationResult(True)])
+
+        # Then
+        assert [(pact.consumer_name, pact.pact_version, pact.tags, len(pact.interactions))
+                for pact in pacts] == [
+            (synthetic_pact.consumer, synthetic_pact.pact_version, frozenset({'master'}), 3)
+            for synthetic_pact in synthetic_pacts
+        ]
+        assert broker.verification_results == [
+            (synthetic_pacts[0].pact_version,
+             {'success': True, 'providerApplicationVersion': '1.0'})
+        ]
@@ -0,0 +1,19 @@
+from benchmarks.importtime import heavyweight_imports, measure
+
+
+class TestCliImportTime:
+
+    def test_cli_imports_no_heavyweight_modules(self) -> None:
+        # When
+        import_times = measure('faaspact_verifier.delivery.cli')
+
+        # Then
+        assert import_times[-1].module == 'faaspact_verifier.delivery.cli'
+        assert heavyweight_imports(import_times) == []
+
+    def test_finds_heavyweight_modules_imported_by_other_modules(self) -> None:
+        # When
+        import_times = measure('faaspact_verifier.gateways.pact_broker_gateway')
+
+        # Then
+        assert heavyweight_imports(import_times) == ['requests']
@@ -0,0 +1,12 @@
+from benchmarks.memory import measure
+
+
+class TestMeasure:
+
+    def test_streamed_pacts_hold_less_memory_than_decoded_pacts(self) -> None:
+        # When
+        report = measure(interactions=200, body_depth=2, rule_density=0.5)
+
+        # Then
+        assert report['streamed']['held'] < report['decoded']['held']
+        assert report['streamed']['peak'] < report['decoded']['peak']
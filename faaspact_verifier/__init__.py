@@ -1,2 +1,6 @@
+__version__ = '0.0.7'
+
+from .definitions import VerifierOptions
 from .use_verifier import use_verifier
+from .use_watcher import use_watcher
 from .user_defined import always, faasport, provider_state
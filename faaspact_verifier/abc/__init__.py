@@ -1,3 +1,4 @@
 from .notification_gateway import NotificationGateway
 from .pact_broker_gateway import PactBrokerGateway
+from .verification_ledger import VerificationLedger
 from .verifier import Verifier
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import FrozenSet, List, Optional, Tuple
 
 from faaspact_verifier.definitions import Pact, VerificationResult
+from faaspact_verifier.exceptions import PactBrokerError
 from faaspact_verifier.types import EmulatorResult
 
 
@@ -15,3 +16,67 @@ class NotificationGateway(ABC):
                              results_published: bool,
                              succeeded: bool) -> None:
         ...
+
+    def announce_publish_failure(self, pact: Pact, error: PactBrokerError) -> None:
+        """Called for each pact whose verification results could not be published. Does nothing by
+        default.
+        """
+
+    def announce_interaction_result(self,
+                                    pact: Pact,
+                                    interaction_index: int,
+                                    emulator_result: Optional[EmulatorResult],
+                                    verification_result: VerificationResult) -> None:
+        """Called for each interaction of a pact once the pact has been verified, just before
+        `announce_pact_results` is called for the pact. The emulator result is None if the
+        verification result was reused from the verification ledger. `interaction_index` indexes
+        `pact.interactions`, and `pact.interaction_index` maps it to the interaction's index in the
+        pact as published. Does nothing by default.
+        """
+
+    def announce_pact_results(self,
+                              pact: Pact,
+                              emulator_results: List[EmulatorResult],
+                              verification_results: List[VerificationResult]) -> None:
+        """Called for a single pact once it has been verified. A streaming job calls it as soon
+        as the pact is verified, but a batch job only once every pact has been verified. By
+        default the pact's results are held until `announce_job_summary`, which hands them all to
+        `announce_job_results`.
+        """
+        # Set lazily so that subclasses needn't call super().__init__.
+        pending: List[_PactResults] = self.__dict__.setdefault('_pending_pact_results', [])
+        pending.append((pact, emulator_results, verification_results))
+
+    def announce_job_summary(self, results_published: bool, succeeded: bool) -> None:
+        """Called once every pact has been announced with `announce_pact_results`."""
+        pending: List[_PactResults] = self.__dict__.pop('_pending_pact_results', [])
+        self.announce_job_results(
+            pacts=[pact for pact, _, _ in pending],
+            emulator_results_list=[emulator_results for _, emulator_results, _ in pending],
+            verification_results_list=[verification_results
+                                       for _, _, verification_results in pending],
+            results_published=results_published,
+            succeeded=succeeded
+        )
+
+    def announce_watch_cycle(self,
+                             changed_paths: FrozenSet[str],
+                             interaction_count: int,
+                             total_interaction_count: int) -> None:
+        """Called in watch mode before interactions are emulated again, with the source files
+        whose changes were just reloaded (none on the first cycle) and how many of all the
+        interactions they could affect. Does nothing by default.
+        """
+
+    def announce_reload_failure(self, formatted_error: str) -> None:
+        """Called in watch mode when changed source files fail to reload, with the formatted
+        traceback. Does nothing by default.
+        """
+
+    def close(self) -> None:
+        """Called once the job is over, even if it raised before it was summarized, to release
+        whatever the gateway holds open. Does nothing by default.
+        """
+
+
+_PactResults = Tuple[Pact, List[EmulatorResult], List[VerificationResult]]
@@ -1,15 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import FrozenSet, Iterator, List, Optional
 
 from faaspact_verifier.definitions import Pact, VerificationResult
+from faaspact_verifier.exceptions import PactBrokerError
 
 
 class PactBrokerGateway(ABC):
     """Gateway to a pact broker."""
 
     @abstractmethod
-    def fetch_provider_pacts(self, provider: str) -> List[Pact]:
-        ...
+    def fetch_provider_pacts(self,
+                             provider: str,
+                             consumers: FrozenSet[str] = frozenset(),
+                             tags: FrozenSet[str] = frozenset()) -> List[Pact]:
+        """Fetch a provider's pacts. If `consumers` are given, only their pacts are fetched. If
+        `tags` are given, the latest pact for each of the tags is fetched instead of the default
+        selection.
+        """
+
+    def iter_provider_pacts(self,
+                            provider: str,
+                            consumers: FrozenSet[str] = frozenset(),
+                            tags: FrozenSet[str] = frozenset()) -> Iterator[Pact]:
+        """Yield a provider's pacts as they become available. Unlike fetch_provider_pacts, pacts
+        that share a pact version may be yielded more than once.
+        """
+        return iter(self.fetch_provider_pacts(provider, consumers, tags))
 
     @abstractmethod
     def provide_verification_results(self,
@@ -17,3 +33,23 @@ class PactBrokerGateway(ABC):
                                      pact: Pact,
                                      verification_results: List[VerificationResult]) -> None:
         ...
+
+    def provide_pacts_verification_results(
+            self,
+            provider_version: str,
+            pacts: List[Pact],
+            verification_results_list: List[List[VerificationResult]]
+    ) -> List[Optional[PactBrokerError]]:
+        """Publish the verification results of several pacts, returning the PactBrokerError that
+        publishing each pact failed with, or None where it succeeded. Publishing carries on past a
+        failed pact.
+        """
+        errors: List[Optional[PactBrokerError]] = []
+        for pact, verification_results in zip(pacts, verification_results_list):
+            try:
+                self.provide_verification_results(provider_version, pact, verification_results)
+            except PactBrokerError as e:
+                errors.append(e)
+            else:
+                errors.append(None)
+        return errors
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from faaspact_verifier.definitions import VerificationResult
+
+
+class VerificationLedger(ABC):
+    """Record of pacts that passed verification against a version of the provider's code."""
+
+    @abstractmethod
+    def load(self, pact_version: str, fingerprint: str) -> Optional[List[VerificationResult]]:
+        """Load the verification results of a pass recorded for the pact version and provider
+        code fingerprint, if there is one.
+        """
+        ...
+
+    @abstractmethod
+    def record(self,
+               pact_version: str,
+               fingerprint: str,
+               verification_results: List[VerificationResult]) -> None:
+        ...
@@ -12,3 +12,14 @@ class Verifier(ABC):
                     pact: Pact,
                     emulator_results: List[EmulatorResult]) -> List[VerificationResult]:
         ...
+
+    def verify_pacts(
+            self,
+            pacts: List[Pact],
+            emulator_results_list: List[List[EmulatorResult]]
+    ) -> List[List[VerificationResult]]:
+        """Verify every pact of a run at once. Delegates to verify_pact by default; backends may
+        override it to share work across pacts.
+        """
+        return [self.verify_pact(pact, emulator_results)
+                for pact, emulator_results in zip(pacts, emulator_results_list)]
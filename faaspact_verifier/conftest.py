@@ -0,0 +1,64 @@
+import importlib
+import sys
+import textwrap
+from typing import Any, Generator
+
+import pytest
+
+from faaspact_verifier.user_defined.reloader import REGISTRY_NAMES_BY_MODULE
+
+
+HANDLERS_SOURCE = textwrap.dedent('''
+    from faaspact_verifier.definitions import Response
+
+    def get_egg(request):
+        return Response(headers={}, status=200, body={'egg': 'hümpty'})
+
+    def get_user(request):
+        return Response(headers={}, status=200, body={'user': 'gabe'})
+''')
+
+FAASPORT_SOURCE = textwrap.dedent('''
+    from faaspact_verifier import faasport, provider_state
+
+    from watched_provider.handlers import get_egg, get_user
+
+    @provider_state('there is an egg')
+    def there_is_an_egg():
+        yield
+
+    @faasport
+    def port(request):
+        return get_egg(request) if request.path == '/egg' else get_user(request)
+''')
+
+
+@pytest.fixture  # type: ignore
+def watched_provider(tmp_path: Any) -> Generator[Any, None, None]:
+    """A package with a faasport module, importable as watched_provider during the test. What it
+    registers is unregistered afterwards."""
+    package = tmp_path / 'watched_provider'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'handlers.py').write_text(HANDLERS_SOURCE)
+    (package / 'faasport.py').write_text(FAASPORT_SOURCE)
+    registries = {module_name: {name: _copy(getattr(importlib.import_module(module_name), name))
+                                for name in names}
+                  for module_name, names in REGISTRY_NAMES_BY_MODULE.items()}
+    sys.path.insert(0, str(tmp_path))
+    yield package
+    sys.path.remove(str(tmp_path))
+    for module_name in [name for name in sys.modules if name.startswith('watched_provider')]:
+        del sys.modules[module_name]
+    for module_name, values in registries.items():
+        for name, value in values.items():
+            registry_value = getattr(importlib.import_module(module_name), name)
+            if isinstance(registry_value, dict):
+                registry_value.clear()
+                registry_value.update(value)
+            else:
+                setattr(importlib.import_module(module_name), name, value)
+
+
+def _copy(value: Any) -> Any:
+    return dict(value) if isinstance(value, dict) else value
@@ -1,26 +1,64 @@
-from typing import NamedTuple
+from typing import Dict, List, NamedTuple, Optional, Type, cast
 
+from faaspact_verifier import gateways
 from faaspact_verifier.abc import (
     NotificationGateway as NotificationGatewayABC,
     PactBrokerGateway as PactBrokerGatewayABC,
+    VerificationLedger as VerificationLedgerABC,
     Verifier as VerifierABC
 )
-from faaspact_verifier.gateways import LoggerNotificationGateway, PactBrokerGateway, PactmanVerifier
+
+
+VERIFIER_CLASS_NAME_BY_NAME: Dict[str, str] = {
+    'native': 'NativeVerifier',
+    'pactman': 'PactmanVerifier'
+}
+
+
+def verifier_class(name: str) -> Type[VerifierABC]:
+    """The verifier class called `name`, which is only imported once it is asked for."""
+    return cast(Type[VerifierABC], getattr(gateways, VERIFIER_CLASS_NAME_BY_NAME[name]))
 
 
 class Context(NamedTuple):
     notification_gateway: NotificationGatewayABC
     pact_broker_gateway: PactBrokerGatewayABC
     verifier: VerifierABC
+    verification_ledger: Optional[VerificationLedgerABC] = None
+
 
+def create_default_context(host: str,
+                           username: str,
+                           password: str,
+                           fetch_workers: int = 1,
+                           broker_timeout: Optional[float] = None,
+                           pact_cache_dir: Optional[str] = None,
+                           verifier: str = 'pactman',
+                           publish_retries: int = 3,
+                           ledger_path: Optional[str] = None,
+                           junit_xml_path: Optional[str] = None,
+                           ndjson_path: Optional[str] = None,
+                           pacts_for_verification: bool = False) -> Context:
+    notification_gateways: List[NotificationGatewayABC] = [gateways.LoggerNotificationGateway()]
+    if junit_xml_path:
+        notification_gateways.append(gateways.JUnitNotificationGateway(junit_xml_path))
+    if ndjson_path:
+        notification_gateways.append(gateways.NdjsonNotificationGateway(ndjson_path))
 
-def create_default_context(host: str, username: str, password: str) -> Context:
     return Context(
-        notification_gateway=LoggerNotificationGateway(),
-        pact_broker_gateway=PactBrokerGateway(
+        notification_gateway=(gateways.CompositeNotificationGateway(notification_gateways)
+                              if len(notification_gateways) > 1 else notification_gateways[0]),
+        pact_broker_gateway=gateways.PactBrokerGateway(
             host=host,
             username=username,
-            password=password
+            password=password,
+            max_workers=fetch_workers,
+            timeout=broker_timeout,
+            pact_cache=gateways.PactCache(pact_cache_dir) if pact_cache_dir else None,
+            publish_retries=publish_retries,
+            pacts_for_verification=pacts_for_verification
         ),
-        verifier=PactmanVerifier()
+        verifier=verifier_class(verifier)(),
+        verification_ledger=(gateways.SqliteVerificationLedger(ledger_path)
+                             if ledger_path else None)
     )
@@ -1,19 +1,74 @@
-from typing import Any, Dict, FrozenSet, NamedTuple, Optional, Tuple, cast
+import sys
+import weakref
+from typing import Any, Dict, FrozenSet, NamedTuple, NoReturn, Optional, Tuple, cast
 
 
-class Response(NamedTuple):
+class FrozenDict(dict):
+    """A read-only dict. Interactions with the same headers or query share one of these, so it
+    can't be changed through any one of them, but it is still a dict to faasports and json alike.
+
+    >>> headers = FrozenDict({'Accept': '*/*'})
+    >>> headers['Accept'], headers == {'Accept': '*/*'}, isinstance(headers, dict)
+    ('*/*', True, True)
+    >>> headers['Accept'] = 'text/html'
+    Traceback (most recent call last):
+    TypeError: 'FrozenDict' object is read-only
+    """
+
+    __slots__ = ('__weakref__',)
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(f"'{type(self).__name__}' object is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self) -> Dict:
+        return dict(self)
+
+    def __hash__(self) -> int:  # type: ignore
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self) -> Tuple[type, Tuple[Dict]]:
+        return type(self), (dict(self),)
+
+
+EMPTY_MAPPING = FrozenDict()
+
+_shared_mappings: 'weakref.WeakValueDictionary[Tuple, FrozenDict]' = (
+    weakref.WeakValueDictionary()
+)
+
+
+class _ResponseFields(NamedTuple):
     headers: Dict
     status: int
     body: Optional[Dict] = None
     matching_rules: Optional[Dict] = None
 
 
+class Response(_ResponseFields):
+    """A response, either expected by a pact or returned by the provider. The emulator records on
+    the latter how long its interaction took, outside of the tuple fields, so equality is
+    unaffected.
+    """
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds it took to emulate the interaction, fixtures included, if known.
+
+        >>> Response({}, 200).duration is None
+        True
+        """
+        return cast(Optional[float], self.__dict__.get('duration'))
+
+
 class Request(NamedTuple):
     headers: Dict
     path: str
     method: str
     query: Optional[Dict] = None
-    body: Optional[str] = None
+    body: Any = None
 
 
 class ProviderState(NamedTuple):
@@ -25,17 +80,96 @@ class Interaction(NamedTuple):
     request: Request
     response: Response
     provider_states: Tuple[ProviderState, ...]
+    description: Optional[str] = None
 
 
-class Pact(NamedTuple):
+class _PactFields(NamedTuple):
     consumer_version: str
     pact_json: Dict
     pact_version: str
     tags: FrozenSet[str] = frozenset()
 
+
+class Pact(_PactFields):
+    """A pact fetched from the broker. Its interactions are plucked from pact_json on first access
+    and kept on the instance, outside of the tuple fields. A pact made with `with_interactions`
+    already has its interactions, and its pact_json leaves them out. Pacts are equal if their
+    fields and their interactions are.
+
+    A pact narrowed down to some of its interactions remembers where each of them is in the pact
+    as published, which is how they are reported (see `interaction_index`).
+
+    >>> a = Pact.with_interactions((), '1', {}, 'x')
+    >>> a == Pact('1', {}, 'x'), a == Pact('1', {'interactions': []}, 'x')
+    (True, False)
+    """
+
+    @classmethod
+    def with_interactions(cls,
+                          interactions: Tuple[Interaction, ...],
+                          consumer_version: str,
+                          pact_json: Dict,
+                          pact_version: str,
+                          tags: FrozenSet[str] = frozenset(),
+                          interaction_indexes: Optional[Tuple[int, ...]] = None) -> 'Pact':
+        """`interaction_indexes` are the indexes of the interactions in the pact as published,
+        if they were selected from it.
+
+        >>> pact = Pact.with_interactions((), '1', {'consumer': {'name': 'a'}}, 'x')
+        >>> pact.interactions, pact._replace(tags=frozenset({'master'})).interactions
+        ((), ())
+        """
+        pact = cls(consumer_version, pact_json, pact_version, tags)
+        pact.__dict__['_interactions'] = interactions
+        if interaction_indexes is not None:
+            pact.__dict__['_interaction_indexes'] = interaction_indexes
+        return pact
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Pact):
+            return super().__eq__(other)
+        return tuple.__eq__(self, other) and self.interactions == other.interactions
+
+    def __ne__(self, other: Any) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = _PactFields.__hash__
+
+    def _replace(self, **fields: Any) -> 'Pact':
+        """Like a namedtuple's _replace, but keeps the pact's interactions if they were given
+        rather than plucked from pact_json."""
+        pact = super()._replace(**fields)
+        if 'pact_json' not in fields and 'interactions' not in self.pact_json:
+            pact.__dict__.update(self.__dict__)
+        return pact
+
     @property
     def interactions(self) -> Tuple[Interaction, ...]:
-        return _pluck_interactions(self)
+        """
+        >>> pact = Pact('1', {'interactions': [{'request': {'path': '/', 'method': 'GET'},
+        ...                                     'response': {'status': 200}}]}, 'x')
+        >>> pact.interactions is pact.interactions
+        True
+        """
+        try:
+            return cast(Tuple[Interaction, ...], self.__dict__['_interactions'])
+        except KeyError:
+            interactions = _pluck_interactions(self)
+            self.__dict__['_interactions'] = interactions
+            return interactions
+
+    def interaction_index(self, index: int) -> int:
+        """The index in the pact as published of the interaction at `index`.
+
+        >>> pact = Pact.with_interactions((), '1', {}, 'x', interaction_indexes=(2, 5))
+        >>> pact.interaction_index(1)
+        5
+        >>> Pact('1', {}, 'x').interaction_index(1)
+        1
+        """
+        interaction_indexes = self.__dict__.get('_interaction_indexes')
+        return index if interaction_indexes is None else cast(int, interaction_indexes[index])
 
     @property
     def provider_name(self) -> str:
@@ -51,17 +185,47 @@ class VerificationResult(NamedTuple):
     reason: Optional[str] = None
 
 
-class Error(NamedTuple):
+class VerifierOptions(NamedTuple):
+    """How a verification run fetches, selects and emulates pacts, as set on the command line and
+    registered by the faasport module. See use_verifier."""
+    workers: int = 1
+    faasport_module: Optional[str] = None
+    concurrency: int = 1
+    group_provider_states: bool = False
+    provider_state_scope_by_descriptor: Dict[str, str] = {}
+    provider_state_parameter_names_by_descriptor: Dict[str, FrozenSet[str]] = {}
+    always_scope: str = 'interaction'
+    stream: bool = False
+    fingerprint: Optional[str] = None
+    dedupe_interactions: bool = False
+    nondeterministic_provider_states: FrozenSet[str] = frozenset()
+    consumers: FrozenSet[str] = frozenset()
+    tags: FrozenSet[str] = frozenset()
+    interaction_description: Optional[str] = None
+    provider_states: FrozenSet[str] = frozenset()
+
+
+class _ErrorFields(NamedTuple):
     message: str
     traceback: Optional[str] = None
 
 
+class Error(_ErrorFields):
+    """An error that kept the emulator from getting a response. Like a Response, it records how
+    long its interaction took outside of the tuple fields.
+    """
+
+    @property
+    def duration(self) -> Optional[float]:
+        return cast(Optional[float], self.__dict__.get('duration'))
+
+
 def _pluck_interactions(pact: Pact) -> Tuple[Interaction, ...]:
-    return tuple([_pluck_interaction(raw_interaction)
-                 for raw_interaction in pact.pact_json['interactions']])
+    return tuple([pluck_interaction(raw_interaction)
+                 for raw_interaction in pact.pact_json.get('interactions', ())])
 
 
-def _pluck_interaction(raw_interaction: Dict) -> Interaction:
+def pluck_interaction(raw_interaction: Dict) -> Interaction:
     raw_provider_states = raw_interaction.get('providerStates')
     if raw_provider_states:
         provider_states = tuple([_pluck_provider_state(raw_provider_state)
@@ -75,29 +239,109 @@ def _pluck_interaction(raw_interaction: Dict) -> Interaction:
     return Interaction(
         request=request,
         provider_states=provider_states,
-        response=response
+        response=response,
+        description=raw_interaction.get('description')
     )
 
 
 def _pluck_request(raw_request: Dict) -> Request:
     return Request(
-        headers=raw_request.get('headers', {}),
-        path=raw_request['path'],
-        method=raw_request['method'],
-        query=raw_request.get('query', {}),
-        body=raw_request.get('body', {})
+        headers=share_mapping(raw_request.get('headers')),
+        path=sys.intern(raw_request['path']),
+        method=sys.intern(raw_request['method']),
+        query=share_mapping(raw_request.get('query')),
+        body=raw_request.get('body', EMPTY_MAPPING)
     )
 
 
 def _pluck_response(raw_response: Dict) -> Response:
     return Response(
         status=raw_response['status'],
-        headers=raw_response.get('headers', {}),
+        headers=share_mapping(raw_response.get('headers')),
         body=raw_response.get('body'),
-        matching_rules=raw_response.get('matchingRules')
+        matching_rules=_freeze(raw_response.get('matchingRules'))
     )
 
 
+def share_mapping(mapping: Optional[Dict]) -> FrozenDict:
+    """A read-only copy of a mapping, such as headers or a query, that is shared with every equal
+    mapping still in use. Its string keys and values are interned. Mappings with unhashable values
+    are copied but not shared.
+
+    >>> share_mapping({'Accept': '*/*'}) is share_mapping({'Accept': '*/*'})
+    True
+    >>> share_mapping(None) is share_mapping({}) is EMPTY_MAPPING
+    True
+    >>> share_mapping({'ids': ['1', '2']})
+    {'ids': ['1', '2']}
+    >>> share_mapping({'flag': True}), share_mapping({'flag': 1}), share_mapping({'flag': 1.0})
+    ({'flag': True}, {'flag': 1}, {'flag': 1.0})
+    """
+    if not mapping:
+        return EMPTY_MAPPING
+
+    items = tuple(mapping.items())
+    try:
+        shared = _shared_mappings.get(items)
+    except TypeError:
+        return FrozenDict(mapping)
+
+    if shared is not None and _same_types(shared, mapping):
+        return shared
+    frozen = FrozenDict((_intern(key), _intern(value)) for key, value in items)
+    if shared is None:
+        _shared_mappings[items] = frozen
+    return frozen
+
+
+def _freeze(value: Any) -> Any:
+    """A deeply read-only copy of a decoded JSON value, such as a response's matching rules, in
+    which objects become FrozenDicts and arrays tuples. Equal objects still in use are shared.
+
+    >>> rules = _freeze({'body': {'$.id': {'matchers': [{'match': 'integer'}]},
+    ...                           '$.count': {'matchers': [{'match': 'integer'}]}}})
+    >>> rules['body']['$.id'] is rules['body']['$.count']
+    True
+    >>> rules['body']['$.id']
+    {'matchers': ({'match': 'integer'},)}
+    >>> _freeze({'min': [1]}), _freeze({'min': [True]})
+    ({'min': (1,)}, {'min': (True,)})
+    """
+    if isinstance(value, dict):
+        items = tuple((_intern(key), _freeze(item)) for key, item in value.items())
+        shared = _shared_mappings.get(items)
+        if shared is not None and _same_types(shared, value):
+            return shared
+        frozen = FrozenDict(items)
+        if shared is None:
+            _shared_mappings[items] = frozen
+        return frozen
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return _intern(value)
+
+
+def _same_types(shared: Dict, mapping: Dict) -> bool:
+    """Whether an equal mapping's values are also of the same types, all the way down. Equal
+    values of different types, like 1, 1.0 and True, mustn't share a mapping, which would change
+    their type."""
+    return all(_same_type(value, mapping[key]) for key, value in shared.items())
+
+
+def _same_type(a: Any, b: Any) -> bool:
+    if a is b:
+        return True
+    if isinstance(a, dict) and isinstance(b, dict):
+        return _same_types(a, b)
+    if isinstance(a, tuple) and isinstance(b, (tuple, list)):
+        return all(_same_type(item_a, item_b) for item_a, item_b in zip(a, b))
+    return type(a) is type(b)
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
 def _pluck_provider_state(raw_provider_state: Dict) -> ProviderState:
     """
     >>> _pluck_provider_state({'name': 'there is an egg'})
@@ -107,6 +351,6 @@ def _pluck_provider_state(raw_provider_state: Dict) -> ProviderState:
     ProviderState(descriptor='there is an egg called', params={'name': 'humpty'})
     """
     return ProviderState(
-        descriptor=raw_provider_state['name'],
+        descriptor=sys.intern(raw_provider_state['name']),
         params=raw_provider_state.get('params')
     )
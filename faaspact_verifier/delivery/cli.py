@@ -1,33 +1,44 @@
 import argparse
-import importlib
+import contextlib
 import os
-import subprocess
-from typing import Callable, ContextManager, Dict, NoReturn, Optional, cast
+import re
+from typing import Iterator, NoReturn, Optional
 
-from faaspact_verifier import use_verifier
-from faaspact_verifier.context import create_default_context
-from faaspact_verifier.delivery.github_prs import GithubPrError, fetch_feature_pacts
-from faaspact_verifier.types import ProviderStateFixture
+from faaspact_verifier import profiler, use_verifier, use_watcher
+from faaspact_verifier.context import VERIFIER_CLASS_NAME_BY_NAME, create_default_context
+from faaspact_verifier.definitions import VerifierOptions
+from faaspact_verifier.delivery.git import GitError, current_commit_sha
+from faaspact_verifier.exceptions import UnsupportedProviderStateError
+from faaspact_verifier.gateways.pact_cache import default_cache_directory
+from faaspact_verifier.user_defined.loader import (
+    fingerprint_faasport_module,
+    load_faasport_module
+)
 
 
 def cli() -> NoReturn:
     args = _parse_args()
-    faasport_module = importlib.import_module(args.faasport_module)
-    user_faasport = faasport_module.faasport.__globals__['user_faasport']  # type: ignore
-    user_provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture] = {}
-    if hasattr(faasport_module, 'provider_state'):
-        user_provider_state_fixture_by_descriptor = (
-            faasport_module.provider_state.__globals__[  # type: ignore
-                'user_provider_state_fixture_by_descriptor'
-            ]
-        )
-    user_always: Optional[Callable[[], ContextManager]] = None
-    if hasattr(faasport_module, 'always'):
-        user_always = faasport_module.always.__globals__['user_always']  # type: ignore
-
-    context = create_default_context(args.host, args.username, args.password)
+    faasport_module = load_faasport_module(args.faasport_module)
+
+    context = create_default_context(
+        args.host,
+        args.username,
+        args.password,
+        fetch_workers=args.fetch_workers,
+        broker_timeout=args.broker_timeout,
+        pact_cache_dir=None if args.no_cache else args.cache_dir,
+        verifier=args.verifier,
+        publish_retries=args.publish_retries,
+        ledger_path=args.ledger,
+        junit_xml_path=args.junit_xml,
+        ndjson_path=args.ndjson,
+        pacts_for_verification=args.pacts_for_verification
+    )
 
     if args.github_pr:
+        # Imported here since it imports requests, which the broker gateway only needs once pacts
+        # are fetched.
+        from faaspact_verifier.delivery.github_prs import GithubPrError, fetch_feature_pacts
         try:
             github_pr_feature_tags = fetch_feature_pacts(args.github_pr)
         except GithubPrError as e:
@@ -37,17 +48,62 @@ def cli() -> NoReturn:
     else:
         failon = frozenset(args.failon)
 
-    succeeded = use_verifier(
-        context,
-        args.provider,
-        user_provider_state_fixture_by_descriptor,
-        user_faasport,
-        args.publish_results,
-        failon=failon,
-        provider_version=args.provider_version,
-        always=user_always
+    if args.watch:
+        try:
+            use_watcher(
+                context,
+                args.provider,
+                args.faasport_module,
+                failon=failon,
+                consumers=frozenset(args.consumer),
+                tags=frozenset(args.tag),
+                interaction_description=args.interaction_description,
+                provider_states=frozenset(args.provider_state),
+                poll_interval=args.watch_interval
+            )
+        except KeyboardInterrupt:
+            exit(0)
+
+    options = VerifierOptions(
+        workers=args.workers,
+        faasport_module=args.faasport_module,
+        concurrency=args.concurrency,
+        group_provider_states=args.group_provider_states,
+        provider_state_scope_by_descriptor=faasport_module.provider_state_scope_by_descriptor,
+        provider_state_parameter_names_by_descriptor=(
+            faasport_module.provider_state_parameter_names_by_descriptor
+        ),
+        always_scope=faasport_module.always_scope,
+        stream=args.stream,
+        fingerprint=(
+            (args.ledger_key or fingerprint_faasport_module(args.faasport_module, args.verifier))
+            if args.ledger else None
+        ),
+        dedupe_interactions=args.dedupe_interactions and faasport_module.deterministic,
+        nondeterministic_provider_states=faasport_module.nondeterministic_provider_states,
+        consumers=frozenset(args.consumer),
+        tags=frozenset(args.tag),
+        interaction_description=args.interaction_description,
+        provider_states=frozenset(args.provider_state)
     )
 
+    try:
+        with _profiling(args.profile_out):
+            succeeded = use_verifier(
+                context,
+                args.provider,
+                faasport_module.provider_state_fixture_by_descriptor,
+                faasport_module.faasport,
+                args.publish_results,
+                failon=failon,
+                provider_version=args.provider_version,
+                always=faasport_module.always,
+                options=options
+            )
+    except UnsupportedProviderStateError as e:
+        print(e)
+        exit(1)
+
     if succeeded:
         exit(0)
     else:
@@ -87,6 +143,12 @@ def _parse_args() -> argparse.Namespace:
                         default=False,
                         help='If true, publish verification results to the broker.')
 
+    parser.add_argument('--publish-retries',
+                        type=int,
+                        default=3,
+                        help=('Number of times to retry publishing a pact\'s verification results '
+                              'after a connection error or 429/5xx response. (default=3)'))
+
     parser.add_argument('--provider-version',
                         required=False,
                         help='The version of the provider. Defaults to the current git SHA.')
@@ -103,10 +165,147 @@ def _parse_args() -> argparse.Namespace:
                         help=('If verification fails for a pact with one of these tags, this script'
                               ' will fail.'))
 
+    parser.add_argument('--fetch-workers',
+                        type=int,
+                        default=1,
+                        help='Number of pacts to fetch from the broker concurrently. (default=1)')
+
+    parser.add_argument('--broker-timeout',
+                        type=float,
+                        required=False,
+                        help='Timeout in seconds for each request made to the pact broker.')
+
+    parser.add_argument('--workers',
+                        type=int,
+                        default=1,
+                        help=('Number of processes to emulate interactions with. Each process '
+                              'imports the faasport module itself. (default=1)'))
+
+    parser.add_argument('--concurrency',
+                        type=int,
+                        default=1,
+                        help=('Number of interactions to emulate at once when the faasport or its '
+                              'fixtures are async. (default=1)'))
+
+    parser.add_argument('--group-provider-states',
+                        action='store_true',
+                        default=False,
+                        help=('If true, set up provider states declared with scope="group" once '
+                              'for all interactions that share them. An @always fixture without a '
+                              'scope is then entered once around each pact.'))
+
+    parser.add_argument('--dedupe-interactions',
+                        action='store_true',
+                        default=False,
+                        help=('If true, emulate interactions with identical requests and provider '
+                              'states once and share their result. Ignored if the faasport or '
+                              'always fixture is declared with deterministic=False.'))
+
+    parser.add_argument('--pacts-for-verification',
+                        action='store_true',
+                        default=False,
+                        help=('If true, select pacts with a single request to the broker\'s pacts '
+                              'for verification API instead of a request to the latest pact '
+                              'index of each tag. Falls back to the latest pact indexes if the '
+                              'broker doesn\'t support the API.'))
+
+    parser.add_argument('--cache-dir',
+                        default=default_cache_directory(),
+                        help='Directory to cache pacts in. (default=~/.cache/faaspact)')
+
+    parser.add_argument('--no-cache',
+                        action='store_true',
+                        default=False,
+                        help='If true, always download pacts instead of using the pact cache.')
+
+    parser.add_argument('--verifier',
+                        choices=sorted(VERIFIER_CLASS_NAME_BY_NAME),
+                        default='pactman',
+                        help=('Verifier to check responses with. "native" compiles matching rules '
+                              'once per pact version. (default=pactman)'))
+
+    parser.add_argument('--ledger',
+                        nargs='?',
+                        const=os.path.join(default_cache_directory(), 'ledger.sqlite3'),
+                        help=('Skip pacts that already passed against the same provider code, as '
+                              'recorded in this SQLite file. (default path when given without '
+                              'one=~/.cache/faaspact/ledger.sqlite3)'))
+
+    parser.add_argument('--ledger-key',
+                        required=False,
+                        help=('Fingerprint of the provider code to key the ledger with. Defaults '
+                              'to a hash of the source of the faasport module\'s top level '
+                              'package and of the project modules it imports, the verifier and '
+                              'the version of faaspact-verifier.'))
+
+    parser.add_argument('--consumer',
+                        action='append',
+                        default=[],
+                        help=('Only verify the pacts of this consumer. May be given more than '
+                              'once.'))
+
+    parser.add_argument('--tag',
+                        action='append',
+                        default=[],
+                        help=('Verify the latest pact for this tag instead of the latest and '
+                              'latest master pacts. May be given more than once.'))
+
+    parser.add_argument('--interaction-description',
+                        required=False,
+                        help=('Only emulate interactions whose description matches this regular '
+                              'expression. Results can\'t be published with this option.'))
+
+    parser.add_argument('--provider-state',
+                        action='append',
+                        default=[],
+                        help=('Only emulate interactions that use this provider state. May be '
+                              'given more than once. Results can\'t be published with this '
+                              'option.'))
+
+    parser.add_argument('--junit-xml',
+                        required=False,
+                        help=('Also write results to this file as JUnit XML, a testsuite per pact, '
+                              'as pacts are reported (see --stream).'))
+
+    parser.add_argument('--ndjson',
+                        required=False,
+                        help=('Also write results to this file as newline-delimited JSON, a record '
+                              'per interaction, as pacts are reported (see --stream).'))
+
+    parser.add_argument('--profile-out',
+                        required=False,
+                        help=('Write a Chrome trace of the run\'s phases, broker requests, '
+                              'interactions and fixtures to this file, and print the slowest '
+                              'of them.'))
+
+    parser.add_argument('--stream',
+                        action='store_true',
+                        default=False,
+                        help=('If true, emulate, verify, publish and report each pact as soon as '
+                              'it is fetched instead of waiting for all pacts to be fetched. '
+                              'Otherwise nothing is reported until every pact has been verified.'))
+
+    parser.add_argument('--watch',
+                        action='store_true',
+                        default=False,
+                        help=('If true, keep running after verifying the pacts. The faasport '
+                              'module stays imported, and whenever the source of its top level '
+                              'package changes, the changed modules are reloaded and only the '
+                              'interactions that the change could affect are verified again.'))
+
+    parser.add_argument('--watch-interval',
+                        type=float,
+                        default=0.25,
+                        help=('Seconds between checks for source changes with --watch. '
+                              '(default=0.25)'))
+
     args = parser.parse_args()
 
     if not args.provider_version:
-        args.provider_version = _current_commit_sha()
+        try:
+            args.provider_version = current_commit_sha()
+        except GitError as e:
+            raise parser.error(f'Missing provider version and failed to read it from git: {e}')
 
     if not args.host:
         raise parser.error('Missing host')
@@ -123,9 +322,62 @@ def _parse_args() -> argparse.Namespace:
     if not args.provider:
         raise parser.error('Missing provider')
 
+    if args.fetch_workers < 1:
+        raise parser.error('--fetch-workers must be at least 1')
+
+    if args.publish_retries < 0:
+        raise parser.error('--publish-retries must not be negative')
+
+    if args.workers < 1:
+        raise parser.error('--workers must be at least 1')
+
+    if args.concurrency < 1:
+        raise parser.error('--concurrency must be at least 1')
+
+    if args.interaction_description is not None:
+        try:
+            re.compile(args.interaction_description)
+        except re.error as e:
+            raise parser.error(f'--interaction-description is not a valid regex: {e}')
+
+    if args.publish_results and (args.interaction_description is not None or args.provider_state):
+        raise parser.error('--publish-results can\'t be used with --interaction-description or '
+                           '--provider-state')
+
+    if args.watch_interval <= 0:
+        raise parser.error('--watch-interval must be positive')
+
+    if args.watch:
+        watch_conflicts = [option for option, given in [
+            ('--publish-results', args.publish_results),
+            ('--junit-xml', args.junit_xml),
+            ('--ndjson', args.ndjson),
+            ('--ledger', args.ledger),
+            ('--stream', args.stream),
+            ('--profile-out', args.profile_out),
+            ('--workers', args.workers > 1),
+            ('--concurrency', args.concurrency > 1),
+            ('--group-provider-states', args.group_provider_states),
+            ('--dedupe-interactions', args.dedupe_interactions)
+        ] if given]
+        if watch_conflicts:
+            raise parser.error(f'--watch can\'t be used with {", ".join(watch_conflicts)}')
+
     return args
 
 
-def _current_commit_sha() -> str:
-    out = cast(bytes, subprocess.check_output(['git', 'rev-parse', 'HEAD']))
-    return out.decode().rstrip('\n')
+@contextlib.contextmanager
+def _profiling(profile_out: Optional[str]) -> Iterator[None]:
+    """Profile the block if a `profile_out` path is given, writing its trace there and printing
+    a summary once the block exits."""
+    if not profile_out:
+        yield
+        return
+
+    run_profiler = profiler.Profiler()
+    try:
+        with profiler.profiling(run_profiler), run_profiler.span('run', 'run'):
+            yield
+    finally:
+        run_profiler.write_chrome_trace(profile_out)
+        print(run_profiler.format_summary())
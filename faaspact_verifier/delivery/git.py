@@ -0,0 +1,98 @@
+import os
+import re
+from typing import Optional, Set
+
+
+SHA_PATTERN = re.compile(r'[0-9a-f]{40}([0-9a-f]{24})?')
+
+
+class GitError(Exception):
+    """Exception raised upon failing to read the checked out commit of a git repository."""
+
+
+def current_commit_sha(path: str = '.') -> str:
+    """The sha of the commit checked out in the git repository containing `path`. It is read from
+    the repository's HEAD, loose refs and packed-refs rather than by running git, which takes
+    longer to start than the read takes. Like git, $GIT_DIR takes precedence over `path`.
+    """
+    git_dir = os.environ.get('GIT_DIR') or _find_git_dir(os.path.abspath(path))
+    common_dir = _find_common_dir(git_dir)
+
+    head = _read_ref_file(os.path.join(git_dir, 'HEAD'))
+    if head is None:
+        raise GitError(f'No HEAD in git directory {git_dir}')
+
+    followed_refs: Set[str] = set()
+    while head.startswith('ref:'):
+        ref = head[len('ref:'):].strip()
+        if ref in followed_refs:
+            raise GitError(f'Symbolic ref {ref} refers to itself')
+        followed_refs.add(ref)
+        head = _resolve_ref(git_dir, common_dir, ref)
+
+    if not SHA_PATTERN.fullmatch(head):
+        raise GitError(f'HEAD of git directory {git_dir} is not a commit sha: {head}')
+    return head
+
+
+def _find_git_dir(path: str) -> str:
+    """Find the git directory of the repository containing path, following a .git file to the
+    git directory of a worktree or submodule."""
+    directory = path
+    while True:
+        dot_git = os.path.join(directory, '.git')
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            with open(dot_git) as f:
+                contents = f.read().strip()
+            if not contents.startswith('gitdir:'):
+                raise GitError(f'Malformed .git file {dot_git}')
+            return os.path.join(directory, contents[len('gitdir:'):].strip())
+
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            raise GitError(f'Not in a git repository: {path}')
+        directory = parent
+
+
+def _find_common_dir(git_dir: str) -> str:
+    """The directory shared by all worktrees of a repository, which holds its branches."""
+    common_dir = _read_ref_file(os.path.join(git_dir, 'commondir'))
+    return os.path.join(git_dir, common_dir) if common_dir else git_dir
+
+
+def _resolve_ref(git_dir: str, common_dir: str, ref: str) -> str:
+    for directory in (git_dir, common_dir):
+        value = _read_ref_file(os.path.join(directory, ref))
+        if value is not None:
+            return value
+
+    packed_sha = _find_packed_ref(common_dir, ref)
+    if packed_sha is None:
+        raise GitError(f'Ref {ref} has no commits yet')
+    return packed_sha
+
+
+def _find_packed_ref(common_dir: str, ref: str) -> Optional[str]:
+    """Look a ref up in packed-refs, whose lines are '<sha> <ref>', with '#' lines holding
+    comments and '^<sha>' lines the commit that the annotated tag above them points at."""
+    try:
+        with open(os.path.join(common_dir, 'packed-refs')) as f:
+            for line in f:
+                if line.startswith(('#', '^')):
+                    continue
+                sha, _, packed_ref = line.rstrip('\n').partition(' ')
+                if packed_ref == ref:
+                    return sha
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def _read_ref_file(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+        return None
@@ -0,0 +1,68 @@
+import os
+from typing import Any
+
+import pytest
+
+from faaspact_verifier.delivery.git import GitError, current_commit_sha
+
+
+SHA = '0123456789abcdef0123456789abcdef01234567'
+OTHER_SHA = 'fedcba9876543210fedcba9876543210fedcba98'
+
+
+class TestCurrentCommitSha:
+
+    def test_reads_loose_branch_refs(self, tmp_path: Any) -> None:
+        # Given
+        _write(tmp_path / '.git' / 'HEAD', 'ref: refs/heads/main\n')
+        _write(tmp_path / '.git' / 'refs' / 'heads' / 'main', f'{SHA}\n')
+        _write(tmp_path / '.git' / 'packed-refs', f'{OTHER_SHA} refs/heads/main\n')
+        (tmp_path / 'src').mkdir()
+
+        # When
+        sha = current_commit_sha(str(tmp_path / 'src'))
+
+        # Then
+        assert sha == SHA
+
+    def test_reads_packed_branch_refs(self, tmp_path: Any) -> None:
+        # Given
+        _write(tmp_path / '.git' / 'HEAD', 'ref: refs/heads/feature/a\n')
+        _write(tmp_path / '.git' / 'packed-refs',
+               '# pack-refs with: peeled fully-peeled sorted\n'
+               f'{OTHER_SHA} refs/heads/main\n'
+               f'{SHA} refs/heads/feature/a\n'
+               f'^{OTHER_SHA}\n')
+
+        # When
+        sha = current_commit_sha(str(tmp_path))
+
+        # Then
+        assert sha == SHA
+
+    def test_reads_detached_heads_of_worktrees(self, tmp_path: Any) -> None:
+        # Given
+        common_dir = tmp_path / 'repo' / '.git'
+        worktree_git_dir = common_dir / 'worktrees' / 'wt'
+        _write(worktree_git_dir / 'HEAD', f'{SHA}\n')
+        _write(worktree_git_dir / 'commondir', '../..\n')
+        _write(tmp_path / 'wt' / '.git', f'gitdir: {worktree_git_dir}\n')
+
+        # When
+        sha = current_commit_sha(str(tmp_path / 'wt'))
+
+        # Then
+        assert sha == SHA
+
+    def test_raises_git_error_without_a_commit(self, tmp_path: Any) -> None:
+        # Given
+        _write(tmp_path / 'repo' / '.git' / 'HEAD', 'ref: refs/heads/main\n')
+
+        # Then
+        with pytest.raises(GitError):
+            current_commit_sha(str(tmp_path / 'repo'))
+
+
+def _write(path: Any, contents: str) -> None:
+    os.makedirs(str(path.parent), exist_ok=True)
+    path.write_text(contents)
@@ -1,56 +1,728 @@
 import contextlib
 import inspect
+import json
+import time
 import traceback
+from collections import deque
 from contextlib import nullcontext  # type: ignore
-from typing import Callable, Dict, FrozenSet, Generator, List, Optional, Tuple, cast
+from typing import (
+    AsyncContextManager,
+    Callable,
+    ContextManager,
+    Deque,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    TYPE_CHECKING,
+    Tuple,
+    Union,
+    cast
+)
 
-from faaspact_verifier.definitions import Error, Interaction, Pact, ProviderState
+from faaspact_verifier import profiler
+from faaspact_verifier.definitions import (
+    EMPTY_MAPPING,
+    Error,
+    Interaction,
+    Pact,
+    ProviderState,
+    Request,
+    Response,
+    VerifierOptions
+)
 from faaspact_verifier.exceptions import UnsupportedProviderStateError
 from faaspact_verifier.types import AlwaysFixture, EmulatorResult, Faasport, ProviderStateFixture
 
+if TYPE_CHECKING:
+    import asyncio
 
-def emulate_pact_interactions(pact: Pact,
-                              provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
-                              faasport: Faasport,
-                              always: Optional[AlwaysFixture] = None) -> List[EmulatorResult]:
-    return [
-        _emulate_interaction(
-            interaction,
+
+def emulate_pact_interactions(
+        pact: Pact,
+        provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+        faasport: Faasport,
+        always: Optional[AlwaysFixture] = None,
+        options: VerifierOptions = VerifierOptions()
+) -> List[EmulatorResult]:
+    return emulate_interactions(
+        pact.interactions,
+        provider_state_fixture_by_descriptor,
+        faasport,
+        always,
+        options
+    )
+
+
+def emulate_pacts_interactions(
+        pacts: List[Pact],
+        provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+        faasport: Faasport,
+        always: Optional[AlwaysFixture] = None,
+        options: VerifierOptions = VerifierOptions()
+) -> List[List[EmulatorResult]]:
+    """Emulate the interactions of all pacts in one go, so that an async faasport runs every
+    interaction on the same event loop. Results are returned per pact, in interaction order.
+
+    The always fixture is entered around each interaction, each pact or the whole run, depending
+    on its scope (see `always_scope`). Provider state groups span pacts unless the always fixture
+    is pact scoped.
+
+    With `dedupe_interactions`, each distinct request and provider states is emulated once and its
+    result shared by every identical interaction, except for interactions with any of the
+    `nondeterministic_provider_states`.
+    """
+    if always_scope(options) == 'pact':
+        segments = [list(pact.interactions) for pact in pacts]
+    else:
+        segments = [[interaction for pact in pacts for interaction in pact.interactions]]
+
+    def emulate_segments(segments: Iterable[List[Interaction]]) -> Iterator[List[EmulatorResult]]:
+        return _iter_emulate_segments(
+            segments,
             provider_state_fixture_by_descriptor,
             faasport,
-            always
+            always,
+            options
         )
-        for interaction in pact.interactions
-    ]
 
+    if options.dedupe_interactions:
+        emulator_results_segments = list(iter_deduplicated_segments(
+            segments,
+            emulate_segments,
+            options.nondeterministic_provider_states
+        ))
+    else:
+        emulator_results_segments = list(emulate_segments(segments))
+    return split_by_pact(pacts, (emulator_result
+                                 for emulator_results in emulator_results_segments
+                                 for emulator_result in emulator_results))
 
-def _emulate_interaction(interaction: Interaction,
-                         provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
-                         faasport: Faasport,
-                         always: Optional[AlwaysFixture] = None) -> EmulatorResult:
-    try:
-        provider_state_fixtures_with_params = _provider_state_fixtures_with_params(
+
+def iter_emulate_pacts_interactions(
+        pacts: Iterable[Pact],
+        provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+        faasport: Faasport,
+        always: Optional[AlwaysFixture] = None,
+        options: VerifierOptions = VerifierOptions()
+) -> Iterator[Tuple[Pact, List[EmulatorResult]]]:
+    """Lazily emulate pacts one at a time as they are consumed, yielding each pact with its
+    results. A session scoped always fixture and an async faasport's event loop span all pacts,
+    while provider state groups are formed within each pact. With `dedupe_interactions`, a pact's
+    interactions that are identical to ones already emulated reuse their results.
+    """
+    emulated_pacts: Deque[Pact] = deque()
+
+    def segments() -> Iterator[List[Interaction]]:
+        for pact in pacts:
+            emulated_pacts.append(pact)
+            yield list(pact.interactions)
+
+    def emulate_segments(segments: Iterable[List[Interaction]]) -> Iterator[List[EmulatorResult]]:
+        return _iter_emulate_segments(
+            segments,
             provider_state_fixture_by_descriptor,
-            interaction.provider_states
+            faasport,
+            always,
+            options
+        )
+
+    if options.dedupe_interactions:
+        emulator_results_segments = iter_deduplicated_segments(
+            segments(),
+            emulate_segments,
+            options.nondeterministic_provider_states
+        )
+    else:
+        emulator_results_segments = emulate_segments(segments())
+
+    for emulator_results in emulator_results_segments:
+        yield emulated_pacts.popleft(), emulator_results
+
+
+def emulate_interactions(
+        interactions: Iterable[Interaction],
+        provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+        faasport: Faasport,
+        always: Optional[AlwaysFixture] = None,
+        options: VerifierOptions = VerifierOptions()
+) -> List[EmulatorResult]:
+    """Emulate interactions, returning their results in order. If the faasport or any fixture is
+    async, the interactions run on a single event loop, with up to `concurrency` of them in flight
+    at once. Options that pick pacts or dedupe their interactions don't apply.
+
+    With `group_provider_states`, interactions that share the same 'group' scoped provider states
+    run inside a single setup of those fixtures, and the always fixture is entered once around all
+    interactions (see `always_scope`).
+    """
+    return _emulate_segments(
+        [list(interactions)],
+        provider_state_fixture_by_descriptor,
+        faasport,
+        always,
+        options
+    )[0]
+
+
+def always_scope(options: VerifierOptions) -> str:
+    """The scope that the always fixture is entered at. The always fixture is entered before all
+    provider state fixtures, so with `group_provider_states` an 'interaction' scoped one is
+    entered around each pact instead, outside of the fixtures its interactions share.
+
+    >>> always_scope(VerifierOptions()), always_scope(VerifierOptions(group_provider_states=True))
+    ('interaction', 'pact')
+    >>> always_scope(VerifierOptions(group_provider_states=True, always_scope='session'))
+    'session'
+    """
+    if options.group_provider_states and options.always_scope == 'interaction':
+        return 'pact'
+    return options.always_scope
+
+
+def find_unsupported_provider_states(
+        pacts: List[Pact],
+        provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+        provider_state_parameter_names_by_descriptor: Optional[Dict[str, FrozenSet[str]]] = None
+) -> List[Tuple[Pact, int, str]]:
+    """Check every interaction's provider states against the provider state fixtures without
+    emulating anything. Returns a (pact, interaction index, reason) for each interaction that the
+    provider can't support.
+    """
+    provider_state_registry = _ProviderStateRegistry.create(
+        provider_state_fixture_by_descriptor,
+        provider_state_parameter_names_by_descriptor or {}
+    )
+    unsupported_provider_states: List[Tuple[Pact, int, str]] = []
+    for pact in pacts:
+        for index, interaction in enumerate(pact.interactions):
+            try:
+                _provider_state_fixtures_with_params(
+                    provider_state_registry,
+                    interaction.provider_states
+                )
+            except UnsupportedProviderStateError as e:
+                unsupported_provider_states.append((pact, index, str(e)))
+
+    return unsupported_provider_states
+
+
+def split_by_pact(pacts: List[Pact],
+                  emulator_results: Iterable[EmulatorResult]) -> List[List[EmulatorResult]]:
+    """Split a flat list of emulator results back into one list per pact."""
+    emulator_results_iterator = iter(emulator_results)
+    return [[next(emulator_results_iterator) for _ in pact.interactions] for pact in pacts]
+
+
+def iter_deduplicated_segments(
+        segments: Iterable[List[Interaction]],
+        emulate_segments: Callable[[Iterable[List[Interaction]]], Iterator[List[EmulatorResult]]],
+        nondeterministic_provider_states: FrozenSet[str] = frozenset()
+) -> Iterator[List[EmulatorResult]]:
+    """Emulate segments of interactions with emulate_segments, leaving out every interaction whose
+    request and provider states match an earlier one and giving it that interaction's result.
+
+    emulate_segments must yield each segment's results in order, and may read ahead any number of
+    segments. Interactions with a nondeterministic provider state are always emulated.
+    """
+    result_by_key: Dict[str, EmulatorResult] = {}
+    scheduled_keys: Set[str] = set()
+    plans: Deque[List[Tuple[Optional[str], bool]]] = deque()
+
+    def deduplicated_segments() -> Iterator[List[Interaction]]:
+        for segment in segments:
+            plan: List[Tuple[Optional[str], bool]] = []
+            for interaction in segment:
+                key = _interaction_key(interaction, nondeterministic_provider_states)
+                plan.append((key, key is None or key not in scheduled_keys))
+                if key is not None:
+                    scheduled_keys.add(key)
+            plans.append(plan)
+            yield [interaction for interaction, (_, emulate) in zip(segment, plan) if emulate]
+
+    for emulated_results in emulate_segments(deduplicated_segments()):
+        emulated = iter(emulated_results)
+        emulator_results: List[EmulatorResult] = []
+        for key, emulate in plans.popleft():
+            if emulate:
+                emulator_result = next(emulated)
+                if key is not None:
+                    result_by_key[key] = emulator_result
+            else:
+                emulator_result = result_by_key[cast(str, key)]
+            emulator_results.append(emulator_result)
+        yield emulator_results
+
+
+def provider_states_key(provider_states: Tuple[ProviderState, ...]) -> str:
+    """A hashable key identifying provider states by their descriptors and params.
+
+    >>> a = provider_states_key((ProviderState('user exists', {'id': 1, 'name': 'zach'}),))
+    >>> b = provider_states_key((ProviderState('user exists', {'name': 'zach', 'id': 1}),))
+    >>> c = provider_states_key((ProviderState('user exists', {'id': 2, 'name': 'zach'}),))
+    >>> a == b, a == c
+    (True, False)
+    """
+    return json.dumps(
+        [[provider_state.descriptor, provider_state.params] for provider_state in provider_states],
+        sort_keys=True,
+        default=repr
+    )
+
+
+class _ProviderStateRegistry(NamedTuple):
+    fixture_by_descriptor: Dict[str, ProviderStateFixture]
+    parameter_names_by_descriptor: Dict[str, FrozenSet[str]]
+
+    @classmethod
+    def create(cls,
+               provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+               provider_state_parameter_names_by_descriptor: Dict[str, FrozenSet[str]]
+               ) -> '_ProviderStateRegistry':
+        """Use the parameter names that @provider_state recorded for each fixture, and only
+        pluck them from fixtures that weren't registered with it."""
+        parameter_names_by_descriptor = dict(provider_state_parameter_names_by_descriptor)
+        for descriptor, fixture in provider_state_fixture_by_descriptor.items():
+            if descriptor not in parameter_names_by_descriptor:
+                parameter_names_by_descriptor[descriptor] = _pluck_parameter_names(fixture)
+        return cls(
+            fixture_by_descriptor=provider_state_fixture_by_descriptor,
+            parameter_names_by_descriptor=parameter_names_by_descriptor
+        )
+
+
+class _InteractionGroup(NamedTuple):
+    indexes: List[int]
+    shared_provider_states: Tuple[ProviderState, ...] = ()
+
+
+def _interaction_key(interaction: Interaction,
+                     nondeterministic_provider_states: FrozenSet[str]) -> Optional[str]:
+    """A key identifying an interaction by its request and provider states, or None if any of its
+    provider states is nondeterministic.
+
+    >>> interaction = Interaction(Request({}, '/', 'GET'), Response({}, 200),
+    ...                           (ProviderState('there is a user', {'id': 1}),))
+    >>> _interaction_key(interaction, frozenset()) == _interaction_key(
+    ...     interaction._replace(response=Response({}, 404)), frozenset())
+    True
+    >>> _interaction_key(interaction, frozenset({'there is a user'})) is None
+    True
+    """
+    if any(provider_state.descriptor in nondeterministic_provider_states
+           for provider_state in interaction.provider_states):
+        return None
+
+    return json.dumps([interaction.request, provider_states_key(interaction.provider_states)],
+                      sort_keys=True,
+                      default=repr)
+
+
+def _group_interactions(
+        interactions: List[Interaction],
+        provider_state_scope_by_descriptor: Dict[str, str]
+) -> List[_InteractionGroup]:
+    """Group interactions by their 'group' scoped provider states. Interactions without any share
+    one group with no shared provider states.
+    """
+    ungrouped_indexes: List[int] = []
+    group_by_key: Dict[str, _InteractionGroup] = {}
+    for index, interaction in enumerate(interactions):
+        shared_provider_states = tuple(
+            provider_state for provider_state in interaction.provider_states
+            if provider_state_scope_by_descriptor.get(provider_state.descriptor) == 'group'
+        )
+        if not shared_provider_states:
+            ungrouped_indexes.append(index)
+            continue
+
+        key = provider_states_key(shared_provider_states)
+        group_by_key.setdefault(key, _InteractionGroup([], shared_provider_states))
+        group_by_key[key].indexes.append(index)
+
+    ungrouped = [_InteractionGroup(ungrouped_indexes)] if ungrouped_indexes else []
+    return ungrouped + list(group_by_key.values())
+
+
+def _emulate_segments(segments: List[List[Interaction]],
+                      provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+                      faasport: Faasport,
+                      always: Optional[AlwaysFixture],
+                      options: VerifierOptions) -> List[List[EmulatorResult]]:
+    return list(_iter_emulate_segments(
+        segments,
+        provider_state_fixture_by_descriptor,
+        faasport,
+        always,
+        options
+    ))
+
+
+def _iter_emulate_segments(
+        segments: Iterable[List[Interaction]],
+        provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+        faasport: Faasport,
+        always: Optional[AlwaysFixture],
+        options: VerifierOptions
+) -> Iterator[List[EmulatorResult]]:
+    """Lazily emulate segments of interactions, where a pact scoped always fixture is entered once
+    around each segment and a session scoped one once around all segments. Async runs share one
+    event loop across all segments.
+    """
+    scope = always_scope(options)
+    session_always = always if scope == 'session' else None
+    segment_always = always if scope == 'pact' else None
+    interaction_always = always if scope == 'interaction' else None
+
+    def group(segment: List[Interaction]) -> List[_InteractionGroup]:
+        if not options.group_provider_states:
+            return [_InteractionGroup(list(range(len(segment))))]
+        return _group_interactions(segment, options.provider_state_scope_by_descriptor)
+
+    provider_state_registry = _ProviderStateRegistry.create(
+        provider_state_fixture_by_descriptor,
+        options.provider_state_parameter_names_by_descriptor
+    )
+
+    fixtures = [always, *provider_state_fixture_by_descriptor.values()]
+    if not (inspect.iscoroutinefunction(faasport) or any(map(_is_async_fixture, fixtures))):
+        with _use_always(session_always):
+            for segment in segments:
+                yield _emulate_segment(
+                    segment,
+                    group(segment),
+                    provider_state_registry,
+                    faasport,
+                    interaction_always,
+                    segment_always
+                )
+        return
+
+    # Imported here since only async faasports and fixtures need it, and it is slow to import.
+    import asyncio
+    loop = asyncio.new_event_loop()
+    try:
+        semaphore = loop.run_until_complete(_create_semaphore(options.concurrency))
+        stack = contextlib.AsyncExitStack()
+        if session_always:
+            loop.run_until_complete(_enter_fixture(stack, session_always(), session_always))
+        try:
+            for segment in segments:
+                yield loop.run_until_complete(_emulate_segment_async(
+                    segment,
+                    group(segment),
+                    provider_state_registry,
+                    faasport,
+                    interaction_always,
+                    segment_always,
+                    semaphore
+                ))
+        finally:
+            loop.run_until_complete(stack.aclose())
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+async def _create_semaphore(value: int) -> 'asyncio.Semaphore':
+    """Create a semaphore from within the event loop that will use it."""
+    import asyncio
+    return asyncio.Semaphore(value)
+
+
+def _emulate_segment(interactions: List[Interaction],
+                     groups: List[_InteractionGroup],
+                     provider_state_registry: _ProviderStateRegistry,
+                     faasport: Faasport,
+                     interaction_always: Optional[AlwaysFixture],
+                     segment_always: Optional[AlwaysFixture]) -> List[EmulatorResult]:
+    emulator_results_by_index: Dict[int, EmulatorResult] = {}
+    with _use_always(segment_always):
+        for group in groups:
+            emulator_results_by_index.update(_emulate_group(
+                interactions,
+                group,
+                provider_state_registry,
+                faasport,
+                interaction_always
+            ))
+    return [emulator_results_by_index[index] for index in range(len(interactions))]
+
+
+async def _emulate_segment_async(
+        interactions: List[Interaction],
+        groups: List[_InteractionGroup],
+        provider_state_registry: _ProviderStateRegistry,
+        faasport: Faasport,
+        interaction_always: Optional[AlwaysFixture],
+        segment_always: Optional[AlwaysFixture],
+        semaphore: 'asyncio.Semaphore'
+) -> List[EmulatorResult]:
+    emulator_results_by_index: Dict[int, EmulatorResult] = {}
+    async with contextlib.AsyncExitStack() as stack:
+        if segment_always:
+            await _enter_fixture(stack, segment_always(), segment_always)
+        for group in groups:
+            emulator_results_by_index.update(await _emulate_group_async(
+                interactions,
+                group,
+                provider_state_registry,
+                faasport,
+                interaction_always,
+                semaphore
+            ))
+    return [emulator_results_by_index[index] for index in range(len(interactions))]
+
+
+def _emulate_group(interactions: List[Interaction],
+                   group: _InteractionGroup,
+                   provider_state_registry: _ProviderStateRegistry,
+                   faasport: Faasport,
+                   always: Optional[AlwaysFixture]) -> Dict[int, EmulatorResult]:
+    if not group.shared_provider_states:
+        return {
+            index: _emulate_interaction(
+                interactions[index],
+                provider_state_registry,
+                faasport,
+                always
+            )
+            for index in group.indexes
+        }
+
+    try:
+        shared_fixtures_with_params = _provider_state_fixtures_with_params(
+            provider_state_registry,
+            group.shared_provider_states
         )
     except UnsupportedProviderStateError as e:
-        return Error(message=str(e))
+        return {index: Error(message=str(e)) for index in group.indexes}
+
+    with _use_provider_states(shared_fixtures_with_params):
+        return {
+            index: _emulate_interaction(
+                interactions[index],
+                provider_state_registry,
+                faasport,
+                always,
+                entered_provider_states=group.shared_provider_states
+            )
+            for index in group.indexes
+        }
 
-    always_fixture = cast(AlwaysFixture, always or nullcontext)
 
-    with always_fixture():
-        with _use_provider_states(provider_state_fixtures_with_params):
+async def _emulate_group_async(
+        interactions: List[Interaction],
+        group: _InteractionGroup,
+        provider_state_registry: _ProviderStateRegistry,
+        faasport: Faasport,
+        always: Optional[AlwaysFixture],
+        semaphore: 'asyncio.Semaphore'
+) -> Dict[int, EmulatorResult]:
+    """Async counterpart of _emulate_group. The group's interactions run concurrently."""
+    async with contextlib.AsyncExitStack() as stack:
+        if group.shared_provider_states:
             try:
-                return faasport(interaction.request)
-            except Exception:
-                return Error(
-                    message='Provider raised an exception',
-                    traceback=traceback.format_exc()
+                shared_fixtures_with_params = _provider_state_fixtures_with_params(
+                    provider_state_registry,
+                    group.shared_provider_states
                 )
+            except UnsupportedProviderStateError as e:
+                return {index: Error(message=str(e)) for index in group.indexes}
+
+            for provider_state_fixture, params in shared_fixtures_with_params:
+                await _enter_fixture(stack,
+                                     provider_state_fixture(**params),
+                                     provider_state_fixture)
+
+        import asyncio
+        emulator_results = await asyncio.gather(*[
+            _emulate_interaction_async(
+                interactions[index],
+                provider_state_registry,
+                faasport,
+                always,
+                semaphore,
+                entered_provider_states=group.shared_provider_states
+            )
+            for index in group.indexes
+        ])
+        return dict(zip(group.indexes, emulator_results))
+
+
+def _emulate_interaction(
+        interaction: Interaction,
+        provider_state_registry: _ProviderStateRegistry,
+        faasport: Faasport,
+        always: Optional[AlwaysFixture] = None,
+        entered_provider_states: Tuple[ProviderState, ...] = ()
+) -> EmulatorResult:
+    """Emulate an interaction within its always and provider state fixtures, except for those
+    provider states that have already been entered for it.
+    """
+    try:
+        provider_state_fixtures_with_params = _provider_state_fixtures_with_params(
+            provider_state_registry,
+            _without(interaction.provider_states, entered_provider_states)
+        )
+    except UnsupportedProviderStateError as e:
+        return Error(message=str(e))
+
+    start = time.perf_counter()
+    with profiler.span(_describe(interaction), 'interaction'):
+        with _use_always(always):
+            with _use_provider_states(provider_state_fixtures_with_params):
+                try:
+                    with profiler.span('faasport', 'faasport'):
+                        emulator_result: EmulatorResult = cast(Response,
+                                                               faasport(_faasport_request(
+                                                                   interaction.request
+                                                               )))
+                except Exception:
+                    emulator_result = Error(
+                        message='Provider raised an exception',
+                        traceback=traceback.format_exc()
+                    )
+    return _with_duration(emulator_result, time.perf_counter() - start)
+
+
+async def _emulate_interaction_async(
+        interaction: Interaction,
+        provider_state_registry: _ProviderStateRegistry,
+        faasport: Faasport,
+        always: Optional[AlwaysFixture],
+        semaphore: 'asyncio.Semaphore',
+        entered_provider_states: Tuple[ProviderState, ...] = ()
+) -> EmulatorResult:
+    """Async counterpart of _emulate_interaction, which enters sync and async fixtures alike and
+    awaits the faasport if it is a coroutine function.
+    """
+    try:
+        provider_state_fixtures_with_params = _provider_state_fixtures_with_params(
+            provider_state_registry,
+            _without(interaction.provider_states, entered_provider_states)
+        )
+    except UnsupportedProviderStateError as e:
+        return Error(message=str(e))
+
+    async with semaphore:
+        start = time.perf_counter()
+        with profiler.span(_describe(interaction), 'interaction'):
+            async with contextlib.AsyncExitStack() as stack:
+                if always:
+                    await _enter_fixture(stack, always(), always)
+                for provider_state_fixture, params in provider_state_fixtures_with_params:
+                    await _enter_fixture(stack,
+                                         provider_state_fixture(**params),
+                                         provider_state_fixture)
+
+                try:
+                    with profiler.span('faasport', 'faasport'):
+                        response = faasport(_faasport_request(interaction.request))
+                        if inspect.isawaitable(response):
+                            response = await response
+                    emulator_result: EmulatorResult = response
+                except Exception:
+                    emulator_result = Error(
+                        message='Provider raised an exception',
+                        traceback=traceback.format_exc()
+                    )
+        return _with_duration(emulator_result, time.perf_counter() - start)
+
+
+def _with_duration(emulator_result: EmulatorResult, duration: float) -> EmulatorResult:
+    """A copy of the emulator result that records how long its interaction took. The faasport's
+    response is copied rather than changed, since a faasport may return the same response twice.
+
+    >>> response = Response({}, 200)
+    >>> timed_response = _with_duration(response, 0.5)
+    >>> timed_response == response, timed_response.duration, response.duration
+    (True, 0.5, None)
+    """
+    if not isinstance(emulator_result, (Response, Error)):
+        return emulator_result
+    timed_result = type(emulator_result)(*emulator_result)
+    timed_result.__dict__['duration'] = duration
+    return timed_result
+
+
+def _without(provider_states: Tuple[ProviderState, ...],
+             excluded_provider_states: Tuple[ProviderState, ...]) -> Tuple[ProviderState, ...]:
+    """
+    >>> _without((ProviderState('a'), ProviderState('b')), (ProviderState('a'),))
+    (ProviderState(descriptor='b', params=None),)
+    """
+    return tuple(provider_state for provider_state in provider_states
+                 if provider_state not in excluded_provider_states)
+
+
+async def _enter_fixture(stack: contextlib.AsyncExitStack,
+                         fixture: Union[ContextManager, AsyncContextManager],
+                         fixture_function: Callable) -> None:
+    fixture = profiler.timed_fixture(fixture, fixture_function.__name__)
+    if isinstance(fixture, contextlib.AbstractAsyncContextManager):
+        await stack.enter_async_context(fixture)
+    else:
+        stack.enter_context(fixture)
+
+
+def _use_always(always: Optional[AlwaysFixture]) -> ContextManager:
+    if not always:
+        return nullcontext()
+    return cast(ContextManager, profiler.timed_fixture(always(), always.__name__))
+
+
+def _faasport_request(request: Request) -> Request:
+    """A copy of an interaction's request for the faasport, whose headers, query and body it may
+    change. Pacts share their read-only headers and queries between interactions, and share one
+    empty body between the requests without one.
+
+    >>> from faaspact_verifier.definitions import FrozenDict
+    >>> request = _faasport_request(Request(FrozenDict({'Accept': '*/*'}), '/', 'GET',
+    ...                                     body=EMPTY_MAPPING))
+    >>> request.headers['Accept'] = 'text/html'
+    >>> request.body['name'] = 'humpty'
+    >>> request.headers, request.body
+    ({'Accept': 'text/html'}, {'name': 'humpty'})
+    """
+    return request._replace(
+        headers=dict(request.headers),
+        query=None if request.query is None else dict(request.query),
+        body={} if request.body is EMPTY_MAPPING else request.body
+    )
+
+
+def _describe(interaction: Interaction) -> str:
+    """
+    >>> _describe(Interaction(Request({}, '/users', 'GET'), Response({}, 200), ()))
+    'GET /users'
+    """
+    return f'{interaction.request.method} {interaction.request.path}'
+
+
+def _is_async_fixture(fixture: Optional[Callable]) -> bool:
+    """Return True if fixture wraps an async generator, as async @provider_state and @always
+    fixtures do.
+
+    >>> @contextlib.contextmanager
+    ... def sync_fixture(): yield
+    >>> _is_async_fixture(sync_fixture)
+    False
+
+    >>> @contextlib.asynccontextmanager
+    ... async def async_fixture(): yield
+    >>> _is_async_fixture(async_fixture)
+    True
+    """
+    return fixture is not None and inspect.isasyncgenfunction(inspect.unwrap(fixture))
 
 
 def _provider_state_fixtures_with_params(
-        provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+        provider_state_registry: _ProviderStateRegistry,
         provider_states: Tuple[ProviderState, ...]
 ) -> List[Tuple[ProviderStateFixture, Dict]]:
     """Get a list of provider states fixtures for an interaction with their parameters.
@@ -59,13 +731,17 @@ def _provider_state_fixtures_with_params(
     """
     provider_state_fixtures_with_params: List[Tuple[ProviderStateFixture, Dict]] = []
     for provider_state in provider_states:
-        provider_state_fixture = provider_state_fixture_by_descriptor.get(provider_state.descriptor)
+        provider_state_fixture = provider_state_registry.fixture_by_descriptor.get(
+            provider_state.descriptor
+        )
         if not provider_state_fixture:
             raise UnsupportedProviderStateError(
                 f'Missing expected provider state: {provider_state}'
             )
         if provider_state.params:
-            fixture_params = _pluck_parameter_names(provider_state_fixture)
+            fixture_params = (
+                provider_state_registry.parameter_names_by_descriptor[provider_state.descriptor]
+            )
             if not frozenset(provider_state.params.keys()) == fixture_params:
                 raise UnsupportedProviderStateError(
                     'Expected provider state params dont match those of '
@@ -97,6 +773,9 @@ def _use_provider_states(
     """Run all given provider states as a contextmanager."""
     with contextlib.ExitStack() as stack:
         for provider_state_fixture, params in provider_state_fixtures_with_params:
-            stack.enter_context(provider_state_fixture(**params))
+            stack.enter_context(cast(ContextManager, profiler.timed_fixture(
+                provider_state_fixture(**params),
+                provider_state_fixture.__name__
+            )))
 
         yield
@@ -0,0 +1,194 @@
+from collections import deque
+from contextlib import nullcontext  # type: ignore
+from functools import partial
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    cast
+)
+
+from faaspact_verifier import profiler
+from faaspact_verifier.definitions import Interaction, Pact, VerifierOptions
+from faaspact_verifier.entities import emulator
+from faaspact_verifier.types import EmulatorResult
+from faaspact_verifier.user_defined.loader import FaasportModule, load_faasport_module
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+_worker_faasport_module: Optional[FaasportModule] = None
+
+
+def emulate_pacts_interactions(
+        pacts: List[Pact],
+        options: VerifierOptions
+) -> List[List[EmulatorResult]]:
+    """Emulate the interactions of all pacts across a pool of `options.workers` worker processes.
+    Each worker imports the options' faasport module once and runs the @always and
+    @provider_state fixtures itself, with the provider state scopes and parameter names that the
+    module registered. Results are returned per pact, in interaction order.
+
+    With `group_provider_states`, interactions are ordered by their provider states before being
+    chunked, so that interactions which share provider states tend to land in the same chunk.
+    Each chunk is emulated as its own run: a 'session' scoped always fixture is entered once per
+    chunk, and with a 'pact' scoped one, every pact is a chunk of its own.
+
+    With `dedupe_interactions`, identical interactions are left out before chunking, as in
+    emulator.emulate_pacts_interactions.
+    """
+    with _create_executor(options) as executor:
+        def emulate_segments(
+                segments: Iterable[List[Interaction]]
+        ) -> Iterator[List[EmulatorResult]]:
+            return iter(_emulate_segments(executor, list(segments), options))
+
+        segments = [list(pact.interactions) for pact in pacts]
+        if options.dedupe_interactions:
+            return list(emulator.iter_deduplicated_segments(
+                segments,
+                emulate_segments,
+                options.nondeterministic_provider_states
+            ))
+        return list(emulate_segments(segments))
+
+
+def iter_emulate_pacts_interactions(
+        pacts: Iterable[Pact],
+        options: VerifierOptions
+) -> Iterator[Tuple[Pact, List[EmulatorResult]]]:
+    """Lazily emulate pacts one at a time as they are consumed, spreading each pact's interactions
+    across one pool of worker processes that lives as long as the iteration.
+    """
+    emulated_pacts: Deque[Pact] = deque()
+
+    def segments() -> Iterator[List[Interaction]]:
+        for pact in pacts:
+            emulated_pacts.append(pact)
+            yield list(pact.interactions)
+
+    with _create_executor(options) as executor:
+        def emulate_segments(
+                segments: Iterable[List[Interaction]]
+        ) -> Iterator[List[EmulatorResult]]:
+            for segment in segments:
+                yield _emulate_segments(executor, [segment], options)[0]
+
+        if options.dedupe_interactions:
+            emulator_results_segments = emulator.iter_deduplicated_segments(
+                segments(),
+                emulate_segments,
+                options.nondeterministic_provider_states
+            )
+        else:
+            emulator_results_segments = emulate_segments(segments())
+
+        for emulator_results in emulator_results_segments:
+            yield emulated_pacts.popleft(), emulator_results
+
+
+def _create_executor(options: VerifierOptions) -> 'Executor':
+    # Imported here since it imports multiprocessing, which runs with one worker never need.
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=options.workers,
+                               initializer=_load_worker,
+                               initargs=(cast(str, options.faasport_module),))
+
+
+def _emulate_segments(executor: 'Executor',
+                      segments: List[List[Interaction]],
+                      options: VerifierOptions) -> List[List[EmulatorResult]]:
+    """Emulate segments of interactions, one per pact, on the pool."""
+    interactions = [interaction for segment in segments for interaction in segment]
+    chunks = _chunk_indexes(segments,
+                            options.workers,
+                            options.group_provider_states,
+                            emulator.always_scope(options))
+
+    active_profiler = profiler.active_profiler()
+    emulated_chunks = executor.map(
+        partial(_emulate_interactions,
+                options=options,
+                profile=active_profiler is not None),
+        [[interactions[index] for index in chunk] for chunk in chunks]
+    )
+    emulator_result_by_index: Dict[int, EmulatorResult] = {}
+    for chunk, (emulator_results, spans) in zip(chunks, emulated_chunks):
+        emulator_result_by_index.update(zip(chunk, emulator_results))
+        if active_profiler:
+            active_profiler.extend(spans)
+
+    emulator_results_segments: List[List[EmulatorResult]] = []
+    offset = 0
+    for segment in segments:
+        emulator_results_segments.append([emulator_result_by_index[index]
+                                          for index in range(offset, offset + len(segment))])
+        offset += len(segment)
+    return emulator_results_segments
+
+
+def _chunk_indexes(segments: List[List[Interaction]],
+                   workers: int,
+                   group_provider_states: bool,
+                   always_scope: str) -> List[List[int]]:
+    """Split the indexes of all segments' interactions into chunks of work."""
+    indexes_by_segment: List[List[int]] = []
+    offset = 0
+    for segment in segments:
+        indexes_by_segment.append(list(range(offset, offset + len(segment))))
+        offset += len(segment)
+
+    if always_scope == 'pact':
+        chunks = indexes_by_segment
+    else:
+        chunks = [[index for indexes in indexes_by_segment for index in indexes]]
+
+    if group_provider_states:
+        interactions = [interaction for segment in segments for interaction in segment]
+        for chunk in chunks:
+            chunk.sort(key=lambda index: emulator.provider_states_key(
+                interactions[index].provider_states
+            ))
+
+    if always_scope == 'pact':
+        return [chunk for chunk in chunks if chunk]
+
+    chunk_size = max(1, offset // (workers * 4))
+    return [chunks[0][i:i + chunk_size] for i in range(0, offset, chunk_size)]
+
+
+def _load_worker(faasport_module: str) -> None:
+    global _worker_faasport_module
+    _worker_faasport_module = load_faasport_module(faasport_module)
+
+
+def _emulate_interactions(interactions: List[Interaction],
+                          options: VerifierOptions,
+                          profile: bool) -> Tuple[List[EmulatorResult], List[profiler.Span]]:
+    """Emulate a chunk of interactions in a worker, along with the spans recorded doing so if
+    `profile` is set.
+    """
+    assert _worker_faasport_module, 'Worker was not initialized with a faasport module'
+    worker_profiler = profiler.Profiler()
+    with profiler.profiling(worker_profiler) if profile else nullcontext():
+        emulator_results = emulator.emulate_interactions(
+            interactions,
+            _worker_faasport_module.provider_state_fixture_by_descriptor,
+            _worker_faasport_module.faasport,
+            _worker_faasport_module.always,
+            options._replace(
+                provider_state_scope_by_descriptor=(
+                    _worker_faasport_module.provider_state_scope_by_descriptor
+                ),
+                provider_state_parameter_names_by_descriptor=(
+                    _worker_faasport_module.provider_state_parameter_names_by_descriptor
+                )
+            )
+        )
+    return emulator_results, worker_profiler.spans
@@ -0,0 +1,160 @@
+"""Which interactions a change to the provider's source could affect, judged by the code that each
+interaction ran when it was last emulated.
+
+Code is keyed by its file and qualified name. Functions are fingerprinted from their syntax tree,
+so that moving a function around its file doesn't count as changing it. Everything else in a file
+(imports, constants, decorators and registrations, class attributes) makes up the file's
+structure, and a change to the structure of a module that the faasport imported could affect any
+interaction. So could a change to a function that runs as its module is imported.
+"""
+import ast
+import os
+import sys
+from types import CodeType, FrameType
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast
+)
+
+
+CodeKey = Tuple[str, str]
+
+_FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+class SourceFingerprint(NamedTuple):
+    function_dumps_by_name: Dict[str, FrozenSet[str]]
+    structure: str
+
+
+class CodeChange(NamedTuple):
+    code_keys: FrozenSet[CodeKey] = frozenset()
+    structural: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.code_keys) or self.structural
+
+    def __or__(self, other: Any) -> 'CodeChange':
+        return CodeChange(code_keys=self.code_keys | other.code_keys,
+                          structural=self.structural or other.structural)
+
+    def affects(self, code_keys: FrozenSet[CodeKey]) -> bool:
+        """Whether the change could affect an interaction that ran the code of `code_keys`."""
+        return self.structural or not self.code_keys.isdisjoint(code_keys)
+
+
+class CodeTracer:
+    """Context manager that records the code, out of the code defined in `filenames`, that is
+    called inside it. Its `code_keys` are set on exit."""
+
+    def __init__(self, filenames: FrozenSet[str]) -> None:
+        self.filenames = filenames
+        self.code_keys: FrozenSet[CodeKey] = frozenset()
+        self._codes: Set[CodeType] = set()
+        self._previous_profile: Any = None
+
+    def __enter__(self) -> 'CodeTracer':
+        self._codes.clear()
+        self._previous_profile = sys.getprofile()
+        sys.setprofile(self._profile)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        sys.setprofile(self._previous_profile)
+        code_keys = {code_key(code) for code in self._codes}
+        self.code_keys = frozenset(key for key in code_keys if key[0] in self.filenames)
+
+    def _profile(self, frame: FrameType, event: str, arg: Any) -> None:
+        if event == 'call':
+            self._codes.add(frame.f_code)
+
+
+def code_key(code: CodeType) -> CodeKey:
+    """Key code by its file and, on Pythons that record it, its qualified name."""
+    return (os.path.abspath(code.co_filename), getattr(code, 'co_qualname', code.co_name))
+
+
+def fingerprint_source(source: Union[str, bytes], filename: str) -> SourceFingerprint:
+    """Fingerprint each function defined in a module's source, and the rest of the module.
+
+    >>> a = fingerprint_source('X = 1\\ndef f():\\n    return X\\n', 'a.py')
+    >>> b = fingerprint_source('X = 1\\n\\n\\ndef f():\\n    return X + 1\\n', 'a.py')
+    >>> diff_fingerprints('a.py', a, b).code_keys == {(os.path.abspath('a.py'), 'f')}
+    True
+    >>> diff_fingerprints('a.py', a, b).structural
+    False
+    """
+    tree = ast.parse(source, filename)
+    function_dumps_by_name: Dict[str, Set[str]] = {}
+    for name, node in _iter_functions(tree.body, prefix=''):
+        function_dumps_by_name.setdefault(name, set()).add(ast.dump(node))
+    return SourceFingerprint(
+        function_dumps_by_name={name: frozenset(dumps)
+                                for name, dumps in function_dumps_by_name.items()},
+        structure=ast.dump(_strip_functions(tree))
+    )
+
+
+def diff_fingerprints(filename: str,
+                      old: Optional[SourceFingerprint],
+                      new: Optional[SourceFingerprint]) -> CodeChange:
+    """The change between two fingerprints of a file, either of which is None if the file didn't
+    exist or didn't parse."""
+    old_dumps = old.function_dumps_by_name if old else {}
+    new_dumps = new.function_dumps_by_name if new else {}
+    path = os.path.abspath(filename)
+    return CodeChange(
+        code_keys=frozenset((path, name) for name in old_dumps.keys() | new_dumps.keys()
+                            if old_dumps.get(name) != new_dumps.get(name)),
+        structural=(old.structure if old else None) != (new.structure if new else None)
+    )
+
+
+def _iter_functions(body: Iterable[ast.AST], prefix: str) -> Iterable[Tuple[str, _FunctionNode]]:
+    """Functions nested anywhere in `body`, with the names their code objects are keyed by."""
+    qualify = sys.version_info >= (3, 11)
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            name = prefix + node.name if qualify else node.name
+            yield name, node
+            yield from _iter_functions(_nested_statements(node), f'{name}.<locals>.')
+        elif isinstance(node, ast.ClassDef):
+            yield from _iter_functions(node.body, f'{prefix}{node.name}.')
+        else:
+            yield from _iter_functions(_nested_statements(node), prefix)
+
+
+def _nested_statements(node: ast.AST) -> List[ast.AST]:
+    return [child for field in ('body', 'orelse', 'finalbody', 'handlers')
+            for child in getattr(node, field, [])
+            if isinstance(child, (ast.stmt, ast.excepthandler))]
+
+
+class _FunctionStripper(ast.NodeTransformer):
+    """Drops undecorated functions, which only do anything when code that calls them runs, and
+    empties the bodies of decorated ones, whose decorators run as the module is imported."""
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> Optional[ast.AST]:
+        return self._strip(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> Optional[ast.AST]:
+        return self._strip(node)
+
+    def _strip(self, node: _FunctionNode) -> Optional[ast.AST]:
+        if not node.decorator_list:
+            return None
+        node.body = [ast.Pass()]
+        return node
+
+
+def _strip_functions(tree: ast.Module) -> ast.AST:
+    return cast(ast.AST, _FunctionStripper().visit(tree))
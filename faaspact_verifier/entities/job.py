@@ -7,12 +7,17 @@ def succeeded(pact_with_verification_results: Iterable[Tuple[Pact, List[Verifica
               failon: FrozenSet[str]) -> bool:
     for pact, verification_results in pact_with_verification_results:
         verified = all(verification_result.verified for verification_result in verification_results)
-        if not verified and _overlap(pact.tags, failon):
+        if not verified and fails_on(pact, failon):
             return False
 
     return True
 
 
+def fails_on(pact: Pact, failon: FrozenSet[str]) -> bool:
+    """Return True if a failed verification of the pact should fail the job."""
+    return _overlap(pact.tags, failon)
+
+
 def _overlap(set_a: FrozenSet, set_b: FrozenSet) -> bool:
     """Return True if there are overlapping items in set_a and set_b, otherwise return False.
 
@@ -0,0 +1,57 @@
+import re
+from typing import FrozenSet, Optional
+
+from faaspact_verifier.definitions import Interaction, Pact
+
+
+def select_interactions(pact: Pact,
+                        description_pattern: Optional[str] = None,
+                        provider_states: FrozenSet[str] = frozenset()) -> Optional[Pact]:
+    """Narrow a pact down to the interactions whose description matches `description_pattern` and
+    that use at least one of `provider_states`, when given. Returns None if no interaction is
+    left, and the pact itself if there is nothing to select by.
+
+    >>> pact = Pact('1', {'interactions': [
+    ...     {'description': 'a request for a user', 'request': {'path': '/user', 'method': 'GET'},
+    ...      'response': {'status': 200}, 'providerStates': [{'name': 'there is a user'}]},
+    ...     {'description': 'a request for an egg', 'request': {'path': '/egg', 'method': 'GET'},
+    ...      'response': {'status': 200}}]}, 'x')
+    >>> [i.request.path for i in select_interactions(pact, description_pattern='egg').interactions]
+    ['/egg']
+    >>> select_interactions(pact, description_pattern='egg').interaction_index(0)
+    1
+    >>> select_interactions(pact, provider_states=frozenset({'there is an egg'})) is None
+    True
+    >>> select_interactions(pact) is pact
+    True
+    """
+    if description_pattern is None and not provider_states:
+        return pact
+
+    indexes = tuple([index for index, interaction in enumerate(pact.interactions)
+                     if _is_selected(interaction, description_pattern, provider_states)])
+    if not indexes:
+        return None
+
+    pact_json = {field: value for field, value in pact.pact_json.items()
+                 if field != 'interactions'}
+    return Pact.with_interactions(tuple([pact.interactions[index] for index in indexes]),
+                                  pact.consumer_version,
+                                  pact_json,
+                                  pact.pact_version,
+                                  pact.tags,
+                                  tuple([pact.interaction_index(index) for index in indexes]))
+
+
+def _is_selected(interaction: Interaction,
+                 description_pattern: Optional[str],
+                 provider_states: FrozenSet[str]) -> bool:
+    if (description_pattern is not None
+            and not re.search(description_pattern, interaction.description or '')):
+        return False
+
+    if provider_states and not any(provider_state.descriptor in provider_states
+                                   for provider_state in interaction.provider_states):
+        return False
+
+    return True
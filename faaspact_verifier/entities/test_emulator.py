@@ -0,0 +1,414 @@
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncGenerator, Dict, Generator, List
+
+import pytest
+
+from faaspact_verifier import profiler
+from faaspact_verifier.definitions import Error, Pact, Request, Response, VerifierOptions
+from faaspact_verifier.entities import emulator
+from faaspact_verifier.types import Faasport
+
+
+class TestEmulatePactsInteractions:
+
+    def test_runs_async_faasport_with_mixed_fixtures(self) -> None:
+        # Given
+        events: List[str] = []
+
+        @asynccontextmanager
+        async def always() -> AsyncGenerator:
+            events.append('always')
+            yield
+
+        @contextmanager
+        def there_is_a_user(name: str) -> Generator:
+            events.append(f'user {name}')
+            yield
+
+        @asynccontextmanager
+        async def there_is_an_egg() -> AsyncGenerator:
+            events.append('egg')
+            yield
+
+        async def faasport(request: Request) -> Response:
+            await asyncio.sleep(0)
+            return Response(headers={}, status=200, body={'path': request.path})
+
+        pacts = [
+            _make_pact([_make_raw_interaction('/a', {'name': 'there is a user',
+                                                     'params': {'name': 'zach'}})]),
+            _make_pact([_make_raw_interaction('/b', {'name': 'there is an egg'}),
+                        _make_raw_interaction('/c', {'name': 'there is a bird'})])
+        ]
+
+        # When
+        emulator_results_list = emulator.emulate_pacts_interactions(
+            pacts,
+            {'there is a user': there_is_a_user, 'there is an egg': there_is_an_egg},
+            faasport,
+            always
+        )
+
+        # Then
+        assert emulator_results_list[0] == [Response(headers={}, status=200, body={'path': '/a'})]
+        assert emulator_results_list[1][0] == Response(headers={}, status=200, body={'path': '/b'})
+        assert isinstance(emulator_results_list[1][1], Error)
+        assert events == ['always', 'user zach', 'always', 'egg']
+
+    def test_limits_async_concurrency(self) -> None:
+        # Given
+        in_flight: List[int] = [0]
+        max_in_flight: List[int] = [0]
+
+        async def faasport(request: Request) -> Response:
+            in_flight[0] += 1
+            max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+            await asyncio.sleep(0.001)
+            in_flight[0] -= 1
+            return Response(headers={}, status=200)
+
+        pact = _make_pact([_make_raw_interaction(f'/{i}') for i in range(10)])
+
+        # When
+        emulator_results_list = emulator.emulate_pacts_interactions(
+            [pact],
+            {},
+            faasport,
+            options=VerifierOptions(concurrency=3)
+        )
+
+        # Then
+        assert len(emulator_results_list[0]) == 10
+        assert max_in_flight[0] == 3
+
+    def test_sets_up_group_scoped_provider_states_once_per_group(self) -> None:
+        # Given
+        events: List[str] = []
+
+        @contextmanager
+        def always() -> Generator:
+            events.append('always')
+            yield
+
+        @contextmanager
+        def there_is_a_user(id: int) -> Generator:
+            events.append(f'user {id}')
+            yield
+
+        @contextmanager
+        def there_is_an_egg() -> Generator:
+            events.append('egg')
+            yield
+
+        def faasport(request: Request) -> Response:
+            events.append(f'call {request.path}')
+            return Response(headers={}, status=200)
+
+        user_1 = {'name': 'there is a user', 'params': {'id': 1}}
+        user_2 = {'name': 'there is a user', 'params': {'id': 2}}
+        egg = {'name': 'there is an egg'}
+        pacts = [
+            _make_pact([_make_raw_interaction('/a', user_1, egg),
+                        _make_raw_interaction('/b', user_2),
+                        _make_raw_interaction('/c')]),
+            _make_pact([_make_raw_interaction('/d', user_1)])
+        ]
+
+        # When
+        emulator_results_list = emulator.emulate_pacts_interactions(
+            pacts,
+            {'there is a user': there_is_a_user, 'there is an egg': there_is_an_egg},
+            faasport,
+            always,
+            VerifierOptions(group_provider_states=True,
+                            provider_state_scope_by_descriptor={'there is a user': 'group'})
+        )
+
+        # Then
+        assert [len(emulator_results) for emulator_results in emulator_results_list] == [3, 1]
+        assert events == [
+            'always', 'call /c', 'user 1', 'egg', 'call /a', 'user 2', 'call /b',
+            'always', 'user 1', 'call /d'
+        ]
+
+    def test_enters_interaction_scoped_always_fixture_around_grouped_interactions(self) -> None:
+        # Given
+        entries: List[str] = []
+
+        @contextmanager
+        def always() -> Generator:
+            entries.append('always')
+            yield
+
+        @contextmanager
+        def there_is_a_user(id: int) -> Generator:
+            entries.append(f'user {id}')
+            yield
+
+        def faasport(request: Request) -> Response:
+            return Response(headers={}, status=200)
+
+        async def async_faasport(request: Request) -> Response:
+            return faasport(request)
+
+        user = {'name': 'there is a user', 'params': {'id': 1}}
+        pact = _make_pact([_make_raw_interaction(path, user) for path in ['/a', '/b', '/c']])
+
+        ports: List[Faasport] = [faasport, async_faasport]
+        for port in ports:
+            entries.clear()
+
+            # When
+            emulator.emulate_pacts_interactions(
+                [pact],
+                {'there is a user': there_is_a_user},
+                port,
+                always,
+                VerifierOptions(group_provider_states=True,
+                                provider_state_scope_by_descriptor={'there is a user': 'group'})
+            )
+
+            # Then
+            assert entries == ['always', 'user 1']
+
+    @pytest.mark.parametrize('always_scope, expected_events', [  # type: ignore
+        pytest.param('interaction', ['enter', '/a', 'exit', 'enter', '/b', 'exit',
+                                     'enter', '/c', 'exit'], id='interaction'),
+        pytest.param('pact', ['enter', '/a', '/b', 'exit', 'enter', '/c', 'exit'], id='pact'),
+        pytest.param('session', ['enter', '/a', '/b', '/c', 'exit'], id='session')
+    ])
+    def test_enters_always_fixture_per_scope(self,
+                                             always_scope: str,
+                                             expected_events: List[str]) -> None:
+        # Given
+        events: List[str] = []
+
+        @contextmanager
+        def always() -> Generator:
+            events.append('enter')
+            yield
+            events.append('exit')
+
+        def faasport(request: Request) -> Response:
+            events.append(request.path)
+            return Response(headers={}, status=200)
+
+        pacts = [
+            _make_pact([_make_raw_interaction('/a'), _make_raw_interaction('/b')]),
+            _make_pact([_make_raw_interaction('/c')])
+        ]
+
+        # When
+        emulator.emulate_pacts_interactions(
+            pacts,
+            {},
+            faasport,
+            always,
+            VerifierOptions(always_scope=always_scope)
+        )
+
+        # Then
+        assert events == expected_events
+
+    def test_dedupes_identical_interactions(self) -> None:
+        # Given
+        calls: List[str] = []
+
+        @contextmanager
+        def there_is_a_user(id: int) -> Generator:
+            yield
+
+        @contextmanager
+        def the_time_is_now() -> Generator:
+            yield
+
+        def faasport(request: Request) -> Response:
+            calls.append(request.path)
+            return Response(headers={}, status=200, body={'call': len(calls)})
+
+        user = {'name': 'there is a user', 'params': {'id': 1}}
+        now = {'name': 'the time is now'}
+        pacts = [
+            _make_pact([_make_raw_interaction('/a', user), _make_raw_interaction('/b', now)]),
+            _make_pact([_make_raw_interaction('/a', user), _make_raw_interaction('/a'),
+                        _make_raw_interaction('/b', now)])
+        ]
+
+        # When
+        emulator_results_list = emulator.emulate_pacts_interactions(
+            pacts,
+            {'there is a user': there_is_a_user, 'the time is now': the_time_is_now},
+            faasport,
+            options=VerifierOptions(dedupe_interactions=True,
+                                    nondeterministic_provider_states=frozenset({'the time is now'}))
+        )
+
+        # Then
+        assert calls == ['/a', '/b', '/a', '/b']
+        assert emulator_results_list == [
+            [Response({}, 200, {'call': 1}), Response({}, 200, {'call': 2})],
+            [Response({}, 200, {'call': 1}), Response({}, 200, {'call': 3}),
+             Response({}, 200, {'call': 4})]
+        ]
+
+    def test_hands_faasports_requests_they_can_change(self) -> None:
+        # Given
+        def faasport(request: Request) -> Response:
+            request.headers['X-Seen'] = 'yes'
+            request.body['seen'] = True
+            return Response(headers={}, status=200, body=dict(request.headers))
+
+        async def async_faasport(request: Request) -> Response:
+            return faasport(request)
+
+        raw_interactions = [
+            {**_make_raw_interaction(path), 'request': {'path': path,
+                                                        'method': 'GET',
+                                                        'headers': {'Accept': '*/*'}}}
+            for path in ['/a', '/b']
+        ]
+
+        ports: List[Faasport] = [faasport, async_faasport]
+        for port in ports:
+            pact = _make_pact(raw_interactions)
+
+            # When
+            [emulator_results] = emulator.emulate_pacts_interactions([pact], {}, port)
+
+            # Then
+            assert emulator_results == [
+                Response({}, 200, {'Accept': '*/*', 'X-Seen': 'yes'}),
+                Response({}, 200, {'Accept': '*/*', 'X-Seen': 'yes'})
+            ]
+            assert pact.interactions[0].request.headers == {'Accept': '*/*'}
+            assert pact.interactions[1].request.body == {}
+
+    def test_records_interaction_and_fixture_spans_when_profiling(self) -> None:
+        # Given
+        @contextmanager
+        def there_is_a_user(id: int) -> Generator:
+            yield
+
+        def faasport(request: Request) -> Response:
+            return Response(headers={}, status=200)
+
+        user = {'name': 'there is a user', 'params': {'id': 1}}
+        pacts = [_make_pact([_make_raw_interaction('/a', user), _make_raw_interaction('/b')])]
+
+        # When
+        with profiler.profiling(profiler.Profiler()) as run_profiler:
+            emulator.emulate_pacts_interactions(pacts, {'there is a user': there_is_a_user},
+                                                faasport)
+
+        # Then
+        assert [(span.name, span.category) for span in run_profiler.spans] == [
+            ('there_is_a_user setup', 'fixture'),
+            ('faasport', 'faasport'),
+            ('there_is_a_user teardown', 'fixture'),
+            ('GET /a', 'interaction'),
+            ('faasport', 'faasport'),
+            ('GET /b', 'interaction')
+        ]
+
+
+class TestIterEmulatePactsInteractions:
+
+    def test_emulates_each_pact_as_it_is_consumed(self) -> None:
+        # Given
+        events: List[str] = []
+
+        @asynccontextmanager
+        async def always() -> AsyncGenerator:
+            events.append('enter')
+            yield
+            events.append('exit')
+
+        async def faasport(request: Request) -> Response:
+            events.append(request.path)
+            return Response(headers={}, status=200)
+
+        pacts = [_make_pact([_make_raw_interaction('/a')]),
+                 _make_pact([_make_raw_interaction('/b')])]
+
+        def fetched_pacts() -> Generator:
+            for pact in pacts:
+                events.append('fetch')
+                yield pact
+
+        # When
+        for _ in emulator.iter_emulate_pacts_interactions(
+                fetched_pacts(),
+                {},
+                faasport,
+                always,
+                VerifierOptions(always_scope='session')):
+            events.append('verify')
+
+        # Then
+        assert events == ['enter', 'fetch', '/a', 'verify', 'fetch', '/b', 'verify', 'exit']
+
+
+class TestFindUnsupportedProviderStates:
+
+    def test_finds_missing_provider_states_and_mismatched_params(self) -> None:
+        # Given
+        @contextmanager
+        def there_is_a_user(id: int) -> Generator:
+            yield
+
+        pact = _make_pact([
+            _make_raw_interaction('/a', {'name': 'there is a user', 'params': {'id': 1}}),
+            _make_raw_interaction('/b', {'name': 'there is a bird'}),
+            _make_raw_interaction('/c', {'name': 'there is a user', 'params': {'name': 'zach'}})
+        ])
+
+        # When
+        unsupported_provider_states = emulator.find_unsupported_provider_states(
+            [pact],
+            {'there is a user': there_is_a_user}
+        )
+
+        # Then
+        assert [(index, reason.split(':')[0])
+                for _, index, reason in unsupported_provider_states] == [
+            (1, 'Missing expected provider state'),
+            (2, 'Expected provider state params dont match those of provider. Expected')
+        ]
+
+    def test_checks_params_against_the_recorded_parameter_names(self) -> None:
+        # Given
+        @contextmanager
+        def there_is_a_user(**params: Any) -> Generator:
+            yield
+
+        pact = _make_pact([
+            _make_raw_interaction('/a', {'name': 'there is a user', 'params': {'id': 1}}),
+            _make_raw_interaction('/b', {'name': 'there is a user', 'params': {'name': 'zach'}})
+        ])
+
+        # When
+        unsupported_provider_states = emulator.find_unsupported_provider_states(
+            [pact],
+            {'there is a user': there_is_a_user},
+            {'there is a user': frozenset({'id'})}
+        )
+
+        # Then
+        assert [index for _, index, _ in unsupported_provider_states] == [1]
+
+
+def _make_pact(raw_interactions: List[Dict]) -> Pact:
+    return Pact(
+        consumer_version='1',
+        pact_json={'interactions': raw_interactions},
+        pact_version='abc'
+    )
+
+
+def _make_raw_interaction(path: str, *raw_provider_states: Dict) -> Dict:
+    return {
+        'request': {'path': path, 'method': 'GET'},
+        'response': {'status': 200},
+        'providerStates': list(raw_provider_states)
+    }
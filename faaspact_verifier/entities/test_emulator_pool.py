@@ -0,0 +1,90 @@
+import sys
+import textwrap
+from typing import Any, Dict, Generator
+
+import pytest
+
+from faaspact_verifier.definitions import Error, Response, VerifierOptions
+from faaspact_verifier.entities import emulator_pool
+from faaspact_verifier.entities.test_emulator import _make_pact, _make_raw_interaction
+
+
+FAASPORT_MODULE_SOURCE = textwrap.dedent('''
+    from faaspact_verifier import faasport, provider_state
+    from faaspact_verifier.definitions import Response
+
+    users = []
+
+    @provider_state('there is a user')
+    def there_is_a_user(name):
+        users.append(name)
+        yield
+        users.remove(name)
+
+    @faasport
+    def port(request):
+        return Response(headers={}, status=200, body={'path': request.path, 'users': list(users)})
+''')
+
+
+@pytest.fixture  # type: ignore
+def faasport_module(tmp_path: Any) -> Generator[str, None, None]:
+    (tmp_path / 'pool_faasport.py').write_text(FAASPORT_MODULE_SOURCE)
+    sys.path.insert(0, str(tmp_path))
+    yield 'pool_faasport'
+    sys.path.remove(str(tmp_path))
+
+
+class TestEmulatePactsInteractions:
+
+    def test_returns_results_per_pact_in_interaction_order(self, faasport_module: str) -> None:
+        # Given
+        pacts = [
+            _make_pact([_make_raw_interaction(f'/a/{i}', _there_is_a_user(f'a{i}'))
+                        for i in range(7)]),
+            _make_pact([]),
+            _make_pact([_make_raw_interaction('/b/0', _there_is_a_user('b0')),
+                        _make_raw_interaction('/b/1', {'name': 'there is no user'})])
+        ]
+
+        # When
+        emulator_results_list = emulator_pool.emulate_pacts_interactions(
+            pacts,
+            VerifierOptions(workers=2, faasport_module=faasport_module)
+        )
+
+        # Then
+        assert emulator_results_list[0] == [
+            Response(headers={}, status=200, body={'path': f'/a/{i}', 'users': [f'a{i}']})
+            for i in range(7)
+        ]
+        assert emulator_results_list[1] == []
+        assert emulator_results_list[2][0] == Response(
+            headers={},
+            status=200,
+            body={'path': '/b/0', 'users': ['b0']}
+        )
+        assert isinstance(emulator_results_list[2][1], Error)
+
+    def test_dedupes_identical_interactions(self, faasport_module: str) -> None:
+        # Given
+        pacts = [_make_pact([_make_raw_interaction('/a', _there_is_a_user('a'))]),
+                 _make_pact([_make_raw_interaction('/a', _there_is_a_user('a')),
+                             _make_raw_interaction('/b', _there_is_a_user('b'))])]
+
+        # When
+        emulator_results_list = emulator_pool.emulate_pacts_interactions(
+            pacts,
+            VerifierOptions(workers=2, faasport_module=faasport_module, dedupe_interactions=True)
+        )
+
+        # Then
+        assert emulator_results_list == [
+            [Response(headers={}, status=200, body={'path': '/a', 'users': ['a']})],
+            [Response(headers={}, status=200, body={'path': '/a', 'users': ['a']}),
+             Response(headers={}, status=200, body={'path': '/b', 'users': ['b']})]
+        ]
+
+
+def _there_is_a_user(name: str) -> Dict:
+    return {'name': 'there is a user', 'params': {'name': name}}
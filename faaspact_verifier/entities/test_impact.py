@@ -0,0 +1,98 @@
+import os
+import textwrap
+
+from faaspact_verifier.entities.impact import (
+    CodeChange,
+    CodeTracer,
+    diff_fingerprints,
+    fingerprint_source
+)
+
+
+SOURCE = textwrap.dedent('''
+    from faaspact_verifier import provider_state
+
+    GREETING = 'hello'
+
+    @provider_state('there is a user')
+    def there_is_a_user():
+        yield
+
+    class Handler:
+        def get(self):
+            return GREETING
+
+        def post(self):
+            return 201
+''')
+
+
+class TestDiffFingerprints:
+
+    def test_keys_changed_function_bodies(self) -> None:
+        # Given
+        old = fingerprint_source(SOURCE, 'handlers.py')
+        new = fingerprint_source(SOURCE.replace('return 201', 'return 202'), 'handlers.py')
+
+        # When
+        code_change = diff_fingerprints('handlers.py', old, new)
+
+        # Then
+        assert code_change.code_keys == {(os.path.abspath('handlers.py'), _name('Handler.post'))}
+        assert not code_change.structural
+
+    def test_ignores_added_helpers_and_moved_code(self) -> None:
+        # Given
+        old = fingerprint_source(SOURCE, 'handlers.py')
+        new = fingerprint_source('\n\n' + SOURCE + '\ndef helper():\n    return 1\n',
+                                 'handlers.py')
+
+        # When
+        code_change = diff_fingerprints('handlers.py', old, new)
+
+        # Then
+        assert code_change.code_keys == {(os.path.abspath('handlers.py'), 'helper')}
+        assert not code_change.structural
+
+    def test_flags_module_level_changes_as_structural(self) -> None:
+        for changed_source in [SOURCE.replace("'hello'", "'hi'"),
+                               SOURCE.replace("'there is a user'", "'there are users'"),
+                               SOURCE.replace('class Handler:', 'class Handler:\n    x = 1')]:
+            # Given
+            old = fingerprint_source(SOURCE, 'handlers.py')
+            new = fingerprint_source(changed_source, 'handlers.py')
+
+            # When
+            code_change = diff_fingerprints('handlers.py', old, new)
+
+            # Then
+            assert code_change.structural
+            assert code_change.affects(frozenset())
+
+
+class TestCodeTracer:
+
+    def test_records_the_code_run_from_the_given_files(self) -> None:
+        # Given
+        def handle() -> int:
+            return len(str(helper()))
+
+        def helper() -> int:
+            return 1
+
+        def untouched() -> None:
+            ...
+
+        # When
+        with CodeTracer(frozenset({os.path.abspath(__file__)})) as tracer:
+            handle()
+
+        # Then
+        names = {name.split('.')[-1] for _, name in tracer.code_keys}
+        assert names == {'handle', 'helper'}
+        assert CodeChange(code_keys=tracer.code_keys).affects(tracer.code_keys)
+
+
+def _name(qualname: str) -> str:
+    """Code is keyed by its qualified name on Pythons whose code objects record it."""
+    return qualname if hasattr(_name.__code__, 'co_qualname') else qualname.split('.')[-1]
@@ -1,3 +1,43 @@
-from .logger_notification_gateway import LoggerNotificationGateway
-from .pact_broker_gateway import PactBrokerGateway
-from .pactman_verifier import PactmanVerifier
+"""Gateways are imported on first access, so that importing the package doesn't pay for requests,
+pactman and colorama until a gateway that needs them is used."""
+import importlib
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .composite_notification_gateway import CompositeNotificationGateway
+    from .junit_notification_gateway import JUnitNotificationGateway
+    from .logger_notification_gateway import LoggerNotificationGateway
+    from .native_verifier import NativeVerifier
+    from .ndjson_notification_gateway import NdjsonNotificationGateway
+    from .pact_broker_gateway import PactBrokerGateway
+    from .pact_cache import PactCache
+    from .pactman_verifier import PactmanVerifier
+    from .verification_ledger import SqliteVerificationLedger
+
+
+_MODULE_BY_NAME = {
+    'CompositeNotificationGateway': 'composite_notification_gateway',
+    'JUnitNotificationGateway': 'junit_notification_gateway',
+    'LoggerNotificationGateway': 'logger_notification_gateway',
+    'NativeVerifier': 'native_verifier',
+    'NdjsonNotificationGateway': 'ndjson_notification_gateway',
+    'PactBrokerGateway': 'pact_broker_gateway',
+    'PactCache': 'pact_cache',
+    'PactmanVerifier': 'pactman_verifier',
+    'SqliteVerificationLedger': 'verification_ledger'
+}
+
+__all__ = sorted(_MODULE_BY_NAME)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _MODULE_BY_NAME[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+
+    return getattr(importlib.import_module(f'.{module_name}', __name__), name)
+
+
+def __dir__() -> Any:
+    return sorted(list(globals()) + __all__)
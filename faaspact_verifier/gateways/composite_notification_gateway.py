@@ -0,0 +1,69 @@
+from typing import FrozenSet, List, Optional
+
+from faaspact_verifier.abc import NotificationGateway as NotificationGatewayABC
+from faaspact_verifier.definitions import Pact, VerificationResult
+from faaspact_verifier.exceptions import PactBrokerError
+from faaspact_verifier.types import EmulatorResult
+
+
+class CompositeNotificationGateway(NotificationGatewayABC):
+    """Forwards every announcement to each of several notification gateways, in order."""
+
+    def __init__(self, notification_gateways: List[NotificationGatewayABC]) -> None:
+        self.notification_gateways = notification_gateways
+
+    def announce_job_results(self,
+                             pacts: List[Pact],
+                             emulator_results_list: List[List[EmulatorResult]],
+                             verification_results_list: List[List[VerificationResult]],
+                             results_published: bool,
+                             succeeded: bool) -> None:
+        for notification_gateway in self.notification_gateways:
+            notification_gateway.announce_job_results(pacts,
+                                                      emulator_results_list,
+                                                      verification_results_list,
+                                                      results_published,
+                                                      succeeded)
+
+    def announce_publish_failure(self, pact: Pact, error: PactBrokerError) -> None:
+        for notification_gateway in self.notification_gateways:
+            notification_gateway.announce_publish_failure(pact, error)
+
+    def announce_interaction_result(self,
+                                    pact: Pact,
+                                    interaction_index: int,
+                                    emulator_result: Optional[EmulatorResult],
+                                    verification_result: VerificationResult) -> None:
+        for notification_gateway in self.notification_gateways:
+            notification_gateway.announce_interaction_result(pact,
+                                                             interaction_index,
+                                                             emulator_result,
+                                                             verification_result)
+
+    def announce_pact_results(self,
+                              pact: Pact,
+                              emulator_results: List[EmulatorResult],
+                              verification_results: List[VerificationResult]) -> None:
+        for notification_gateway in self.notification_gateways:
+            notification_gateway.announce_pact_results(pact, emulator_results, verification_results)
+
+    def announce_job_summary(self, results_published: bool, succeeded: bool) -> None:
+        for notification_gateway in self.notification_gateways:
+            notification_gateway.announce_job_summary(results_published, succeeded)
+
+    def announce_watch_cycle(self,
+                             changed_paths: FrozenSet[str],
+                             interaction_count: int,
+                             total_interaction_count: int) -> None:
+        for notification_gateway in self.notification_gateways:
+            notification_gateway.announce_watch_cycle(changed_paths,
+                                                      interaction_count,
+                                                      total_interaction_count)
+
+    def announce_reload_failure(self, formatted_error: str) -> None:
+        for notification_gateway in self.notification_gateways:
+            notification_gateway.announce_reload_failure(formatted_error)
+
+    def close(self) -> None:
+        for notification_gateway in self.notification_gateways:
+            notification_gateway.close()
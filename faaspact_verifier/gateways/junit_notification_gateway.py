@@ -0,0 +1,105 @@
+from typing import List, Optional, TextIO
+from xml.sax.saxutils import escape, quoteattr
+
+from faaspact_verifier.abc import NotificationGateway as NotificationGatewayABC
+from faaspact_verifier.definitions import Error, Pact, VerificationResult
+from faaspact_verifier.exceptions import PactBrokerError
+from faaspact_verifier.types import EmulatorResult
+
+
+class JUnitNotificationGateway(NotificationGatewayABC):
+    """Writes a JUnit XML report to a file with a testsuite per pact and a testcase per interaction.
+    The file is created once there is something to report. Each pact's testsuite is written and
+    flushed as soon as the pact is announced, and the report is closed by the job summary, or by
+    `close` if the job raised. A job summarized again, as in watch mode, writes a new report.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file: Optional[TextIO] = None
+
+    def announce_job_results(self,
+                             pacts: List[Pact],
+                             emulator_results_list: List[List[EmulatorResult]],
+                             verification_results_list: List[List[VerificationResult]],
+                             results_published: bool,
+                             succeeded: bool) -> None:
+        for group in zip(pacts, emulator_results_list, verification_results_list):
+            self.announce_pact_results(*group)
+        self.announce_job_summary(results_published, succeeded)
+
+    def announce_pact_results(self,
+                              pact: Pact,
+                              emulator_results: List[EmulatorResult],
+                              verification_results: List[VerificationResult]) -> None:
+        testcases = [
+            _format_testcase(pact,
+                             index,
+                             emulator_results[index] if emulator_results else None,
+                             verification_result)
+            for index, verification_result in enumerate(verification_results)
+        ]
+        failures = sum(not verification_result.verified
+                       for verification_result in verification_results)
+        duration = sum(emulator_result.duration or 0 for emulator_result in emulator_results)
+        self._write(
+            f'  <testsuite name={quoteattr(_suite_name(pact))} tests="{len(testcases)}" '
+            f'failures="{failures}" errors="0" time="{duration:.6f}">\n'
+            '    <properties>\n'
+            f'      <property name="consumer_version" value={quoteattr(pact.consumer_version)}/>\n'
+            f'      <property name="pact_version" value={quoteattr(pact.pact_version)}/>\n'
+            f'      <property name="tags" value={quoteattr(",".join(sorted(pact.tags)))}/>\n'
+            '    </properties>\n'
+            + ''.join(testcases) +
+            '  </testsuite>\n'
+        )
+        self._open().flush()
+
+    def announce_publish_failure(self, pact: Pact, error: PactBrokerError) -> None:
+        self._write(f'  <!-- Failed to publish results for {escape(_suite_name(pact))}: '
+                    f'{escape(str(error)).replace("--", "- -")} -->\n')
+
+    def announce_job_summary(self, results_published: bool, succeeded: bool) -> None:
+        self._open()
+        self.close()
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.write('</testsuites>\n')
+        self._file.close()
+        self._file = None
+
+    def _open(self) -> TextIO:
+        if self._file is None:
+            self._file = open(self.path, 'w')
+            self._file.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n')
+        return self._file
+
+    def _write(self, text: str) -> None:
+        self._open().write(text)
+
+
+def _suite_name(pact: Pact) -> str:
+    return f'{pact.consumer_name} -> {pact.provider_name}'
+
+
+def _format_testcase(pact: Pact,
+                     index: int,
+                     emulator_result: Optional[EmulatorResult],
+                     verification_result: VerificationResult) -> str:
+    description = pact.interactions[index].description
+    interaction_index = pact.interaction_index(index)
+    name = f'{interaction_index}: {description}' if description else str(interaction_index)
+    duration = emulator_result.duration if emulator_result else None
+    opening_tag = (f'    <testcase name={quoteattr(name)} classname={quoteattr(_suite_name(pact))}'
+                   f' time="{duration or 0:.6f}"')
+    if verification_result.verified:
+        return opening_tag + '/>\n'
+
+    message = quoteattr(verification_result.reason or '')
+    if isinstance(emulator_result, Error):
+        details = f'<failure message={message}>{escape(emulator_result.traceback or "")}</failure>'
+    else:
+        details = f'<failure message={message}/>'
+    return f'{opening_tag}>\n      {details}\n    </testcase>\n'
@@ -1,9 +1,11 @@
-from typing import List
+import os
+from typing import FrozenSet, List
 
 from colorama import Fore, Style
 
 from faaspact_verifier.abc import NotificationGateway as NotificationGatewayABC
 from faaspact_verifier.definitions import Pact, VerificationResult
+from faaspact_verifier.exceptions import PactBrokerError
 from faaspact_verifier.types import EmulatorResult
 
 
@@ -16,14 +18,42 @@ class LoggerNotificationGateway(NotificationGatewayABC):
                              results_published: bool,
                              succeeded: bool) -> None:
         """The ugliest logger."""
-        lines: List[str] = []
         for group in zip(pacts, emulator_results_list, verification_results_list):
-            lines += _format_pact_results(*group)
+            self.announce_pact_results(*group)
+        self.announce_job_summary(results_published, succeeded)
+
+    def announce_publish_failure(self, pact: Pact, error: PactBrokerError) -> None:
+        print(Fore.RED + f'Failed to publish results for pact between consumer '
+              f'"{pact.consumer_name}" and provider "{pact.provider_name}" '
+              f'(tags: {set(pact.tags)}): {error}' + Style.RESET_ALL, flush=True)
+
+    def announce_pact_results(self,
+                              pact: Pact,
+                              emulator_results: List[EmulatorResult],
+                              verification_results: List[VerificationResult]) -> None:
+        """Print the pact's results right away, flushing so that they show up in CI logs while
+        the rest of the job runs."""
+        print('\n'.join(_format_pact_results(pact, emulator_results, verification_results)),
+              flush=True)
+
+    def announce_job_summary(self, results_published: bool, succeeded: bool) -> None:
         if results_published:
-            lines.append(Fore.BLACK + '**Results for passing pacts were published**')
+            print(Fore.BLACK + '**Results for passing pacts were published**')
+
+        print(Style.RESET_ALL, flush=True)
+
+    def announce_watch_cycle(self,
+                             changed_paths: FrozenSet[str],
+                             interaction_count: int,
+                             total_interaction_count: int) -> None:
+        changes = (f'{", ".join(sorted(os.path.relpath(path) for path in changed_paths))} changed, '
+                   if changed_paths else '')
+        print(Fore.BLUE + f'{changes}verifying {interaction_count} of '
+              f'{total_interaction_count} interactions' + Style.RESET_ALL, flush=True)
 
-        print('\n'.join(lines))
-        print(Style.RESET_ALL)
+    def announce_reload_failure(self, formatted_error: str) -> None:
+        print(Fore.RED + 'Failed to reload the faasport module, waiting for another change:\n' +
+              formatted_error + Style.RESET_ALL, flush=True)
 
 
 def _format_pact_results(pact: Pact,
@@ -39,6 +69,7 @@ def _format_pact_results(pact: Pact,
     for index, verification_result in enumerate(verification_results):
         if not verification_result.verified:
             lines.append(Fore.CYAN +
-                         f'Failed interaction {index} with message: "{verification_result.reason}"')
+                         f'Failed interaction {pact.interaction_index(index)} with message: '
+                         f'"{verification_result.reason}"')
 
     return lines
@@ -0,0 +1,487 @@
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from pactman.verifier.parse_header import parse_header
+
+from faaspact_verifier.abc import Verifier as VerifierABC
+from faaspact_verifier.definitions import Error, Interaction, Pact, Response, VerificationResult
+from faaspact_verifier.types import EmulatorResult
+
+
+PathElement = Union[str, int]
+Path = List[PathElement]
+Rule = Callable[[Any, Any, Path], None]
+
+DEFAULT_MAX_CACHED_PACTS = 128
+
+
+class NativeVerifier(VerifierABC):
+    """Verifier that follows pactman's response verification semantics, but compiles each pact's
+    matching rules once per pact_version: regexes are compiled and rule paths split up front, and
+    the rule that applies to each element path is looked up once per compiled interaction.
+    """
+
+    def __init__(self, max_cached_pacts: int = DEFAULT_MAX_CACHED_PACTS) -> None:
+        self.max_cached_pacts = max_cached_pacts
+        self._compiled_interactions_by_pact_version: (
+            'OrderedDict[str, List[_CompiledInteraction]]'
+        ) = OrderedDict()
+
+    def verify_pact(self,
+                    pact: Pact,
+                    emulator_results: List[EmulatorResult]) -> List[VerificationResult]:
+        return [_verify_interaction(compiled_interaction, emulator_result)
+                for compiled_interaction, emulator_result
+                in zip(self._compile_pact(pact), emulator_results)]
+
+    def verify_pacts(
+            self,
+            pacts: List[Pact],
+            emulator_results_list: List[List[EmulatorResult]]
+    ) -> List[List[VerificationResult]]:
+        """Verify a run's pacts, compiling an expected response shared by several pacts only once
+        and verifying each distinct pairing of expected and actual response only once.
+        """
+        compiled_interaction_by_key: Dict[str, _CompiledInteraction] = {}
+        verification_result_by_key: Dict[Tuple[str, str], VerificationResult] = {}
+        verification_results_list: List[List[VerificationResult]] = []
+        for pact, emulator_results in zip(pacts, emulator_results_list):
+            verification_results: List[VerificationResult] = []
+            for compiled_interaction, emulator_result in zip(
+                    self._compile_pact(pact, compiled_interaction_by_key),
+                    emulator_results):
+                if isinstance(emulator_result, Error):
+                    verification_results.append(
+                        _verify_interaction(compiled_interaction, emulator_result)
+                    )
+                    continue
+                key = (compiled_interaction.key, _response_key(emulator_result))
+                if key not in verification_result_by_key:
+                    verification_result_by_key[key] = _verify_interaction(compiled_interaction,
+                                                                          emulator_result)
+                verification_results.append(verification_result_by_key[key])
+            verification_results_list.append(verification_results)
+        return verification_results_list
+
+    def _compile_pact(
+            self,
+            pact: Pact,
+            compiled_interaction_by_key: Optional[Dict[str, '_CompiledInteraction']] = None
+    ) -> List['_CompiledInteraction']:
+        cache = self._compiled_interactions_by_pact_version
+        try:
+            cache.move_to_end(pact.pact_version)
+            return cache[pact.pact_version]
+        except KeyError:
+            if compiled_interaction_by_key is None:
+                compiled_interaction_by_key = {}
+            compiled_interactions = []
+            for interaction in pact.interactions:
+                key = _response_key(interaction.response)
+                if key not in compiled_interaction_by_key:
+                    compiled_interaction_by_key[key] = _CompiledInteraction.compile(interaction,
+                                                                                    key)
+                compiled_interactions.append(compiled_interaction_by_key[key])
+            cache[pact.pact_version] = compiled_interactions
+            if len(cache) > self.max_cached_pacts:
+                cache.popitem(last=False)
+            return compiled_interactions
+
+
+def _verify_interaction(compiled_interaction: '_CompiledInteraction',
+                        emulator_result: EmulatorResult) -> VerificationResult:
+    if isinstance(emulator_result, Error):
+        return VerificationResult(False, emulator_result.message)
+
+    messages: List[str] = []
+    if compiled_interaction.verify(emulator_result, messages):
+        return VerificationResult(True)
+    else:
+        return VerificationResult(False, 'Verification messages: ' + str(messages))
+
+
+def _response_key(response: Response) -> str:
+    """A key identifying a response by its contents.
+
+    >>> _response_key(Response({}, 200, {'b': 1, 'a': 2})) == _response_key(
+    ...     Response({}, 200, {'a': 2, 'b': 1}))
+    True
+    """
+    return json.dumps(response, sort_keys=True, default=repr)
+
+
+class _RuleFailed(Exception):
+
+    def __init__(self, path: Path, message: str) -> None:
+        super().__init__(_format_path(path) + ' ' + message)
+
+
+class _CompiledRule(NamedTuple):
+    path: Tuple[PathElement, ...]
+    apply: Rule
+
+
+class _CompiledInteraction:
+    """An interaction's expected response, with its matching rules compiled."""
+
+    def __init__(self,
+                 key: str,
+                 response: Response,
+                 rules_by_section: Dict[str, List[_CompiledRule]],
+                 has_rules: bool) -> None:
+        self.key = key
+        self.response = response
+        self.rules_by_section = rules_by_section
+        self.has_rules = has_rules
+        self._rule_by_path: Dict[Tuple[PathElement, ...], Optional[Rule]] = {}
+
+    @classmethod
+    def compile(cls, interaction: Interaction, key: str) -> '_CompiledInteraction':
+        matching_rules = interaction.response.matching_rules or {}
+        return cls(
+            key=key,
+            response=interaction.response,
+            rules_by_section={
+                section: [_CompiledRule(tuple(_split_path(path)), _compile_rule(rule))
+                          for path, rule in matching_rules[section].items()]
+                for section in ('header', 'body') if section in matching_rules
+            },
+            has_rules=any(section in matching_rules
+                          for section in ('path', 'query', 'header', 'body'))
+        )
+
+    def verify(self, response: Response, messages: List[str]) -> bool:
+        expected = self.response
+        if response.status != expected.status:
+            return _fail(messages, f'Response status code {response.status} is not '
+                                   f'expected {expected.status}')
+        if expected.headers is not None:
+            for header, expected_value in expected.headers.items():
+                for actual_header, actual_value in response.headers.items():
+                    if header.lower() != actual_header.lower():
+                        continue
+                    if not self._check_rules(actual_value, expected_value, ['header', header],
+                                             messages):
+                        return False
+        if expected.body is not None:
+            if not self._check_rules(response.body or {}, expected.body, ['body'], messages):
+                return False
+        return True
+
+    def _check_rules(self, data: Any, spec: Any, path: Path, messages: List[str]) -> bool:
+        if self.has_rules:
+            return self._apply_rules(data, spec, path, messages)
+        if path[0] == 'header':
+            return _compare_header(data, spec, path, messages)
+        return _compare(data, spec, ['body'], messages)
+
+    def _apply_rules(self, data: Any, spec: Any, path: Path, messages: List[str]) -> bool:
+        rule = self._find_rule(path)
+        if rule:
+            try:
+                rule(data, spec, path)
+            except _RuleFailed as e:
+                return _fail(messages, str(e))
+
+        if _fold_type(spec) is list:
+            return self._apply_rules_array(data, spec, path, messages)
+        elif _fold_type(spec) is dict:
+            return self._apply_rules_dict(data, spec, path, messages)
+        elif not rule:
+            return bool(data == spec)
+        return True
+
+    def _apply_rules_array(self, data: Any, spec: List, path: Path, messages: List[str]) -> bool:
+        if _fold_type(data) is not list:
+            return _fail(messages, f'Response element is not an array (is {_nice_type(data)})')
+        if not data and not spec:
+            return True
+        if not spec and data:
+            return _fail(messages, 'Response spec requires empty array but data has contents')
+        if spec and not data:
+            return _fail(messages, 'Response spec requires data in array but data is empty')
+
+        rule = self._find_rule(path + [0])
+        if rule is not None:
+            try:
+                rule(data[0], spec[0], path)
+            except _RuleFailed as e:
+                return _fail(messages, str(e))
+        for index, data_element in enumerate(data):
+            if not self._apply_rules(data_element, spec[0], path + [index], messages):
+                return False
+        return True
+
+    def _apply_rules_dict(self, data: Any, spec: Dict, path: Path, messages: List[str]) -> bool:
+        if _fold_type(data) is not dict:
+            return _fail(messages, f'Response element is not an object (is {_nice_type(data)})')
+        for key in spec:
+            if key not in data:
+                return _fail(messages, f'Expected key {key!r} not in response')
+            if not self._apply_rules(data[key], spec[key], path + [key], messages):
+                return False
+        return True
+
+    def _find_rule(self, path: Path) -> Optional[Rule]:
+        key = tuple(path)
+        try:
+            return self._rule_by_path[key]
+        except KeyError:
+            rule = _find_rule(self.rules_by_section.get(str(path[0]), []), path)
+            self._rule_by_path[key] = rule
+            return rule
+
+
+def _find_rule(section_rules: List[_CompiledRule], path: Path) -> Optional[Rule]:
+    """Find the heaviest rule for an element path, where the last defined rule wins a tie. Rule
+    paths don't include the section, but body rule paths always start at the root '$'.
+
+    >>> rules = [_CompiledRule(('$', '*'), 'star'), _CompiledRule(('$', 'a'), 'a')]
+    >>> _find_rule(rules, ['body', 'a']), _find_rule(rules, ['body', 'b'])
+    ('a', 'star')
+    >>> _find_rule(rules, ['body']) is None
+    True
+    """
+    if not section_rules:
+        return None
+    element_path = (['$'] if path[0] == 'body' else []) + path[1:]
+    weight, _, rule = max(
+        (_weigh_path(compiled_rule.path, element_path), index, compiled_rule.apply)
+        for index, compiled_rule in enumerate(section_rules)
+    )
+    return rule if weight else None
+
+
+def _weigh_path(rule_path: Tuple[PathElement, ...], element_path: Path) -> int:
+    """Weigh how specifically a rule path matches an element path: every matching element doubles
+    the weight and every '*' keeps it, while any other element means no match at all.
+
+    >>> _weigh_path(('$', 'a', '*'), ['$', 'a', 0]), _weigh_path(('$', 'b'), ['$', 'a'])
+    (4, 0)
+    """
+    if len(rule_path) > len(element_path):
+        return 0
+    weight = 1
+    for rule_element, element in zip(rule_path, element_path):
+        if rule_element == element:
+            weight *= 2
+        elif rule_element != '*':
+            return 0
+    return weight
+
+
+def _split_path(path: str) -> List[PathElement]:
+    """Split a matching rule's JSON path into keys and array indexes.
+
+    >>> _split_path("$.friends[0]['first name'][*]")
+    ['$', 'friends', 0, 'first name', '*']
+    """
+    elements: List[PathElement] = []
+    for element in re.split(r'[\.\[]', path):
+        if element == '*]':
+            elements.append('*')
+        elif element[0] in '\'"':
+            elements.append(element[1:-2])
+        elif element[-1] == ']':
+            elements.append(int(element[:-1]))
+        else:
+            elements.append(element)
+    return elements
+
+
+def _compile_rule(rule: Dict) -> Rule:
+    if 'matchers' in rule:
+        return _compile_matchers([_compile_rule(matcher) for matcher in rule['matchers']],
+                                 rule.get('combine', 'AND'))
+    if 'regex' in rule:
+        return _compile_regex(rule['regex'])
+
+    match = rule.get('match', 'type')
+    if match == 'type':
+        return _compile_type(rule.get('min'), rule.get('max'))
+    if match in _NUMERIC_TYPES_BY_MATCH:
+        return _compile_numeric(match, rule.get('min'), rule.get('max'))
+    if match == 'equality':
+        return _compile_equality(rule['value'])
+    if match == 'include':
+        return _compile_include(rule['value'])
+    if match == 'null':
+        return _match_null
+    return _match_anything
+
+
+def _compile_matchers(rules: List[Rule], combine: str) -> Rule:
+    def match_all(data: Any, spec: Any, path: Path) -> None:
+        for rule in rules:
+            try:
+                rule(data, spec, path)
+            except _RuleFailed:
+                if combine == 'AND':
+                    raise
+            else:
+                if combine == 'OR':
+                    return
+    return match_all
+
+
+def _compile_regex(regex: str) -> Rule:
+    pattern = re.compile(regex)
+
+    def match_regex(data: Any, spec: Any, path: Path) -> None:
+        if pattern.fullmatch(str(data)) is None:
+            raise _RuleFailed(path, f'value {data!r} does not match regex {regex}')
+    return match_regex
+
+
+def _compile_type(min_size: Optional[int], max_size: Optional[int]) -> Rule:
+    def match_type(data: Any, spec: Any, path: Path) -> None:
+        if type(spec) in (int, float):
+            if type(data) not in (int, float):
+                raise _RuleFailed(path, f'not correct type ({_nice_type(data)} is not '
+                                        f'{_nice_type(spec)})')
+        elif _fold_type(spec) != _fold_type(data):
+            raise _RuleFailed(path, f'not correct type ({_nice_type(data)} is not '
+                                    f'{_nice_type(spec)})')
+        _check_size(data, path, min_size, max_size)
+    return match_type
+
+
+_NUMERIC_TYPES_BY_MATCH: Dict[str, Tuple[type, ...]] = {
+    'integer': (int,),
+    'decimal': (float,),
+    'number': (int, float)
+}
+
+
+def _compile_numeric(match: str, min_size: Optional[int], max_size: Optional[int]) -> Rule:
+    types = _NUMERIC_TYPES_BY_MATCH[match]
+
+    def match_numeric(data: Any, spec: Any, path: Path) -> None:
+        if type(data) not in types:
+            raise _RuleFailed(path, f'not correct type ({_nice_type(data)} is not {match})')
+        _check_size(data, path, min_size, max_size)
+    return match_numeric
+
+
+def _compile_equality(value: Any) -> Rule:
+    def match_equality(data: Any, spec: Any, path: Path) -> None:
+        if data != value:
+            raise _RuleFailed(path, f'value {data!r} does not equal expected {value!r}')
+    return match_equality
+
+
+def _compile_include(value: Any) -> Rule:
+    def match_include(data: Any, spec: Any, path: Path) -> None:
+        if value not in data:
+            raise _RuleFailed(path, f'value {data!r} does not contain expected value {value!r}')
+    return match_include
+
+
+def _match_null(data: Any, spec: Any, path: Path) -> None:
+    if data is not None:
+        raise _RuleFailed(path, f'value {data!r} is not null')
+
+
+def _match_anything(data: Any, spec: Any, path: Path) -> None:
+    """Unknown match types are ignored, as pactman does."""
+
+
+def _check_size(data: Any, path: Path, min_size: Optional[int], max_size: Optional[int]) -> None:
+    if type(data) not in (dict, list, str):
+        return
+    if min_size is not None and len(data) < min_size:
+        raise _RuleFailed(path, f'size {len(data)!r} is smaller than minimum size {min_size}')
+    if max_size is not None and len(data) > max_size:
+        raise _RuleFailed(path, f'size {len(data)!r} is larger than maximum size {max_size}')
+
+
+def _compare_header(data: str, spec: str, path: Path, messages: List[str]) -> bool:
+    parsed_data = sorted(parse_header(data))
+    parsed_spec = sorted(parse_header(spec))
+    if parsed_data != parsed_spec:
+        # A Content-Type that only differs by an unexpected charset still matches.
+        data_has_charset = any(part.has_param('charset') for part in parsed_data)
+        spec_has_charset = any(part.has_param('charset') for part in parsed_spec)
+        if str(path[1]).lower() == 'content-type' and data_has_charset and not spec_has_charset:
+            return True
+        return _fail(messages, f'Response header {path[1]} value {data!r} does not match '
+                               f'expected {spec!r}')
+    return True
+
+
+def _compare(data: Any, spec: Any, path: Path, messages: List[str]) -> bool:
+    if _fold_type(spec) is list:
+        return _compare_list(data, spec, path, messages)
+    if _fold_type(spec) is dict:
+        return _compare_dict(data, spec, path, messages)
+    if not data == spec:
+        return _fail(messages, f'Element mismatch {data!r} != {spec!r}')
+    return True
+
+
+def _compare_list(data: Any, spec: List, path: Path, messages: List[str]) -> bool:
+    if _fold_type(data) is not list:
+        return _fail(messages, f'Response element is not an array (is {_nice_type(data)})')
+    if len(data) != len(spec):
+        return _fail(messages, f'Response array is incorrect length (is {len(data)} elements)')
+    for index, (data_element, spec_element) in enumerate(zip(data, spec)):
+        if not _compare(data_element, spec_element, path + [index], messages):
+            return _fail(messages, f'Response element {index} ({_nice_type(data_element)}) '
+                                   f'does not match spec ({_nice_type(spec_element)})')
+    return True
+
+
+def _compare_dict(data: Any, spec: Dict, path: Path, messages: List[str]) -> bool:
+    if _fold_type(data) is not dict:
+        return _fail(messages, f'Response element is not an object (is {_nice_type(data)})')
+    for key in spec:
+        if key not in data:
+            return _fail(messages, f'Expected element {key!r} not in response')
+        if not _compare(data[key], spec[key], path + [key], messages):
+            return _fail(messages, f'Response element {key} ({_nice_type(data[key])}) '
+                                   f'does not match spec ({_nice_type(spec[key])})')
+    return True
+
+
+def _fail(messages: List[str], message: str) -> bool:
+    messages.append(message)
+    return False
+
+
+def _fold_type(obj: Any) -> type:
+    if type(obj) is OrderedDict:
+        return dict
+    return type(obj)
+
+
+def _nice_type(obj: Any) -> str:
+    """The JSON name of a value's type.
+
+    >>> _nice_type(1.5), _nice_type(None), _nice_type({})
+    ('number', 'null', 'object')
+    """
+    folded_type = _fold_type(obj)
+    return {
+        str: 'string',
+        int: 'number',
+        float: 'number',
+        type(None): 'null',
+        list: 'array',
+        dict: 'object',
+    }.get(folded_type, str(folded_type))
+
+
+def _format_path(path: Path) -> str:
+    """
+    >>> _format_path(['body', 'friends', 0])
+    'body.friends[0]'
+    """
+    formatted = str(path[0])
+    for element in path[1:]:
+        if isinstance(element, int):
+            formatted += f'[{element}]'
+        else:
+            formatted += '.' + element
+    return formatted
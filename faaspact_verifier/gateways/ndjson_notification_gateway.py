@@ -0,0 +1,99 @@
+import json
+from typing import Dict, List, Optional, TextIO
+
+from faaspact_verifier.abc import NotificationGateway as NotificationGatewayABC
+from faaspact_verifier.definitions import Error, Pact, VerificationResult
+from faaspact_verifier.exceptions import PactBrokerError
+from faaspact_verifier.types import EmulatorResult
+
+
+class NdjsonNotificationGateway(NotificationGatewayABC):
+    """Writes newline-delimited JSON to a file: one 'interaction' record per verified interaction,
+    a 'publish_failure' record per pact whose results failed to publish and a closing 'summary'
+    record. The file is created once there is something to report. Records are written as they
+    are announced and flushed after each pact, so the file can be followed while the job runs. It
+    is closed by the summary, or by `close` if the job raised, which leaves out the summary. A job
+    summarized again, as in watch mode, writes a new file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file: Optional[TextIO] = None
+
+    def announce_job_results(self,
+                             pacts: List[Pact],
+                             emulator_results_list: List[List[EmulatorResult]],
+                             verification_results_list: List[List[VerificationResult]],
+                             results_published: bool,
+                             succeeded: bool) -> None:
+        for pact, emulator_results, verification_results in zip(pacts,
+                                                                emulator_results_list,
+                                                                verification_results_list):
+            for index, verification_result in enumerate(verification_results):
+                self.announce_interaction_result(
+                    pact,
+                    index,
+                    emulator_results[index] if emulator_results else None,
+                    verification_result
+                )
+            self.announce_pact_results(pact, emulator_results, verification_results)
+        self.announce_job_summary(results_published, succeeded)
+
+    def announce_interaction_result(self,
+                                    pact: Pact,
+                                    interaction_index: int,
+                                    emulator_result: Optional[EmulatorResult],
+                                    verification_result: VerificationResult) -> None:
+        self._write({
+            'type': 'interaction',
+            **_describe_pact(pact),
+            'interaction_index': pact.interaction_index(interaction_index),
+            'description': pact.interactions[interaction_index].description,
+            'verified': verification_result.verified,
+            'reason': verification_result.reason,
+            'duration': emulator_result.duration if emulator_result else None,
+            'traceback': (emulator_result.traceback
+                          if isinstance(emulator_result, Error) else None)
+        })
+
+    def announce_pact_results(self,
+                              pact: Pact,
+                              emulator_results: List[EmulatorResult],
+                              verification_results: List[VerificationResult]) -> None:
+        self._flush()
+
+    def announce_publish_failure(self, pact: Pact, error: PactBrokerError) -> None:
+        self._write({'type': 'publish_failure', **_describe_pact(pact), 'reason': str(error)})
+        self._flush()
+
+    def announce_job_summary(self, results_published: bool, succeeded: bool) -> None:
+        self._write({
+            'type': 'summary',
+            'results_published': results_published,
+            'succeeded': succeeded
+        })
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def _write(self, record: Dict) -> None:
+        if self._file is None:
+            self._file = open(self.path, 'w')
+        self._file.write(json.dumps(record) + '\n')
+
+
+def _describe_pact(pact: Pact) -> Dict:
+    return {
+        'consumer': pact.consumer_name,
+        'provider': pact.provider_name,
+        'consumer_version': pact.consumer_version,
+        'pact_version': pact.pact_version,
+        'tags': sorted(pact.tags)
+    }
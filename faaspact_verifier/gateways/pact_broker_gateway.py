@@ -1,25 +1,109 @@
+import contextlib
+import functools
 import re
-from typing import Dict, List, Optional, cast
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast
+)
+from urllib.parse import unquote
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from faaspact_verifier import abc
-from faaspact_verifier.definitions import Pact, VerificationResult
+from faaspact_verifier import abc, profiler
+from faaspact_verifier.definitions import Interaction, Pact, VerificationResult
 from faaspact_verifier.exceptions import PactBrokerError
+from faaspact_verifier.gateways import pact_stream
+from faaspact_verifier.gateways.pact_cache import PactCache
+
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+UNSUPPORTED_STATUS_CODES = frozenset({404, 405})
 
 
 class PactBrokerGateway(abc.PactBrokerGateway):
     """Gateway to a pact broker."""
 
-    def __init__(self, host: str, username: str, password: str) -> None:
+    def __init__(self,
+                 host: str,
+                 username: str,
+                 password: str,
+                 max_workers: int = 1,
+                 timeout: Optional[float] = None,
+                 pact_cache: Optional[PactCache] = None,
+                 publish_retries: int = 3,
+                 retry_backoff: float = 0.5,
+                 pacts_for_verification: bool = False) -> None:
+        """Pacts are fetched, and verification results published, with up to `max_workers`
+        concurrent requests over a shared keep-alive session. `timeout` (in seconds) applies to
+        every request made to the broker. If a `pact_cache` is given, pacts are revalidated with
+        conditional requests and only downloaded again when they have changed on the broker.
+
+        Publishing verification results is retried up to `publish_retries` times on connection
+        errors, timeouts and 429/5xx responses, waiting `retry_backoff` seconds before the first
+        retry and twice as long before each one after that.
+
+        With `pacts_for_verification`, pacts are selected with a single request to the broker's
+        pacts for verification API, with a consumer version selector per tag, rather than a
+        request to the latest pact index of each tag. Brokers that don't support the API are
+        queried through their latest pact indexes.
+        """
+        if max_workers < 1:
+            raise ValueError(f'max_workers must be at least 1, got {max_workers}.')
+        if publish_retries < 0:
+            raise ValueError(f'publish_retries must not be negative, got {publish_retries}.')
+
         self.host = host
         self.username = username
         self.password = password
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.pact_cache = pact_cache
+        self.publish_retries = publish_retries
+        self.retry_backoff = retry_backoff
+        self.pacts_for_verification = pacts_for_verification
+        self.session = _create_session(username, password, pool_size=max_workers)
+
+    def fetch_provider_pacts(self,
+                             provider: str,
+                             consumers: FrozenSet[str] = frozenset(),
+                             tags: FrozenSet[str] = frozenset()) -> List[Pact]:
+        """Fetch the latest pact of each consumer and the latest master pact of each consumer, or
+        the latest pact of each consumer for each of `tags` if any are given. A pact that appears
+        more than once is only downloaded once, and pacts that share a pact version are merged
+        into one pact with the tags of both.
+
+        Pacts are selected by `consumers` from the broker's index, before they are downloaded.
+        """
+        pacts = self._map(self._fetch_pact,
+                          self._fetch_provider_pact_hrefs(provider, consumers, tags))
+        return _merge_tagged_pacts(pacts)
 
-    def fetch_provider_pacts(self, provider: str) -> List[Pact]:
-        all_pacts = self._fetch_latest_provider_pacts(provider)
-        master_pacts = self._fetch_latest_provider_pacts(provider, tag='master')
-        return all_pacts + master_pacts
+    def iter_provider_pacts(self,
+                            provider: str,
+                            consumers: FrozenSet[str] = frozenset(),
+                            tags: FrozenSet[str] = frozenset()) -> Iterator[Pact]:
+        """Yield the pacts of fetch_provider_pacts as they are downloaded. Up to max_workers
+        pacts are downloaded ahead of the one being consumed. Pacts are not merged on pact
+        version, since a later pact may share the version of one that was already yielded.
+        """
+        return self._imap(self._fetch_pact,
+                          self._fetch_provider_pact_hrefs(provider, consumers, tags))
 
     def provide_verification_results(self,
                                      provider_version: str,
@@ -32,75 +116,251 @@ class PactBrokerGateway(abc.PactBrokerGateway):
             'success': success,
             'providerApplicationVersion': provider_version
         }
-        r = requests.post(url, json=data, auth=(self.username, self.password))
+        with profiler.span('publish', 'broker', consumer=pact.consumer_name):
+            r = self._post_with_retries(url, data)
 
         if not r.status_code == requests.codes.created:
             raise PactBrokerError(f'{r.status_code}: {r.text}')
 
-    def _fetch_latest_provider_pacts(self, provider: str, tag: Optional[str] = None) -> List[Pact]:
+    def provide_pacts_verification_results(
+            self,
+            provider_version: str,
+            pacts: List[Pact],
+            verification_results_list: List[List[VerificationResult]]
+    ) -> List[Optional[PactBrokerError]]:
+        """Publish the verification results of several pacts with up to max_workers concurrent
+        requests, returning the error that publishing each pact failed with, or None.
+        """
+        def provide(
+                pact_with_verification_results: Tuple[Pact, List[VerificationResult]]
+        ) -> Optional[PactBrokerError]:
+            try:
+                self.provide_verification_results(provider_version, *pact_with_verification_results)
+            except PactBrokerError as e:
+                return e
+            return None
+
+        return self._map(provide, list(zip(pacts, verification_results_list)))
+
+    def _post_with_retries(self, url: str, data: Dict) -> requests.Response:
+        for attempt in range(self.publish_retries + 1):
+            if attempt:
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            try:
+                r = self.session.post(url, json=data, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.publish_retries:
+                    raise PactBrokerError(f'Failed to reach the pact broker: {e}') from e
+                continue
+            except requests.RequestException as e:
+                raise PactBrokerError(f'Failed to reach the pact broker: {e}') from e
+            if r.status_code not in RETRY_STATUS_CODES:
+                break
+        return r
+
+    def _fetch_provider_pact_hrefs(self,
+                                   provider: str,
+                                   consumers: FrozenSet[str],
+                                   tags: FrozenSet[str]) -> List[str]:
+        selected_tags: List[Optional[str]] = list(sorted(tags)) if tags else [None, 'master']
+        pact_links = None
+        if self.pacts_for_verification:
+            pact_links = self._fetch_pacts_for_verification_links(provider, selected_tags)
+            self.pacts_for_verification = pact_links is not None
+        if pact_links is None:
+            pact_links = [pact_link
+                          for tag in selected_tags
+                          for pact_link in self._fetch_latest_pact_links(provider, tag)]
+
+        return _unique(
+            _pluck_href(pact_link)
+            for pact_link in pact_links
+            if not consumers or _pluck_consumer_name(pact_link) in consumers
+        )
+
+    def _fetch_pacts_for_verification_links(
+            self,
+            provider: str,
+            selected_tags: List[Optional[str]]
+    ) -> Optional[List[Dict]]:
+        """Select pacts with a single pacts for verification request holding a consumer version
+        selector per tag, or return None if the broker doesn't support the API. Only the links'
+        hrefs are kept, since their names describe the pact rather than name its consumer.
+
+        The response doesn't say which selectors chose each pact, nor the other tags of its
+        consumer version, so pacts still take their tags from their consumer versions.
+        """
+        url = f'{self.host}/pacts/provider/{provider}/for-verification'
+        selectors: List[Dict] = [{'tag': tag, 'latest': True} if tag else {'latest': True}
+                                 for tag in selected_tags]
+        with profiler.span('fetch pacts for verification', 'broker', url=url):
+            r = self.session.post(url,
+                                  json={'consumerVersionSelectors': selectors},
+                                  timeout=self.timeout)
+        if r.status_code in UNSUPPORTED_STATUS_CODES:
+            return None
+        if not r.ok:
+            raise PactBrokerError(f'{r.status_code}: {r.text}')
+        return [{'href': pact_for_verification['_links']['self']['href']}
+                for pact_for_verification in r.json()['_embedded']['pacts']]
+
+    def _fetch_latest_pact_links(self, provider: str, tag: Optional[str] = None) -> List[Dict]:
         url = f'{self.host}/pacts/provider/{provider}/latest' + (f'/{tag}' if tag else '')
-        r = requests.get(url, auth=(self.username, self.password))
-        pact_hrefs = [pact['href'] for pact in r.json()['_links']['pb:pacts']]
-        return [self._fetch_pact_by_href(pact_href) for pact_href in pact_hrefs]
+        with profiler.span('fetch pact hrefs', 'broker', url=url):
+            r = self.session.get(url, timeout=self.timeout)
+        return cast(List[Dict], r.json()['_links']['pb:pacts'])
+
+    def _fetch_pact(self, href: str) -> Pact:
+        """Fetch a pact, and its consumer version for its tags and number."""
+        with profiler.span('fetch pact', 'broker', href=href):
+            pact_fields, interactions = self._fetch_streamed_pact(href)
+
+            consumer_version_href = pact_fields['_links']['pb:consumer-version']['href']
+            r = self.session.get(consumer_version_href, timeout=self.timeout)
+            raw_consumer_version = r.json()
+        return _pluck_pact(pact_fields, interactions, raw_consumer_version)
+
+    def _fetch_streamed_pact(self, href: str) -> Tuple[Dict, Tuple[Interaction, ...]]:
+        """Fetch a pact's fields and interactions, decoding its body as it is downloaded, or read
+        from the pact cache, so that the raw pact is never held whole."""
+        with contextlib.ExitStack() as stack:
+            cached_pact = self.pact_cache.open(href) if self.pact_cache else None
+            if cached_pact:
+                stack.enter_context(cached_pact.body)
+            headers = {'If-None-Match': cached_pact.etag} if cached_pact else {}
+            r = stack.enter_context(
+                self.session.get(href, headers=headers, timeout=self.timeout, stream=True)
+            )
+            if cached_pact and r.status_code == requests.codes.not_modified:
+                pact_fields, interactions = pact_stream.load_pact(
+                    iter(functools.partial(cached_pact.body.read, pact_stream.CHUNK_SIZE), b'')
+                )
+                return {**pact_fields, '_links': cached_pact.links}, interactions
+
+            chunks = r.iter_content(pact_stream.CHUNK_SIZE)
+            etag = r.headers.get('ETag')
+            if not (self.pact_cache and etag):
+                return pact_stream.load_pact(chunks)
 
-    def _fetch_pact_by_href(self, href: str) -> Pact:
-        r = requests.get(href, auth=(self.username, self.password))
-        raw_pact = r.json()
+            with self.pact_cache.writing(href, etag) as writer:
+                pact_fields, interactions = pact_stream.load_pact(writer.tee(chunks))
+                writer.commit(_pluck_pact_version(pact_fields), pact_fields['_links'])
+            return pact_fields, interactions
 
-        consumer_version_href = raw_pact['_links']['pb:consumer-version']['href']
-        r = requests.get(consumer_version_href, auth=(self.username, self.password))
-        raw_consumer_version = r.json()
-        return _pluck_pact(raw_pact, raw_consumer_version)
+    def _map(self, func: Callable[[T], U], items: Iterable[T]) -> List[U]:
+        """Map func over items with up to max_workers threads, keeping the order of items."""
+        if self.max_workers == 1:
+            return [func(item) for item in items]
 
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(func, items))
 
-def _pluck_pact(raw_pact: Dict, raw_consumer_version: Dict) -> Pact:
+    def _imap(self, func: Callable[[T], U], items: Iterable[T]) -> Iterator[U]:
+        """Lazily map func over items on a background pool of max_workers threads, keeping the
+        order of items and at most max_workers results waiting to be consumed.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures: Deque[Future] = deque()
+            for item in items:
+                futures.append(executor.submit(func, item))
+                if len(futures) > self.max_workers:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+
+
+def _create_session(username: str, password: str, pool_size: int) -> requests.Session:
+    session = requests.Session()
+    session.auth = (username, password)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _pluck_href(pact_link: Dict) -> str:
+    return cast(str, pact_link['href'])
+
+
+def _pluck_consumer_name(pact_link: Dict) -> str:
+    """The consumer of a pact in the broker's index, read from the link's name or else from its
+    href.
+
+    >>> _pluck_consumer_name({'href': '/pacts/provider/p/consumer/my%20app/version/2'})
+    'my app'
+    >>> _pluck_consumer_name({'href': '/x', 'name': 'app'})
+    'app'
+    """
+    if 'name' in pact_link:
+        return cast(str, pact_link['name'])
+
+    return _pluck_consumer_name_from_href(pact_link['href'])
+
+
+def _pluck_consumer_name_from_href(href: str) -> str:
+    match = re.search(r'/consumer/(?P<consumer>[^/]+)/', href)
+    if not match:
+        raise RuntimeError(f'Failed to pluck consumer name from pact href {href}')
+
+    return unquote(match.group('consumer'))
+
+
+def _pluck_pact(pact_fields: Dict,
+                interactions: Tuple[Interaction, ...],
+                raw_consumer_version: Dict) -> Pact:
     tags = [tag['name'] for tag in raw_consumer_version['_embedded']['tags']]
     consumer_version = raw_consumer_version['number']
-    pact_json = {field: value for field, value in raw_pact.items()
+    pact_json = {field: value for field, value in pact_fields.items()
                  if field not in ('createdAt', '_links')}
-    return Pact(
+    return Pact.with_interactions(
+        interactions,
         consumer_version=consumer_version,
-        pact_version=_pluck_pact_version(raw_pact),
+        pact_version=_pluck_pact_version(pact_fields),
         tags=frozenset(tags),
         pact_json=pact_json
     )
 
 
-def _pluck_pact_version(raw_pact: Dict) -> str:
-    publish_href = raw_pact['_links']['pb:publish-verification-results']['href']
+def _pluck_pact_version(pact_fields: Dict) -> str:
+    publish_href = pact_fields['_links']['pb:publish-verification-results']['href']
     match = re.search(r'/pact-version/(?P<provider_version>\w+)/verification-results', publish_href)
     if not match:
-        raise RuntimeError(f'Failed to pluck pact version from pact {raw_pact}')
+        raise RuntimeError(f'Failed to pluck pact version from pact links {pact_fields["_links"]}')
 
     return cast(str, match.group('provider_version'))
 
 
-# i didn't realize that 'pact versions' existed while making this. maybe pacts can be merged
-# on pact version, where multiple tags _and_ multiple consumer versions can be part of one pact.
-#
-# def _merge_tagged_pacts(pacts: List[Pact]) -> List[Pact]:
-#     """
-#     >>> a = Pact(consumer_version='x', pact_json={}, tags=frozenset(['feature-a']))
-#     >>> b = Pact(consumer_version='y', pact_json={}, tags=frozenset(['feature-b']))
-#     >>> c = Pact(consumer_version='x', pact_json={}, tags=frozenset(['master']))
-#     >>> _merge_tagged_pacts([a, b, c]) == (
-#     ... [Pact(consumer_version='y', pact_json={}, tags=frozenset({'feature-b'})),
-#     ... Pact(consumer_version='x', pact_json={}, tags=frozenset({'feature-a', 'master'}))])
-#     True
-#     """
-#     pact_by_version: Dict[str, Pact] = {}
-
-#     for pact in pacts:
-#         if pact.consumer_version not in pact_by_version:
-#             pact_by_version[pact.consumer_version] = pact
-
-#         else:
-#             existing_pact = pact_by_version.pop(pact.consumer_version)
-#             merged_pact = Pact(
-#                 consumer_version=pact.consumer_version,
-#                 tags=pact.tags | existing_pact.tags,
-#                 pact_json=pact.pact_json
-#             )
-#             pact_by_version[pact.consumer_version] = merged_pact
-
-#     return list(pact_by_version.values())
+def _merge_tagged_pacts(pacts: List[Pact]) -> List[Pact]:
+    """Merge pacts that share a pact version into a single pact with the union of their tags. The
+    first pact seen for a pact version keeps its position and consumer version.
+
+    >>> a = Pact(consumer_version='x', pact_json={}, pact_version='1', tags=frozenset(['feat-a']))
+    >>> b = Pact(consumer_version='y', pact_json={}, pact_version='2', tags=frozenset(['feat-b']))
+    >>> c = Pact(consumer_version='z', pact_json={}, pact_version='1', tags=frozenset(['master']))
+    >>> _merge_tagged_pacts([a, b, c]) == (
+    ... [Pact(consumer_version='x', pact_json={}, pact_version='1',
+    ...       tags=frozenset({'feat-a', 'master'})),
+    ...  Pact(consumer_version='y', pact_json={}, pact_version='2', tags=frozenset({'feat-b'}))])
+    True
+    """
+    pact_by_version: Dict[str, Pact] = {}
+
+    for pact in pacts:
+        existing_pact = pact_by_version.get(pact.pact_version)
+        if existing_pact is None:
+            pact_by_version[pact.pact_version] = pact
+        else:
+            pact_by_version[pact.pact_version] = existing_pact._replace(
+                tags=existing_pact.tags | pact.tags
+            )
+
+    return list(pact_by_version.values())
+
+
+def _unique(items: Iterable[T]) -> List[T]:
+    """Drop repeated items, keeping the first occurrence of each.
+
+    >>> _unique(['b', 'a', 'b', 'c', 'a'])
+    ['b', 'a', 'c']
+    """
+    return list(dict.fromkeys(items))
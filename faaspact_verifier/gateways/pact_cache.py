@@ -0,0 +1,162 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class CachedPactBody(NamedTuple):
+    etag: str
+    pact_version: str
+    links: Dict
+    body: BinaryIO
+
+
+class PactCache:
+    """On-disk cache of pacts. Pact bodies are stored by pact version, which is immutable on the
+    broker, and each pact href remembers the ETag and pact version it last resolved to so that it
+    can be revalidated with a conditional request.
+
+    Once the stored pact bodies outgrow `max_bytes`, the least recently used ones are evicted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._pacts_directory = os.path.join(directory, 'pacts')
+        self._hrefs_directory = os.path.join(directory, 'hrefs')
+        os.makedirs(self._pacts_directory, exist_ok=True)
+        os.makedirs(self._hrefs_directory, exist_ok=True)
+
+    def open(self, href: str) -> Optional[CachedPactBody]:
+        """Open the pact body that href last resolved to, if it is still cached, for the caller to
+        read and close. The body may hold stale links, which are superseded by `links`."""
+        href_record = _read_json(self._href_path(href))
+        if href_record is None:
+            return None
+
+        pact_path = self._pact_path(href_record['pact_version'])
+        try:
+            body = open(pact_path, 'rb')
+        except OSError:
+            return None
+
+        _touch(pact_path)
+        return CachedPactBody(
+            etag=href_record['etag'],
+            pact_version=href_record['pact_version'],
+            links=href_record['links'],
+            body=body
+        )
+
+    @contextlib.contextmanager
+    def writing(self, href: str, etag: str) -> Iterator['PactBodyWriter']:
+        """Cache a pact body as it is read, through the writer's `tee`. The body is only cached
+        if the writer is committed, once the pact's version and links are known."""
+        fd, temp_path = tempfile.mkstemp(dir=self._pacts_directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                writer = PactBodyWriter(f)
+                yield writer
+            if writer.committed is not None:
+                pact_version, links = writer.committed
+                os.replace(temp_path, self._pact_path(pact_version))
+                _write_json(self._href_path(href), {
+                    'etag': etag,
+                    'pact_version': pact_version,
+                    'links': links
+                })
+                self._evict()
+        finally:
+            _remove(temp_path)
+
+    def _evict(self) -> None:
+        """Remove the least recently used pact bodies until the cache fits in max_bytes."""
+        entries = sorted(_stat_entries(self._pacts_directory))
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            _remove(path)
+            total_bytes -= size
+
+    def _pact_path(self, pact_version: str) -> str:
+        return os.path.join(self._pacts_directory, f'{pact_version}.json')
+
+    def _href_path(self, href: str) -> str:
+        digest = hashlib.sha1(href.encode()).hexdigest()
+        return os.path.join(self._hrefs_directory, f'{digest}.json')
+
+
+class PactBodyWriter:
+
+    def __init__(self, f: BinaryIO) -> None:
+        self._file = f
+        self.committed: Optional[Tuple[str, Dict]] = None
+
+    def tee(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Write each chunk to the cache as it passes through."""
+        for chunk in chunks:
+            self._file.write(chunk)
+            yield chunk
+
+    def commit(self, pact_version: str, links: Dict) -> None:
+        self.committed = (pact_version, links)
+
+
+def default_cache_directory() -> str:
+    """The faaspact directory under $XDG_CACHE_HOME, which defaults to ~/.cache."""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join('~', '.cache')
+    return os.path.join(os.path.expanduser(cache_home), 'faaspact')
+
+
+def _read_json(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as f:
+            return dict(json.load(f))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: str, data: Dict) -> None:
+    """Write data atomically, so that concurrent readers never see a partial file."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+    except BaseException:
+        _remove(temp_path)
+        raise
+
+
+def _stat_entries(directory: str) -> List[Tuple[float, int, str]]:
+    """List (last used time, size, path) of every json file in directory."""
+    entries: List[Tuple[float, int, str]] = []
+    for entry in os.scandir(directory):
+        if not entry.name.endswith('.json'):
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+
+def _touch(path: str) -> None:
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,140 @@
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from faaspact_verifier.definitions import Interaction, pluck_interaction
+
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+def load_pact(chunks: Iterable[bytes]) -> Tuple[Dict, Tuple[Interaction, ...]]:
+    """Incrementally decode a pact from chunks of its utf-8 JSON body. Returns the pact's fields
+    other than its interactions, and its interactions, each plucked as soon as it is decoded. The
+    body is never held whole, nor is the raw list of interactions.
+
+    >>> body = b'{"consumer": {"name": "a"}, "interactions": [{"request": {"path": "/", ' \\
+    ...        b'"method": "GET"}, "response": {"status": 200}}], "metadata": {}}'
+    >>> fields, interactions = load_pact(body[i:i + 7] for i in range(0, len(body), 7))
+    >>> fields
+    {'consumer': {'name': 'a'}, 'metadata': {}}
+    >>> [interaction.request.path for interaction in interactions]
+    ['/']
+    """
+    reader = _JsonReader(chunks)
+    fields: Dict = {}
+    interactions: Tuple[Interaction, ...] = ()
+    for field in reader.iter_object_keys():
+        if field == 'interactions':
+            interactions = tuple([pluck_interaction(raw_interaction)
+                                  for raw_interaction in reader.iter_array()])
+        else:
+            fields[field] = reader.decode_value()
+    reader.expect_end()
+    return fields, interactions
+
+
+class _JsonReader:
+    """Decodes JSON a value at a time from a stream of utf-8 chunks, keeping only the text that
+    hasn't been decoded yet in memory. Values are decoded with the standard library's decoder
+    once enough of the stream is buffered to hold them.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._position = 0
+        self._exhausted = False
+
+    def iter_object_keys(self) -> Iterator[str]:
+        """Enter an object and yield its keys. The caller decodes each key's value before asking
+        for the next key."""
+        self._expect('{')
+        if self._peek() == '}':
+            self._position += 1
+            return
+        while True:
+            key = self.decode_value()
+            if not isinstance(key, str):
+                raise self._error('Expecting property name enclosed in double quotes')
+            self._expect(':')
+            yield key
+            if self._expect(',', '}') == '}':
+                return
+
+    def iter_array(self) -> Iterator[Any]:
+        """Enter an array and decode its elements one at a time."""
+        self._expect('[')
+        if self._peek() == ']':
+            self._position += 1
+            return
+        while True:
+            yield self.decode_value()
+            if self._expect(',', ']') == ']':
+                return
+
+    def decode_value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._read_more():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk.
+            if end < len(self._buffer) or not self._read_more():
+                self._position = end
+                return value
+
+    def expect_end(self) -> None:
+        if self._peek():
+            raise self._error('Extra data')
+
+    def _expect(self, *characters: str) -> str:
+        character = self._peek()
+        if not character or character not in characters:
+            raise self._error(f'Expecting {" or ".join(map(repr, characters))}')
+        self._position += 1
+        return character
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at the end of the stream."""
+        while True:
+            buffer = self._buffer
+            while self._position < len(buffer) and buffer[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer) or not self._read_more():
+                return self._buffer[self._position:self._position + 1]
+
+    def _read_more(self) -> bool:
+        """Drop the decoded text from the buffer and read at least as much text again as is left
+        undecoded, so that a value spanning many chunks is retried a logarithmic number of times.
+        Returns False once the stream is exhausted.
+        """
+        if self._exhausted:
+            return False
+
+        pending: List[str] = [self._buffer[self._position:]]
+        wanted = max(len(pending[0]), 1)
+        read = 0
+        while read < wanted:
+            try:
+                text = self._text_decoder.decode(next(self._chunks))
+            except StopIteration:
+                pending.append(self._text_decoder.decode(b'', final=True))
+                self._exhausted = True
+                break
+            pending.append(text)
+            read += len(text)
+
+        self._buffer = ''.join(pending)
+        self._position = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._position)
@@ -0,0 +1,78 @@
+import os
+import xml.etree.ElementTree as ElementTree
+from typing import List
+
+from faaspact_verifier.definitions import Error, Pact, Response, VerificationResult
+from faaspact_verifier.gateways.junit_notification_gateway import JUnitNotificationGateway
+from faaspact_verifier.types import EmulatorResult
+
+
+class TestJUnitNotificationGateway:
+
+    def test_writes_a_testsuite_per_pact_as_it_is_announced(self, tmp_path: str) -> None:
+        # Given
+        path = f'{tmp_path}/report.xml'
+        gateway = JUnitNotificationGateway(path)
+        timed_response = Response({}, 200)
+        timed_response.__dict__['duration'] = 0.25
+        emulator_results: List[EmulatorResult] = [
+            timed_response,
+            Response({}, 500),
+            Error('Provider raised an exception', 'Traceback: <boom>')
+        ]
+        verification_results = [
+            VerificationResult(True),
+            VerificationResult(False, 'status "500" is not 200'),
+            VerificationResult(False, 'Provider raised an exception')
+        ]
+
+        # When
+        gateway.announce_pact_results(_make_pact(), emulator_results, verification_results)
+        with open(path) as f:
+            partial_report = f.read()
+        gateway.announce_job_summary(results_published=False, succeeded=False)
+
+        # Then
+        assert '<testsuite ' in partial_report
+        testsuite, = ElementTree.parse(path).getroot()
+        assert testsuite.attrib['name'] == 'gabe -> provider'
+        assert (testsuite.attrib['tests'], testsuite.attrib['failures']) == ('3', '2')
+        passed, failed, errored = testsuite.findall('testcase')
+        assert passed.attrib['name'] == '0: a request for a user'
+        assert passed.attrib['time'] == '0.250000'
+        assert passed.find('failure') is None
+        assert failed.findall('failure')[0].attrib['message'] == 'status "500" is not 200'
+        assert errored.findall('failure')[0].text == 'Traceback: <boom>'
+
+    def test_closes_the_report_of_a_job_that_raised(self, tmp_path: str) -> None:
+        # Given
+        path = f'{tmp_path}/report.xml'
+        gateway = JUnitNotificationGateway(path)
+        created_early = os.path.exists(path)
+
+        # When
+        gateway.announce_pact_results(_make_pact(), [], [VerificationResult(True)] * 3)
+        gateway.close()
+        gateway.close()
+
+        # Then
+        assert not created_early
+        testsuite, = ElementTree.parse(path).getroot()
+        assert testsuite.attrib['tests'] == '3'
+
+
+def _make_pact() -> Pact:
+    return Pact(
+        consumer_version='1',
+        pact_json={
+            'consumer': {'name': 'gabe'},
+            'provider': {'name': 'provider'},
+            'interactions': [
+                {'description': 'a request for a user',
+                 'request': {'path': '/', 'method': 'GET'},
+                 'response': {'status': 200}}
+            ] * 3
+        },
+        pact_version='abc',
+        tags=frozenset({'master'})
+    )
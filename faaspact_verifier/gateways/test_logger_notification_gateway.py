@@ -0,0 +1,70 @@
+from typing import Any, List
+
+from faaspact_verifier.definitions import Pact, Response, VerificationResult
+from faaspact_verifier.gateways.logger_notification_gateway import LoggerNotificationGateway
+from faaspact_verifier.types import EmulatorResult
+
+
+class TestLoggerNotificationGateway:
+
+    def test_prints_each_pact_as_it_is_announced(self, capsys: Any) -> None:
+        # Given
+        gateway = LoggerNotificationGateway()
+        passing_pact = _make_pact('gabe')
+        failing_pact = _make_pact('yuval')
+
+        # When
+        gateway.announce_pact_results(passing_pact,
+                                      [Response({}, 200)],
+                                      [VerificationResult(True)])
+        first_output = capsys.readouterr().out
+        gateway.announce_pact_results(failing_pact,
+                                      [Response({}, 500)],
+                                      [VerificationResult(False, 'status mismatch')])
+        second_output = capsys.readouterr().out
+        gateway.announce_job_summary(results_published=True, succeeded=False)
+        summary_output = capsys.readouterr().out
+
+        # Then
+        assert 'consumer "gabe"' in first_output
+        assert 'Failed interaction' not in first_output
+        assert 'consumer "yuval"' in second_output
+        assert 'Failed interaction 0 with message: "status mismatch"' in second_output
+        assert 'published' in summary_output
+
+    def test_announces_job_results_like_pacts_announced_one_by_one(self, capsys: Any) -> None:
+        # Given
+        gateway = LoggerNotificationGateway()
+        pacts = [_make_pact('gabe'), _make_pact('yuval')]
+        emulator_results_list: List[List[EmulatorResult]] = [[Response({}, 200)],
+                                                             [Response({}, 500)]]
+        verification_results_list = [[VerificationResult(True)],
+                                     [VerificationResult(False, 'status mismatch')]]
+
+        # When
+        for group in zip(pacts, emulator_results_list, verification_results_list):
+            gateway.announce_pact_results(*group)
+        gateway.announce_job_summary(results_published=False, succeeded=False)
+        incremental_output = capsys.readouterr().out
+        gateway.announce_job_results(pacts,
+                                     emulator_results_list,
+                                     verification_results_list,
+                                     results_published=False,
+                                     succeeded=False)
+        batch_output = capsys.readouterr().out
+
+        # Then
+        assert batch_output == incremental_output
+
+
+def _make_pact(consumer: str) -> Pact:
+    return Pact(
+        consumer_version='1',
+        pact_json={
+            'consumer': {'name': consumer},
+            'provider': {'name': 'provider'},
+            'interactions': [{'request': {'path': '/', 'method': 'GET'},
+                              'response': {'status': 200}}]
+        },
+        pact_version=consumer
+    )
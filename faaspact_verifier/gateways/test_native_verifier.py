@@ -0,0 +1,174 @@
+from typing import Dict, List, Optional
+
+import pytest
+
+from faaspact_verifier.definitions import Error, Pact, Response
+from faaspact_verifier.gateways.native_verifier import NativeVerifier
+from faaspact_verifier.gateways.pactman_verifier import PactmanVerifier
+from faaspact_verifier.types import EmulatorResult
+
+
+FRIENDS_RULES = {
+    'body': {
+        '$.friends': {'matchers': [{'min': 1, 'match': 'type'}]},
+        '$.friends[*].name': {'matchers': [{'regex': r'[a-z]+'}]},
+        '$.score': {'matchers': [{'match': 'integer'}, {'match': 'decimal'}], 'combine': 'OR'},
+        '$.joined': {'matchers': [{'regex': r'\d\d\d\d-\d\d-\d\d'}]},
+        '$.nickname': {'matchers': [{'match': 'null'}]},
+        '$.bio': {'matchers': [{'match': 'include', 'value': 'zach'}]},
+        '$.tags': {'matchers': [{'match': 'type', 'max': 2}]},
+        '$.*': {'matchers': [{'match': 'type'}]}
+    },
+    'header': {
+        'Content-Type': {'matchers': [{'regex': r'application/(json|xml)'}]}
+    }
+}
+FRIENDS_BODY = {
+    'friends': [{'name': 'gabe'}, {'name': 'yuval'}],
+    'score': 123,
+    'joined': '2012-12-05',
+    'nickname': None,
+    'bio': 'hi im zach',
+    'tags': ['a'],
+    'extra': {'nested': [1, 2]}
+}
+
+PARITY_CASES = [
+    pytest.param(None, Response({}, 200, FRIENDS_BODY), id='exact match without rules'),
+    pytest.param(None, Response({}, 200, {**FRIENDS_BODY, 'new': 1}), id='extra keys ok'),
+    pytest.param(None, Response({}, 201, FRIENDS_BODY), id='status mismatch'),
+    pytest.param(None, Response({}, 200, {**FRIENDS_BODY, 'score': 124}), id='value mismatch'),
+    pytest.param(None, Response({}, 200, {**FRIENDS_BODY, 'friends': []}), id='list length'),
+    pytest.param(None, Response({}, 200, {'score': 123}), id='missing key'),
+    pytest.param(None, Response({}, 200, None), id='missing body'),
+    pytest.param(None,
+                 Response({'content-type': 'application/json; charset=utf-8'}, 200, FRIENDS_BODY),
+                 id='charset ok'),
+    pytest.param(None, Response({'Content-Type': 'text/html'}, 200, FRIENDS_BODY),
+                 id='header mismatch'),
+    pytest.param(FRIENDS_RULES, Response({}, 200, FRIENDS_BODY), id='rules exact match'),
+    pytest.param(FRIENDS_RULES,
+                 Response({'Content-Type': 'application/xml'}, 200, {
+                     **FRIENDS_BODY,
+                     'friends': [{'name': 'chris'}, {'name': 'evan'}, {'name': 'shula'}],
+                     'score': 4.5,
+                     'joined': '1994-04-26',
+                     'extra': {'nested': [7, 8, 9]}
+                 }),
+                 id='rules match other values'),
+    pytest.param(FRIENDS_RULES, Response({}, 200, {**FRIENDS_BODY, 'friends': []}),
+                 id='rules min'),
+    pytest.param(FRIENDS_RULES, Response({}, 200, {**FRIENDS_BODY, 'tags': ['a', 'b', 'c']}),
+                 id='rules max'),
+    pytest.param(FRIENDS_RULES,
+                 Response({}, 200, {**FRIENDS_BODY, 'friends': [{'name': 'Gabe'}]}),
+                 id='rules nested regex'),
+    pytest.param(FRIENDS_RULES, Response({}, 200, {**FRIENDS_BODY, 'score': '123'}),
+                 id='rules combine or'),
+    pytest.param(FRIENDS_RULES, Response({}, 200, {**FRIENDS_BODY, 'nickname': 'z'}),
+                 id='rules null'),
+    pytest.param(FRIENDS_RULES, Response({}, 200, {**FRIENDS_BODY, 'bio': 'hi'}),
+                 id='rules include'),
+    pytest.param(FRIENDS_RULES, Response({}, 200, {**FRIENDS_BODY, 'extra': []}),
+                 id='rules wildcard type'),
+    pytest.param(FRIENDS_RULES, Response({'Content-Type': 'text/html'}, 200, FRIENDS_BODY),
+                 id='rules header regex'),
+    pytest.param(FRIENDS_RULES, Response({}, 200, {**FRIENDS_BODY, 'friends': 'gabe'}),
+                 id='rules array type'),
+]
+
+
+class TestParityWithPactmanVerifier:
+
+    @pytest.mark.parametrize('matching_rules, emulator_result', PARITY_CASES)  # type: ignore
+    def test_verifies_like_pactman(self,
+                                   matching_rules: Optional[Dict],
+                                   emulator_result: Response) -> None:
+        # Given
+        pact = _make_pact(Response(
+            headers={'Content-Type': 'application/json'},
+            status=200,
+            body=FRIENDS_BODY,
+            matching_rules=matching_rules
+        ))
+
+        # When
+        native_result, = NativeVerifier().verify_pact(pact, [emulator_result])
+        pactman_result, = PactmanVerifier().verify_pact(pact, [emulator_result])
+
+        # Then
+        assert native_result.verified == pactman_result.verified
+        assert _messages(native_result.reason) == _messages(pactman_result.reason)
+
+
+class TestVerifyPact:
+
+    def test_fails_if_emulator_result_is_error(self) -> None:
+        # Given
+        pact = _make_pact(Response(headers={}, status=200))
+        emulator_result = Error(message='Provider errored during execution')
+
+        # When
+        verification_result, = NativeVerifier().verify_pact(pact, [emulator_result])
+
+        # Then
+        assert verification_result == (False, emulator_result.message)
+
+    def test_reuses_compiled_interactions_per_pact_version(self) -> None:
+        # Given
+        verifier = NativeVerifier(max_cached_pacts=1)
+        pact = _make_pact(Response(headers={}, status=200), pact_version='a')
+        other_pact = _make_pact(Response(headers={}, status=200), pact_version='b')
+
+        # When
+        compiled_interactions = verifier._compile_pact(pact)
+        recompiled_interactions = verifier._compile_pact(pact)
+        verifier._compile_pact(other_pact)
+
+        # Then
+        assert compiled_interactions is recompiled_interactions
+        assert verifier._compile_pact(pact) is not compiled_interactions
+
+
+class TestVerifyPacts:
+
+    def test_shares_compiled_interactions_and_results_across_pacts(self) -> None:
+        # Given
+        verifier = NativeVerifier()
+        expected_response = Response(headers={}, status=200, body={'hello': 'world'})
+        pacts = [_make_pact(expected_response, pact_version='a'),
+                 _make_pact(expected_response, pact_version='b')]
+        emulator_results_list: List[List[EmulatorResult]] = [
+            [Response({}, 200, {'hello': 'world'})],
+            [Response({}, 200, {'hello': 'there'})]
+        ]
+
+        # When
+        verification_results_list = verifier.verify_pacts(pacts, emulator_results_list)
+
+        # Then
+        assert [[result.verified for result in results]
+                for results in verification_results_list] == [[True], [False]]
+        compiled_interaction, = verifier._compile_pact(pacts[0])
+        assert verifier._compile_pact(pacts[1]) == [compiled_interaction]
+
+
+def _messages(reason: Optional[str]) -> Optional[str]:
+    return reason.split(': ', 1)[1] if reason else reason
+
+
+def _make_pact(response: Response, pact_version: str = 'abc') -> Pact:
+    raw_response = {key: value for key, value in {
+        'status': response.status,
+        'headers': response.headers,
+        'body': response.body,
+        'matchingRules': response.matching_rules
+    }.items() if value is not None}
+    return Pact(
+        consumer_version='1',
+        pact_json={'interactions': [{
+            'request': {'path': '/', 'method': 'GET'},
+            'response': raw_response
+        }]},
+        pact_version=pact_version
+    )
@@ -0,0 +1,97 @@
+import json
+import os
+
+from faaspact_verifier.definitions import Pact, Response, VerificationResult
+from faaspact_verifier.entities.selection import select_interactions
+from faaspact_verifier.exceptions import PactBrokerError
+from faaspact_verifier.gateways.ndjson_notification_gateway import NdjsonNotificationGateway
+
+
+class TestNdjsonNotificationGateway:
+
+    def test_writes_a_record_per_interaction_and_a_summary(self, tmp_path: str) -> None:
+        # Given
+        path = f'{tmp_path}/report.ndjson'
+        gateway = NdjsonNotificationGateway(path)
+        pact = _make_pact()
+        timed_response = Response({}, 200)
+        timed_response.__dict__['duration'] = 0.25
+
+        # When
+        gateway.announce_interaction_result(pact, 0, timed_response, VerificationResult(True))
+        gateway.announce_interaction_result(pact, 1, None, VerificationResult(False, 'nope'))
+        gateway.announce_pact_results(pact, [], [])
+        with open(path) as f:
+            partial_records = [json.loads(line) for line in f]
+        gateway.announce_publish_failure(pact, PactBrokerError('500: oops'))
+        gateway.announce_job_summary(results_published=True, succeeded=False)
+
+        # Then
+        pact_fields = {'consumer': 'gabe', 'provider': 'provider', 'consumer_version': '1',
+                       'pact_version': 'abc', 'tags': ['master']}
+        assert partial_records == [
+            {'type': 'interaction', **pact_fields, 'interaction_index': 0,
+             'description': 'a request for a user', 'verified': True, 'reason': None,
+             'duration': 0.25, 'traceback': None},
+            {'type': 'interaction', **pact_fields, 'interaction_index': 1,
+             'description': 'a request for a user', 'verified': False, 'reason': 'nope',
+             'duration': None, 'traceback': None}
+        ]
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        assert records[2:] == [
+            {'type': 'publish_failure', **pact_fields, 'reason': '500: oops'},
+            {'type': 'summary', 'results_published': True, 'succeeded': False}
+        ]
+
+    def test_reports_selected_interactions_by_their_index_in_the_pact(self, tmp_path: str) -> None:
+        # Given
+        path = f'{tmp_path}/report.ndjson'
+        gateway = NdjsonNotificationGateway(path)
+        pact = select_interactions(_make_pact(), provider_states=frozenset({'there is a user'}))
+        assert pact
+
+        # When
+        gateway.announce_interaction_result(pact, 0, None, VerificationResult(True))
+        gateway.announce_job_summary(results_published=False, succeeded=True)
+
+        # Then
+        with open(path) as f:
+            [record, _] = [json.loads(line) for line in f]
+        assert record['interaction_index'] == 1
+
+    def test_closes_the_file_of_a_job_that_raised(self, tmp_path: str) -> None:
+        # Given
+        path = f'{tmp_path}/report.ndjson'
+        gateway = NdjsonNotificationGateway(path)
+        created_early = os.path.exists(path)
+
+        # When
+        gateway.announce_interaction_result(_make_pact(), 0, None, VerificationResult(True))
+        gateway.close()
+
+        # Then
+        assert not created_early
+        with open(path) as f:
+            assert [json.loads(line)['type'] for line in f] == ['interaction']
+
+
+def _make_pact() -> Pact:
+    return Pact(
+        consumer_version='1',
+        pact_json={
+            'consumer': {'name': 'gabe'},
+            'provider': {'name': 'provider'},
+            'interactions': [
+                {'description': 'a request for a user',
+                 'request': {'path': '/', 'method': 'GET'},
+                 'response': {'status': 200}},
+                {'description': 'a request for a user',
+                 'request': {'path': '/', 'method': 'GET'},
+                 'response': {'status': 200},
+                 'providerStates': [{'name': 'there is a user'}]}
+            ]
+        },
+        pact_version='abc',
+        tags=frozenset({'master'})
+    )
@@ -0,0 +1,290 @@
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+import pytest
+
+import requests
+
+import responses
+
+from faaspact_verifier.definitions import Pact, VerificationResult, pluck_interaction
+from faaspact_verifier.exceptions import PactBrokerError
+from faaspact_verifier.gateways.pact_broker_gateway import PactBrokerGateway
+from faaspact_verifier.gateways.pact_cache import PactCache
+
+
+HOST = 'https://broker.test'
+
+
+class TestFetchProviderPacts:
+
+    @pytest.mark.parametrize('max_workers', [1, 4])  # type: ignore
+    @responses.activate  # type: ignore
+    def test_fetches_latest_and_master_pacts(self, max_workers: int) -> None:
+        # Given
+        _add_pact(consumer='alpha', consumer_version='a1', pact_version='aaa', tags=['feature'])
+        _add_pact(consumer='bravo', consumer_version='b1', pact_version='bbb', tags=[])
+        _add_pact(consumer='alpha', consumer_version='a0', pact_version='ccc', tags=['master'])
+        _add_index(tag=None, pact_hrefs=[_pact_href('alpha', 'a1'), _pact_href('bravo', 'b1')])
+        _add_index(tag='master', pact_hrefs=[_pact_href('alpha', 'a0')])
+        gateway = PactBrokerGateway(HOST, 'user', 'pass', max_workers=max_workers)
+
+        # When
+        pacts = gateway.fetch_provider_pacts('provider')
+
+        # Then
+        assert pacts == [
+            _make_pact('alpha', 'a1', 'aaa', {'feature'}),
+            _make_pact('bravo', 'b1', 'bbb', set()),
+            _make_pact('alpha', 'a0', 'ccc', {'master'})
+        ]
+        assert all('Authorization' in call.request.headers for call in responses.calls)
+
+    @responses.activate  # type: ignore
+    def test_merges_pacts_with_the_same_pact_version(self) -> None:
+        # Given
+        _add_pact(consumer='alpha', consumer_version='a1', pact_version='aaa', tags=['master'])
+        _add_pact(consumer='bravo', consumer_version='b2', pact_version='bbb', tags=['feature'])
+        _add_pact(consumer='bravo', consumer_version='b1', pact_version='bbb', tags=['master'])
+        _add_index(tag=None, pact_hrefs=[_pact_href('alpha', 'a1'), _pact_href('bravo', 'b2')])
+        _add_index(tag='master', pact_hrefs=[_pact_href('alpha', 'a1'), _pact_href('bravo', 'b1')])
+        gateway = PactBrokerGateway(HOST, 'user', 'pass')
+
+        # When
+        pacts = gateway.fetch_provider_pacts('provider')
+
+        # Then
+        assert pacts == [
+            _make_pact('alpha', 'a1', 'aaa', {'master'}),
+            _make_pact('bravo', 'b2', 'bbb', {'feature', 'master'})
+        ]
+        fetched_urls = [call.request.url for call in responses.calls]
+        assert fetched_urls.count(_pact_href('alpha', 'a1')) == 1
+
+    @responses.activate  # type: ignore
+    def test_selects_pacts_by_consumer_and_tag_before_downloading_them(self) -> None:
+        # Given
+        _add_pact(consumer='alpha', consumer_version='a2', pact_version='aaa',
+                  tags=['feature', 'master'])
+        _add_index(tag='feature', pact_hrefs=[_pact_href('alpha', 'a2'), _pact_href('bravo', 'b2')])
+        gateway = PactBrokerGateway(HOST, 'user', 'pass')
+
+        # When
+        pacts = gateway.fetch_provider_pacts('provider',
+                                             consumers=frozenset({'alpha'}),
+                                             tags=frozenset({'feature'}))
+
+        # Then
+        assert pacts == [_make_pact('alpha', 'a2', 'aaa', {'feature', 'master'})]
+        assert [call.request.url for call in responses.calls] == [
+            f'{HOST}/pacts/provider/provider/latest/feature',
+            _pact_href('alpha', 'a2'),
+            f'{HOST}/pacticipants/alpha/versions/a2'
+        ]
+
+    @responses.activate  # type: ignore
+    def test_revalidates_cached_pacts(self, tmp_path: str) -> None:
+        # Given
+        _add_index(tag=None, pact_hrefs=[_pact_href('alpha', 'a1')])
+        _add_index(tag='master', pact_hrefs=[])
+        _add_pact(consumer='alpha', consumer_version='a1', pact_version='aaa', tags=['master'],
+                  etag='"v1"')
+        gateway = PactBrokerGateway(HOST, 'user', 'pass', pact_cache=PactCache(str(tmp_path)))
+        first_pacts = gateway.fetch_provider_pacts('provider')
+
+        responses.reset()
+        _add_index(tag=None, pact_hrefs=[_pact_href('alpha', 'a1')])
+        _add_index(tag='master', pact_hrefs=[])
+        _add_pact(consumer='alpha', consumer_version='a1', pact_version='aaa', tags=['master'],
+                  etag='"v1"', not_modified=True)
+
+        # When
+        pacts = gateway.fetch_provider_pacts('provider')
+
+        # Then
+        assert pacts == first_pacts == [_make_pact('alpha', 'a1', 'aaa', {'master'})]
+        pact_call = next(call for call in responses.calls
+                         if call.request.url == _pact_href('alpha', 'a1'))
+        assert pact_call.request.headers['If-None-Match'] == '"v1"'
+
+    @responses.activate  # type: ignore
+    def test_selects_pacts_for_verification_in_a_single_request(self) -> None:
+        # Given
+        _add_pact(consumer='alpha', consumer_version='a1', pact_version='aaa',
+                  tags=['feature', 'master'])
+        _add_pact(consumer='alpha', consumer_version='a0', pact_version='ccc', tags=['master'])
+        _add_pact(consumer='bravo', consumer_version='b1', pact_version='bbb', tags=['feature'])
+        _add_pacts_for_verification({
+            None: [_pact_href('alpha', 'a1'), _pact_href('bravo', 'b1')],
+            'master': [_pact_href('alpha', 'a0'), _pact_href('bravo', 'b1')]
+        })
+        gateway = PactBrokerGateway(HOST, 'user', 'pass', pacts_for_verification=True)
+
+        # When
+        pacts = gateway.fetch_provider_pacts('provider', consumers=frozenset({'alpha'}))
+
+        # Then
+        assert pacts == [
+            _make_pact('alpha', 'a1', 'aaa', {'feature', 'master'}),
+            _make_pact('alpha', 'a0', 'ccc', {'master'})
+        ]
+        post_bodies = [json.loads(cast(bytes, call.request.body)) for call in responses.calls
+                       if call.request.method == 'POST']
+        assert post_bodies == [{'consumerVersionSelectors': [{'latest': True},
+                                                             {'tag': 'master', 'latest': True}]}]
+
+    @responses.activate  # type: ignore
+    def test_falls_back_to_latest_pacts_without_pacts_for_verification(self) -> None:
+        # Given
+        responses.add(responses.POST, f'{HOST}/pacts/provider/provider/for-verification',
+                      status=404)
+        _add_pact(consumer='alpha', consumer_version='a1', pact_version='aaa', tags=['master'])
+        _add_index(tag=None, pact_hrefs=[_pact_href('alpha', 'a1')])
+        _add_index(tag='master', pact_hrefs=[_pact_href('alpha', 'a1')])
+        gateway = PactBrokerGateway(HOST, 'user', 'pass', pacts_for_verification=True)
+
+        # When
+        pacts = gateway.fetch_provider_pacts('provider')
+        pacts_again = gateway.fetch_provider_pacts('provider')
+
+        # Then
+        assert pacts == pacts_again == [_make_pact('alpha', 'a1', 'aaa', {'master'})]
+        assert [call.request.method for call in responses.calls].count('POST') == 1
+
+    def test_rejects_non_positive_max_workers(self) -> None:
+        with pytest.raises(ValueError):
+            PactBrokerGateway(HOST, 'user', 'pass', max_workers=0)
+
+
+class TestProvidePactsVerificationResults:
+
+    @responses.activate  # type: ignore
+    def test_retries_transient_failures_and_reports_the_rest(self) -> None:
+        # Given
+        responses.add(responses.POST, _verification_results_href('alpha', 'aaa'), status=503)
+        responses.add(responses.POST, _verification_results_href('alpha', 'aaa'), status=201)
+        responses.add(responses.POST, _verification_results_href('bravo', 'bbb'), status=400)
+        responses.add(responses.POST, _verification_results_href('charlie', 'ccc'), status=502)
+        gateway = PactBrokerGateway(HOST, 'user', 'pass', max_workers=3, publish_retries=2,
+                                    retry_backoff=0)
+        pacts = [_make_pact(consumer, '1', pact_version, set())
+                 for consumer, pact_version in [('alpha', 'aaa'), ('bravo', 'bbb'),
+                                                ('charlie', 'ccc')]]
+
+        # When
+        errors = gateway.provide_pacts_verification_results(
+            '1.0',
+            pacts,
+            [[VerificationResult(True)], [VerificationResult(False, 'nope')], []]
+        )
+
+        # Then
+        assert errors[0] is None
+        assert isinstance(errors[1], PactBrokerError)
+        assert isinstance(errors[2], PactBrokerError)
+        assert Counter(call.request.url for call in responses.calls) == {
+            _verification_results_href('alpha', 'aaa'): 2,
+            _verification_results_href('bravo', 'bbb'): 1,
+            _verification_results_href('charlie', 'ccc'): 3
+        }
+
+    @responses.activate  # type: ignore
+    def test_reports_request_errors_without_retrying_them(self) -> None:
+        # Given
+        responses.add(responses.POST, _verification_results_href('alpha', 'aaa'),
+                      body=requests.TooManyRedirects('Exceeded 30 redirects.'))
+        gateway = PactBrokerGateway(HOST, 'user', 'pass', publish_retries=2, retry_backoff=0)
+        pact = _make_pact('alpha', '1', 'aaa', set())
+
+        # When
+        [error] = gateway.provide_pacts_verification_results('1.0',
+                                                             [pact],
+                                                             [[VerificationResult(True)]])
+
+        # Then
+        assert isinstance(error, PactBrokerError)
+        assert 'Exceeded 30 redirects.' in str(error)
+        assert len(responses.calls) == 1
+
+
+def _verification_results_href(consumer: str, pact_version: str) -> str:
+    return (f'{HOST}/pacts/provider/provider/consumer/{consumer}'
+            f'/pact-version/{pact_version}/verification-results')
+
+
+def _pact_href(consumer: str, consumer_version: str) -> str:
+    return f'{HOST}/pacts/provider/provider/consumer/{consumer}/version/{consumer_version}'
+
+
+def _add_index(tag: Optional[str], pact_hrefs: List[str]) -> None:
+    url = f'{HOST}/pacts/provider/provider/latest' + (f'/{tag}' if tag else '')
+    responses.add(responses.GET, url, json={
+        '_links': {'pb:pacts': [{'href': href} for href in pact_hrefs]}
+    })
+
+
+def _add_pacts_for_verification(pact_hrefs_by_tag: Dict[Optional[str], List[str]]) -> None:
+    def respond(request: Any) -> Tuple[int, Dict, str]:
+        selectors = json.loads(request.body)['consumerVersionSelectors']
+        hrefs = dict.fromkeys(href for selector in selectors
+                              for href in pact_hrefs_by_tag[selector.get('tag')])
+        return 200, {}, json.dumps({'_embedded': {'pacts': [
+            {'shortDescription': 'latest', '_links': {'self': {'href': href, 'name': 'Pact'}}}
+            for href in hrefs
+        ]}})
+
+    responses.add_callback(responses.POST,
+                           f'{HOST}/pacts/provider/provider/for-verification',
+                           callback=respond)
+
+
+def _add_pact(consumer: str,
+              consumer_version: str,
+              pact_version: str,
+              tags: List[str],
+              etag: Optional[str] = None,
+              not_modified: bool = False) -> None:
+    pact_href = _pact_href(consumer, consumer_version)
+    consumer_version_href = f'{HOST}/pacticipants/{consumer}/versions/{consumer_version}'
+    headers = {'ETag': etag} if etag else {}
+    if not_modified:
+        responses.add(responses.GET, pact_href, status=304, headers=headers)
+    else:
+        responses.add(responses.GET, pact_href, headers=headers, json={
+            **_pact_json(consumer),
+            'createdAt': '2018-11-01T00:00:00+00:00',
+            '_links': {
+                'pb:consumer-version': {'href': consumer_version_href,
+                                        'name': consumer_version},
+                'pb:publish-verification-results': {
+                    'href': _verification_results_href(consumer, pact_version)
+                }
+            }
+        })
+    responses.add(responses.GET, consumer_version_href, json={
+        'number': consumer_version,
+        '_embedded': {'tags': [{'name': tag} for tag in tags]}
+    })
+
+
+def _pact_json(consumer: str) -> Dict:
+    return {
+        'consumer': {'name': consumer},
+        'provider': {'name': 'provider'},
+        'interactions': [{'description': f'a request from {consumer}',
+                          'request': {'path': f'/{consumer}', 'method': 'GET'},
+                          'response': {'status': 200}}]
+    }
+
+
+def _make_pact(consumer: str, consumer_version: str, pact_version: str, tags: set) -> Pact:
+    pact_json = _pact_json(consumer)
+    return Pact.with_interactions(
+        tuple(pluck_interaction(raw_interaction)
+              for raw_interaction in pact_json.pop('interactions')),
+        consumer_version=consumer_version,
+        pact_json=pact_json,
+        pact_version=pact_version,
+        tags=frozenset(tags)
+    )
@@ -0,0 +1,54 @@
+import os
+
+from faaspact_verifier.gateways.pact_cache import PactCache
+
+
+class TestPactCache:
+
+    def test_evicts_least_recently_used_pacts(self, tmp_path: str) -> None:
+        # Given
+        cache = PactCache(str(tmp_path), max_bytes=150)
+        body = b'{"interactions": ["' + b'x' * 50 + b'"]}'
+        _cache_pact(cache, 'https://broker.test/old', 'old', body)
+        os.utime(os.path.join(str(tmp_path), 'pacts', 'old.json'), (0, 0))
+
+        # When
+        _cache_pact(cache, 'https://broker.test/new', 'new', body)
+        _cache_pact(cache, 'https://broker.test/newer', 'newer', body)
+
+        # Then
+        assert cache.open('https://broker.test/old') is None
+        for href in ['https://broker.test/new', 'https://broker.test/newer']:
+            cached_pact = cache.open(href)
+            assert cached_pact
+            cached_pact.body.close()
+
+    def test_caches_pact_bodies_as_they_are_read(self, tmp_path: str) -> None:
+        # Given
+        cache = PactCache(str(tmp_path))
+        chunks = [b'{"interactions": [],', b' "_links": {}}']
+
+        # When
+        with cache.writing('https://broker.test/x', '"v1"') as writer:
+            read_chunks = list(writer.tee(chunks))
+            writer.commit('aaa', {'self': {'href': 'https://broker.test/x'}})
+        with cache.writing('https://broker.test/y', '"v1"') as writer:
+            list(writer.tee(chunks))
+
+        # Then
+        assert read_chunks == chunks
+        cached_pact = cache.open('https://broker.test/x')
+        assert cached_pact
+        with cached_pact.body:
+            assert cached_pact.body.read() == b''.join(chunks)
+        assert cached_pact.etag == '"v1"'
+        assert cached_pact.pact_version == 'aaa'
+        assert cached_pact.links == {'self': {'href': 'https://broker.test/x'}}
+        assert cache.open('https://broker.test/y') is None
+        assert sorted(os.listdir(os.path.join(str(tmp_path), 'pacts'))) == ['aaa.json']
+
+
+def _cache_pact(cache: PactCache, href: str, pact_version: str, body: bytes) -> None:
+    with cache.writing(href, '"v1"') as writer:
+        list(writer.tee([body]))
+        writer.commit(pact_version, {})
@@ -0,0 +1,60 @@
+import json
+from typing import Iterator
+
+import pytest
+
+from faaspact_verifier.definitions import Pact
+from faaspact_verifier.gateways.pact_stream import load_pact
+
+
+RAW_PACT = {
+    'consumer': {'name': 'gäbe'},
+    'provider': {'name': 'provider'},
+    'interactions': [
+        {
+            'description': 'a request for an egg',
+            'providerStates': [{'name': 'there is an egg', 'params': {'weight': 12345}}],
+            'request': {'path': '/egg', 'method': 'GET', 'headers': {'Accept': '*/*'}},
+            'response': {'status': 200, 'body': {'name': 'hümpty', 'weight': 12345.5}}
+        },
+        {
+            'request': {'path': '/eggs', 'method': 'POST', 'body': [1, [2, {'3': None}]]},
+            'response': {'status': 201}
+        }
+    ],
+    'metadata': {'pactSpecification': {'version': '3.0.0'}},
+    'count': 1234567
+}
+
+
+class TestLoadPact:
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1024])  # type: ignore
+    def test_loads_pacts_split_anywhere(self, chunk_size: int) -> None:
+        # Given
+        body = json.dumps(RAW_PACT, indent=2, ensure_ascii=False).encode()
+
+        # When
+        fields, interactions = load_pact(_split(body, chunk_size))
+
+        # Then
+        expected_pact = Pact('1', RAW_PACT, 'x')
+        assert fields == {field: value for field, value in RAW_PACT.items()
+                          if field != 'interactions'}
+        assert interactions == expected_pact.interactions
+        assert interactions[0].description == 'a request for an egg'
+
+    @pytest.mark.parametrize('body', [  # type: ignore
+        b'',
+        b'[]',
+        b'{"interactions": [{"request": {"path": "/"',
+        b'{"consumer": {"name": "a"}} {}',
+        b'{"consumer" {"name": "a"}}'
+    ])
+    def test_rejects_malformed_pacts(self, body: bytes) -> None:
+        with pytest.raises(ValueError):
+            load_pact(_split(body, 4))
+
+
+def _split(body: bytes, chunk_size: int) -> Iterator[bytes]:
+    return (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
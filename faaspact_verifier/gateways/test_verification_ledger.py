@@ -0,0 +1,31 @@
+import os
+
+from faaspact_verifier.definitions import VerificationResult
+from faaspact_verifier.gateways.verification_ledger import SqliteVerificationLedger
+
+
+class TestSqliteVerificationLedger:
+
+    def test_loads_recorded_passes_by_pact_version_and_fingerprint(self, tmp_path: str) -> None:
+        # Given
+        path = os.path.join(str(tmp_path), 'ledger', 'ledger.sqlite3')
+        ledger = SqliteVerificationLedger(path)
+        verification_results = [VerificationResult(True), VerificationResult(True)]
+
+        # When
+        ledger.record('aaa', 'code-1', verification_results)
+
+        # Then
+        assert SqliteVerificationLedger(path).load('aaa', 'code-1') == verification_results
+        assert ledger.load('aaa', 'code-2') is None
+        assert ledger.load('bbb', 'code-1') is None
+
+    def test_does_not_record_failures(self, tmp_path: str) -> None:
+        # Given
+        ledger = SqliteVerificationLedger(os.path.join(str(tmp_path), 'ledger.sqlite3'))
+
+        # When
+        ledger.record('aaa', 'code-1', [VerificationResult(True), VerificationResult(False, 'no')])
+
+        # Then
+        assert ledger.load('aaa', 'code-1') is None
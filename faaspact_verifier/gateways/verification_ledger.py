@@ -0,0 +1,58 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import List, Optional
+
+from faaspact_verifier import abc
+from faaspact_verifier.definitions import VerificationResult
+
+
+class SqliteVerificationLedger(abc.VerificationLedger):
+    """Verification ledger kept in a SQLite file. Only passing verifications are recorded."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS verifications ('
+                '    pact_version TEXT NOT NULL,'
+                '    fingerprint TEXT NOT NULL,'
+                '    verification_results TEXT NOT NULL,'
+                '    recorded_at REAL NOT NULL,'
+                '    PRIMARY KEY (pact_version, fingerprint)'
+                ')'
+            )
+
+    def load(self, pact_version: str, fingerprint: str) -> Optional[List[VerificationResult]]:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                'SELECT verification_results FROM verifications '
+                'WHERE pact_version = ? AND fingerprint = ?',
+                (pact_version, fingerprint)
+            ).fetchone()
+        if row is None:
+            return None
+
+        return [VerificationResult(*raw_verification_result)
+                for raw_verification_result in json.loads(row[0])]
+
+    def record(self,
+               pact_version: str,
+               fingerprint: str,
+               verification_results: List[VerificationResult]) -> None:
+        if not all(verification_result.verified for verification_result in verification_results):
+            return
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO verifications VALUES (?, ?, ?, ?)',
+                (pact_version, fingerprint, json.dumps(verification_results), time.time())
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path)
@@ -0,0 +1,203 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncContextManager,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Type,
+    Union
+)
+
+
+class Span(NamedTuple):
+    name: str
+    category: str
+    start: float
+    duration: float
+    pid: int
+    tid: int
+    args: Dict[str, Any] = {}
+
+
+class Profiler:
+    """Collects timed spans of a run. Spans are recorded from any thread, and spans recorded in
+    worker processes can be added with `extend`.
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[None]:
+        start = time.time()
+        start_counter = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append(Span(
+                name=name,
+                category=category,
+                start=start,
+                duration=time.perf_counter() - start_counter,
+                pid=os.getpid(),
+                tid=threading.get_ident(),
+                args=args
+            ))
+
+    def extend(self, spans: Iterable[Span]) -> None:
+        self.spans.extend(spans)
+
+    def to_chrome_trace(self) -> Dict:
+        """The spans as a Chrome trace, which chrome://tracing and Perfetto can open."""
+        return {
+            'traceEvents': [{
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': span.start * 1e6,
+                'dur': span.duration * 1e6,
+                'pid': span.pid,
+                'tid': span.tid,
+                'args': span.args
+            } for span in self.spans],
+            'displayTimeUnit': 'ms'
+        }
+
+    def write_chrome_trace(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+    def format_summary(self, limit: int = 10) -> str:
+        """Summarize the time spent in each phase, the slowest interactions and the fixtures that
+        took the longest in total to set up and tear down.
+
+        >>> profiler = Profiler()
+        >>> profiler.extend([Span('fetch', 'phase', 0, 1.5, 1, 1),
+        ...                  Span('GET /a', 'interaction', 0, 0.25, 1, 1),
+        ...                  Span('user setup', 'fixture', 0, 0.125, 1, 1, {'fixture': 'user'}),
+        ...                  Span('user teardown', 'fixture', 0, 0.125, 1, 1, {'fixture': 'user'})])
+        >>> print(profiler.format_summary())
+        Phases:
+          1500.0ms  fetch
+        Slowest interactions:
+          250.0ms  GET /a
+        Slowest fixtures (setup and teardown):
+          250.0ms  user (1 setups)
+        """
+        lines = ['Phases:']
+        lines += [_format_duration(span.duration, span.name)
+                  for span in self.spans if span.category == 'phase']
+
+        interactions = sorted((span for span in self.spans if span.category == 'interaction'),
+                              key=lambda span: span.duration,
+                              reverse=True)
+        lines.append('Slowest interactions:')
+        lines += [_format_duration(span.duration, span.name) for span in interactions[:limit]]
+
+        duration_by_fixture: Dict[str, float] = {}
+        setups_by_fixture: Dict[str, int] = {}
+        for span in self.spans:
+            if span.category != 'fixture':
+                continue
+            fixture = span.args['fixture']
+            duration_by_fixture[fixture] = duration_by_fixture.get(fixture, 0) + span.duration
+            if span.name.endswith(' setup'):
+                setups_by_fixture[fixture] = setups_by_fixture.get(fixture, 0) + 1
+        lines.append('Slowest fixtures (setup and teardown):')
+        fixtures = sorted(duration_by_fixture, key=duration_by_fixture.__getitem__, reverse=True)
+        lines += [_format_duration(duration_by_fixture[fixture],
+                                   f'{fixture} ({setups_by_fixture.get(fixture, 0)} setups)')
+                  for fixture in fixtures[:limit]]
+
+        return '\n'.join(lines)
+
+
+_active_profiler: Optional[Profiler] = None
+
+
+@contextlib.contextmanager
+def profiling(profiler: Profiler) -> Iterator[Profiler]:
+    """Record spans to profiler for the duration of the block."""
+    global _active_profiler
+
+    previous_profiler = _active_profiler
+    _active_profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active_profiler = previous_profiler
+
+
+def active_profiler() -> Optional[Profiler]:
+    return _active_profiler
+
+
+def span(name: str, category: str, **args: Any) -> ContextManager[None]:
+    """Time a block as a span of the active profiler, if there is one."""
+    if _active_profiler is None:
+        return contextlib.nullcontext()
+    return _active_profiler.span(name, category, **args)
+
+
+def timed_fixture(
+        fixture: Union[ContextManager, AsyncContextManager],
+        name: str
+) -> Union[ContextManager, AsyncContextManager]:
+    """Wrap an entered-to-be fixture so that its setup and teardown are recorded as separate spans
+    of the active profiler. Returns the fixture unchanged when nothing is being profiled.
+    """
+    if _active_profiler is None:
+        return fixture
+    if isinstance(fixture, contextlib.AbstractAsyncContextManager):
+        return _TimedAsyncFixture(fixture, name)
+    return _TimedFixture(fixture, name)
+
+
+class _TimedFixture:
+
+    def __init__(self, fixture: ContextManager, name: str) -> None:
+        self.fixture = fixture
+        self.name = name
+
+    def __enter__(self) -> Any:
+        with span(f'{self.name} setup', 'fixture', fixture=self.name):
+            return self.fixture.__enter__()
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc: Optional[BaseException],
+                 tb: Optional[TracebackType]) -> Optional[bool]:
+        with span(f'{self.name} teardown', 'fixture', fixture=self.name):
+            return self.fixture.__exit__(exc_type, exc, tb)
+
+
+class _TimedAsyncFixture:
+
+    def __init__(self, fixture: AsyncContextManager, name: str) -> None:
+        self.fixture = fixture
+        self.name = name
+
+    async def __aenter__(self) -> Any:
+        with span(f'{self.name} setup', 'fixture', fixture=self.name):
+            return await self.fixture.__aenter__()
+
+    async def __aexit__(self,
+                        exc_type: Optional[Type[BaseException]],
+                        exc: Optional[BaseException],
+                        tb: Optional[TracebackType]) -> Optional[bool]:
+        with span(f'{self.name} teardown', 'fixture', fixture=self.name):
+            return await self.fixture.__aexit__(exc_type, exc, tb)
+
+
+def _format_duration(duration: float, label: str) -> str:
+    return f'  {duration * 1000:.1f}ms  {label}'
@@ -0,0 +1,379 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, FrozenSet, Generator, Iterator, List, Optional
+
+import pytest
+
+from faaspact_verifier import profiler
+from faaspact_verifier.abc import (
+    NotificationGateway,
+    PactBrokerGateway,
+    VerificationLedger,
+    Verifier
+)
+from faaspact_verifier.context import Context
+from faaspact_verifier.definitions import (
+    Pact,
+    Request,
+    Response,
+    VerificationResult,
+    VerifierOptions
+)
+from faaspact_verifier.exceptions import UnsupportedProviderStateError
+from faaspact_verifier.types import EmulatorResult
+from faaspact_verifier.use_verifier import use_verifier
+
+
+class TestUseVerifier:
+
+    def test_fetches_pacts_within_the_fetch_phase(self) -> None:
+        # Given
+        events: List[str] = []
+        context = _make_context(events, [_make_pact('gabe', 'a', [_make_raw_interaction('/200')])])
+        run_profiler = profiler.Profiler()
+
+        # When
+        with profiler.profiling(run_profiler):
+            _use_verifier(context, events)
+
+        # Then
+        [fetch_phase] = [span for span in run_profiler.spans
+                         if (span.name, span.category) == ('fetch', 'phase')]
+        [broker_request] = [span for span in run_profiler.spans if span.category == 'broker']
+        assert fetch_phase.start <= broker_request.start
+        assert fetch_phase.duration >= broker_request.duration
+
+    def test_announces_pacts_once_every_pact_is_verified(self) -> None:
+        # Given
+        events: List[str] = []
+        context = _make_context(events, [
+            _make_pact('gabe', 'a', [_make_raw_interaction('/200')]),
+            _make_pact('yuval', 'b', [_make_raw_interaction('/500')])
+        ])
+
+        # When
+        succeeded = _use_verifier(context, events, publish_results=True)
+
+        # Then
+        assert not succeeded
+        assert events == [
+            'fetch', 'emulate /200', 'emulate /500',
+            'interaction gabe 0 passed', 'pact gabe', 'interaction yuval 0 failed', 'pact yuval',
+            'publish gabe', 'publish yuval',
+            'summary failed'
+        ]
+
+
+class TestUseVerifierSelectingInteractions:
+
+    def test_verifies_only_the_selected_interactions_without_publishing(self) -> None:
+        # Given
+        events: List[str] = []
+        context = _make_context(events, [
+            _make_pact('gabe', 'a', [_make_raw_interaction('/500', description='get a user'),
+                                     _make_raw_interaction('/200', description='get an egg')])
+        ])
+
+        # When
+        with pytest.raises(ValueError):
+            _use_verifier(context, events, publish_results=True, interaction_description='egg')
+        succeeded = _use_verifier(context, events, interaction_description='egg')
+
+        # Then
+        assert succeeded
+        assert events == [
+            'fetch', 'emulate /200', 'interaction gabe 1 passed', 'pact gabe', 'summary succeeded'
+        ]
+
+    def test_checks_provider_states_of_the_selected_interactions_only(self) -> None:
+        # Given
+        events: List[str] = []
+        context = _make_context(events, [
+            _make_pact('gabe', 'a', [
+                _make_raw_interaction('/200', 'there is an egg', description='get an egg'),
+                _make_raw_interaction('/200', description='get a user'),
+                _make_raw_interaction('/200', 'there is an egg', description='get a user\'s egg')
+            ])
+        ])
+
+        # When
+        with pytest.raises(UnsupportedProviderStateError) as exc_info:
+            _use_verifier(context, events, interaction_description='user')
+
+        # Then
+        assert str(exc_info.value).startswith('Interaction 2 of pact with consumer "gabe"')
+        assert 'Interaction 0' not in str(exc_info.value)
+
+
+class TestUseVerifierStreaming:
+
+    def test_announces_and_publishes_each_pact_before_fetching_the_next(self) -> None:
+        # Given
+        events: List[str] = []
+        context = _make_context(events, [
+            _make_pact('gabe', 'a', [_make_raw_interaction('/200')]),
+            _make_pact('yuval', 'b', [_make_raw_interaction('/500'),
+                                      _make_raw_interaction('/200')])
+        ])
+
+        # When
+        succeeded = _use_verifier(context, events, publish_results=True, stream=True)
+
+        # Then
+        assert not succeeded
+        assert events == [
+            'fetch gabe', 'emulate /200', 'interaction gabe 0 passed', 'pact gabe', 'publish gabe',
+            'fetch yuval', 'emulate /500', 'emulate /200',
+            'interaction yuval 0 failed', 'interaction yuval 1 passed', 'pact yuval',
+            'publish yuval',
+            'summary failed'
+        ]
+
+    def test_reuses_the_results_of_a_pact_version_already_verified(self) -> None:
+        # Given
+        events: List[str] = []
+        master_pact = _make_pact('gabe', 'a', [_make_raw_interaction('/500')])
+        context = _make_context(events, [
+            master_pact._replace(tags=frozenset({'feature'})),
+            master_pact
+        ])
+
+        # When
+        succeeded = _use_verifier(context, events, publish_results=True, stream=True)
+
+        # Then
+        assert not succeeded
+        assert events == [
+            'fetch gabe', 'emulate /500', 'interaction gabe 0 failed', 'pact gabe', 'publish gabe',
+            'fetch gabe',
+            'summary failed'
+        ]
+
+    def test_raises_on_an_unsupported_provider_state_once_its_pact_arrives(self) -> None:
+        # Given
+        events: List[str] = []
+        context = _make_context(events, [
+            _make_pact('gabe', 'a', [_make_raw_interaction('/200')]),
+            _make_pact('yuval', 'b', [_make_raw_interaction('/200', 'there is an egg')],
+                       tags=frozenset({'feature'})),
+            _make_pact('zach', 'c', [_make_raw_interaction('/200', 'there is an egg')])
+        ])
+
+        # When
+        with pytest.raises(UnsupportedProviderStateError) as exc_info:
+            _use_verifier(context, events, stream=True)
+
+        # Then
+        assert 'Interaction 0 of pact with consumer "zach"' in str(exc_info.value)
+        assert events == [
+            'fetch gabe', 'emulate /200', 'interaction gabe 0 passed', 'pact gabe',
+            'fetch yuval', 'interaction yuval 0 failed', 'pact yuval',
+            'fetch zach'
+        ]
+
+
+class TestUseVerifierWithLedger:
+
+    def test_reuses_recorded_results_in_place_of_verifying_the_pact(self) -> None:
+        # Given
+        events: List[str] = []
+        ledger = FakeVerificationLedger(events)
+        ledger.verification_results_by_key[('a', 'code-1')] = [VerificationResult(False, 'no')]
+        context = _make_context(events,
+                                [_make_pact('gabe', 'a', [_make_raw_interaction('/200')])],
+                                ledger)
+
+        # When
+        succeeded = _use_verifier(context, events, publish_results=True, fingerprint='code-1')
+
+        # Then
+        assert not succeeded
+        assert events == [
+            'fetch', 'interaction gabe 0 failed', 'pact gabe', 'publish gabe', 'summary failed'
+        ]
+
+    def test_records_only_pacts_that_passed(self) -> None:
+        for stream in [False, True]:
+            # Given
+            events: List[str] = []
+            ledger = FakeVerificationLedger(events)
+            context = _make_context(events, [
+                _make_pact('gabe', 'a', [_make_raw_interaction('/200')]),
+                _make_pact('yuval', 'b', [_make_raw_interaction('/500')])
+            ], ledger)
+
+            # When
+            _use_verifier(context, events, fingerprint='code-1', stream=stream)
+            events.clear()
+            _use_verifier(context, events, fingerprint='code-1', stream=stream)
+
+            # Then
+            assert list(ledger.verification_results_by_key) == [('a', 'code-1')]
+            assert [event for event in events if event.startswith('emulate')] == ['emulate /500']
+
+    def test_ignores_the_ledger_while_selecting_interactions(self) -> None:
+        # Given
+        events: List[str] = []
+        ledger = FakeVerificationLedger(events)
+        ledger.verification_results_by_key[('a', 'code-1')] = [VerificationResult(True)]
+        context = _make_context(events,
+                                [_make_pact('gabe', 'a', [_make_raw_interaction('/200')])],
+                                ledger)
+
+        # When
+        succeeded = _use_verifier(context,
+                                  events,
+                                  fingerprint='code-1',
+                                  interaction_description='/200')
+
+        # Then
+        assert succeeded
+        assert 'emulate /200' in events
+        assert not [event for event in events if event.startswith('record')]
+
+
+class FakePactBrokerGateway(PactBrokerGateway):
+
+    def __init__(self, events: List[str], pacts: List[Pact]) -> None:
+        self.events = events
+        self.pacts = pacts
+
+    def fetch_provider_pacts(self,
+                             provider: str,
+                             consumers: FrozenSet[str] = frozenset(),
+                             tags: FrozenSet[str] = frozenset()) -> List[Pact]:
+        with profiler.span('fetch pacts', 'broker'):
+            time.sleep(0.01)
+            self.events.append('fetch')
+            return list({pact.pact_version: pact for pact in self.pacts}.values())
+
+    def iter_provider_pacts(self,
+                            provider: str,
+                            consumers: FrozenSet[str] = frozenset(),
+                            tags: FrozenSet[str] = frozenset()) -> Iterator[Pact]:
+        for pact in self.pacts:
+            self.events.append(f'fetch {pact.consumer_name}')
+            yield pact
+
+    def provide_verification_results(self,
+                                     provider_version: str,
+                                     pact: Pact,
+                                     verification_results: List[VerificationResult]) -> None:
+        self.events.append(f'publish {pact.consumer_name}')
+
+
+class FakeVerifier(Verifier):
+
+    def verify_pact(self,
+                    pact: Pact,
+                    emulator_results: List[EmulatorResult]) -> List[VerificationResult]:
+        return [VerificationResult(True) if emulator_result == interaction.response
+                else VerificationResult(False, 'response mismatch')
+                for interaction, emulator_result in zip(pact.interactions, emulator_results)]
+
+
+class FakeNotificationGateway(NotificationGateway):
+
+    def __init__(self, events: List[str]) -> None:
+        self.events = events
+
+    def announce_job_results(self, *args: Any, **kwargs: Any) -> None:
+        ...
+
+    def announce_interaction_result(self,
+                                    pact: Pact,
+                                    interaction_index: int,
+                                    emulator_result: Optional[EmulatorResult],
+                                    verification_result: VerificationResult) -> None:
+        self.events.append(f'interaction {pact.consumer_name} '
+                           f'{pact.interaction_index(interaction_index)} '
+                           f'{"passed" if verification_result.verified else "failed"}')
+
+    def announce_pact_results(self,
+                              pact: Pact,
+                              emulator_results: List[EmulatorResult],
+                              verification_results: List[VerificationResult]) -> None:
+        self.events.append(f'pact {pact.consumer_name}')
+
+    def announce_job_summary(self, results_published: bool, succeeded: bool) -> None:
+        self.events.append(f'summary {"succeeded" if succeeded else "failed"}')
+
+
+class FakeVerificationLedger(VerificationLedger):
+
+    def __init__(self, events: List[str]) -> None:
+        self.events = events
+        self.verification_results_by_key: Dict[Any, List[VerificationResult]] = {}
+
+    def load(self, pact_version: str, fingerprint: str) -> Optional[List[VerificationResult]]:
+        return self.verification_results_by_key.get((pact_version, fingerprint))
+
+    def record(self,
+               pact_version: str,
+               fingerprint: str,
+               verification_results: List[VerificationResult]) -> None:
+        self.events.append(f'record {pact_version}')
+        self.verification_results_by_key[(pact_version, fingerprint)] = verification_results
+
+
+def _use_verifier(context: Context,
+                  events: List[str],
+                  publish_results: bool = False,
+                  **options: Any) -> bool:
+    """Verify the context's pacts against a faasport that responds with the status in the request
+    path, recording each emulated path in `events`."""
+    def faasport(request: Request) -> Response:
+        events.append(f'emulate {request.path}')
+        return Response(headers={}, status=int(request.path.strip('/')))
+
+    return use_verifier(
+        context,
+        'provider',
+        {'there is a user': _there_is_a_user},
+        faasport,
+        publish_results,
+        failon=frozenset({'master'}),
+        provider_version='1',
+        options=VerifierOptions(**options)
+    )
+
+
+@contextmanager
+def _there_is_a_user() -> Generator:
+    yield
+
+
+def _make_context(events: List[str],
+                  pacts: List[Pact],
+                  verification_ledger: Optional[VerificationLedger] = None) -> Context:
+    return Context(
+        notification_gateway=FakeNotificationGateway(events),
+        pact_broker_gateway=FakePactBrokerGateway(events, pacts),
+        verifier=FakeVerifier(),
+        verification_ledger=verification_ledger
+    )
+
+
+def _make_pact(consumer: str,
+               pact_version: str,
+               raw_interactions: List[Dict],
+               tags: FrozenSet[str] = frozenset({'master'})) -> Pact:
+    return Pact(
+        consumer_version='1',
+        pact_json={
+            'consumer': {'name': consumer},
+            'provider': {'name': 'provider'},
+            'interactions': raw_interactions
+        },
+        pact_version=pact_version,
+        tags=tags
+    )
+
+
+def _make_raw_interaction(path: str, *provider_states: str, description: str = '') -> Dict:
+    return {
+        'description': description or path,
+        'request': {'path': path, 'method': 'GET'},
+        'response': {'status': 200},
+        'providerStates': [{'name': provider_state} for provider_state in provider_states]
+    }
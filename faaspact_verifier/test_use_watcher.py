@@ -0,0 +1,169 @@
+from collections import deque
+from typing import Any, Callable, Dict, FrozenSet, List
+
+import pytest
+
+from faaspact_verifier.context import Context
+from faaspact_verifier.definitions import Pact
+from faaspact_verifier.entities.impact import CodeChange
+from faaspact_verifier.test_use_verifier import (
+    FakeNotificationGateway,
+    FakePactBrokerGateway,
+    FakeVerifier,
+    _make_pact
+)
+from faaspact_verifier.use_watcher import Watcher, use_watcher
+from faaspact_verifier.user_defined.reloader import FaasportReloader
+from faaspact_verifier.user_defined.test_reloader import _edit
+
+
+RAW_EGG_INTERACTION = {
+    'description': 'get an egg',
+    'request': {'path': '/egg', 'method': 'GET'},
+    'response': {'status': 200, 'body': {'egg': 'hümpty'}},
+    'providerStates': [{'name': 'there is an egg'}]
+}
+
+RAW_USER_INTERACTION = {
+    'description': 'get a user',
+    'request': {'path': '/user', 'method': 'GET'},
+    'response': {'status': 200, 'body': {'user': 'gabe'}}
+}
+
+
+class TestUseWatcher:
+
+    def test_reverifies_the_interactions_a_change_affects(self, watched_provider: Any) -> None:
+        # Given
+        events: List[str] = []
+        context = _make_context(events, [
+            lambda: _edit(watched_provider / 'handlers.py', "'hümpty'", "'dümpty'")
+        ])
+
+        # When
+        with pytest.raises(KeyboardInterrupt):
+            use_watcher(context,
+                        'provider',
+                        'watched_provider.faasport',
+                        failon=frozenset({'master'}),
+                        poll_interval=0.01)
+
+        # Then
+        assert events == [
+            'fetch',
+            'cycle 2/2',
+            'interaction gabe 0 passed', 'pact gabe',
+            'interaction yuval 0 passed', 'pact yuval',
+            'summary succeeded',
+            'cycle 1/2',
+            'interaction gabe 0 failed', 'pact gabe',
+            'summary failed',
+            'close'
+        ]
+
+    def test_retries_changes_that_failed_to_reload(self, watched_provider: Any) -> None:
+        # Given
+        events: List[str] = []
+        handlers_path = watched_provider / 'handlers.py'
+        context = _make_context(events, [
+            lambda: _edit(handlers_path, 'def get_user(request):', 'def get_user(request)'),
+            lambda: _edit(handlers_path, "def get_user(request)", "def get_user(request):"),
+            lambda: _edit(handlers_path, "'gabe'", "'zach'")
+        ])
+
+        # When
+        with pytest.raises(KeyboardInterrupt):
+            use_watcher(context,
+                        'provider',
+                        'watched_provider.faasport',
+                        failon=frozenset({'master'}),
+                        poll_interval=0.01)
+
+        # Then
+        assert events[events.index('summary succeeded') + 1:] == [
+            'reload failure',
+            'cycle 0/2',
+            'summary succeeded',
+            'cycle 1/2',
+            'interaction yuval 0 failed', 'pact yuval',
+            'summary failed',
+            'close'
+        ]
+
+
+class TestWatcher:
+
+    def test_picks_the_interactions_that_ran_changed_code(self, watched_provider: Any) -> None:
+        # Given
+        events: List[str] = []
+        watcher = Watcher(Context(notification_gateway=FakeNotificationGateway(events),
+                                  pact_broker_gateway=FakePactBrokerGateway(events, []),
+                                  verifier=FakeVerifier()),
+                          FaasportReloader('watched_provider.faasport'),
+                          _make_pacts(),
+                          frozenset({'master'}))
+        handlers_path = str(watched_provider / 'handlers.py')
+
+        # When
+        unverified_interactions = watcher.affected_interactions(CodeChange())
+        watcher.verify(frozenset(), None)
+        affected_interactions = watcher.affected_interactions(
+            CodeChange(code_keys=frozenset({(handlers_path, 'get_user')}))
+        )
+        structurally_affected_interactions = watcher.affected_interactions(
+            CodeChange(structural=True)
+        )
+
+        # Then
+        assert unverified_interactions == [(0, 0), (1, 0)]
+        assert affected_interactions == [(1, 0)]
+        assert watcher.affected_interactions(CodeChange()) == []
+        assert structurally_affected_interactions == [(0, 0), (1, 0)]
+
+
+class ScriptedNotificationGateway(FakeNotificationGateway):
+    """Runs the next of `actions` each time the watcher is done with a change, and interrupts the
+    watcher once there are none left."""
+
+    def __init__(self, events: List[str], actions: List[Callable[[], None]]) -> None:
+        super().__init__(events)
+        self.actions = deque(actions)
+
+    def announce_job_summary(self, results_published: bool, succeeded: bool) -> None:
+        super().announce_job_summary(results_published, succeeded)
+        self._next()
+
+    def announce_watch_cycle(self,
+                             changed_paths: FrozenSet[str],
+                             interaction_count: int,
+                             total_interaction_count: int) -> None:
+        self.events.append(f'cycle {interaction_count}/{total_interaction_count}')
+
+    def announce_reload_failure(self, formatted_error: str) -> None:
+        self.events.append('reload failure')
+        self._next()
+
+    def close(self) -> None:
+        self.events.append('close')
+
+    def _next(self) -> None:
+        if not self.actions:
+            raise KeyboardInterrupt
+        self.actions.popleft()()
+
+
+def _make_context(events: List[str], actions: List[Callable[[], None]]) -> Context:
+    return Context(
+        notification_gateway=ScriptedNotificationGateway(events, actions),
+        pact_broker_gateway=FakePactBrokerGateway(events, _make_pacts()),
+        verifier=FakeVerifier()
+    )
+
+
+def _make_pacts() -> List[Pact]:
+    raw_interactions_by_consumer: Dict[str, List[Dict]] = {
+        'gabe': [RAW_EGG_INTERACTION],
+        'yuval': [RAW_USER_INTERACTION]
+    }
+    return [_make_pact(consumer, consumer, raw_interactions)
+            for consumer, raw_interactions in raw_interactions_by_consumer.items()]
@@ -1,10 +1,18 @@
-from typing import Callable, ContextManager, Generator, Union
+from typing import (
+    AsyncContextManager,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Generator,
+    Union
+)
 
 from faaspact_verifier.definitions import Error, Request, Response
 
 
 EmulatorResult = Union[Response, Error]
-Faasport = Callable[[Request], Response]
-UserProviderStateFixture = Callable[..., Generator]
-ProviderStateFixture = Callable[..., ContextManager]
-AlwaysFixture = Callable[[], ContextManager]
+Faasport = Callable[[Request], Union[Response, Awaitable[Response]]]
+UserProviderStateFixture = Callable[..., Union[Generator, AsyncGenerator]]
+ProviderStateFixture = Callable[..., Union[ContextManager, AsyncContextManager]]
+AlwaysFixture = Callable[[], Union[ContextManager, AsyncContextManager]]
@@ -1,8 +1,14 @@
-from typing import Callable, ContextManager, Dict, FrozenSet, Optional
+import contextlib
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional
 
+from faaspact_verifier import profiler
 from faaspact_verifier.context import Context
-from faaspact_verifier.entities import emulator, job
-from faaspact_verifier.types import Faasport, ProviderStateFixture
+from faaspact_verifier.definitions import Pact, VerificationResult, VerifierOptions
+from faaspact_verifier.entities import emulator, emulator_pool, job, selection
+from faaspact_verifier.exceptions import UnsupportedProviderStateError
+from faaspact_verifier.types import (
+    AlwaysFixture, EmulatorResult, Faasport, ProviderStateFixture
+)
 
 
 def use_verifier(context: Context,
@@ -12,38 +18,332 @@ def use_verifier(context: Context,
                  publish_results: bool,
                  failon: FrozenSet,
                  provider_version: str,
-                 always: Optional[Callable[[], ContextManager]] = None) -> bool:
-    pacts = context.pact_broker_gateway.fetch_provider_pacts(provider)
+                 always: Optional[AlwaysFixture] = None,
+                 options: VerifierOptions = VerifierOptions()) -> bool:
+    """Verify all of a provider's pacts against its faasport, as set by `options`.
 
-    emulator_results_list = [
-        emulator.emulate_pact_interactions(
-            pact,
+    With `workers` > 1, interactions are emulated across a pool of worker processes, each of which
+    imports `faasport_module` to get its own faasport and fixtures. If the faasport or any fixture
+    is async, up to `concurrency` interactions are emulated at once on each event loop. With
+    `group_provider_states`, interactions that share 'group' scoped provider states (see
+    `provider_state_scope_by_descriptor`) run inside a single setup of those fixtures. Provider
+    state params are checked against `provider_state_parameter_names_by_descriptor`, as recorded
+    by @provider_state, and against the parameters of fixtures missing from it.
+
+    `always_scope` sets whether the always fixture is entered around each 'interaction', each
+    'pact' or the whole 'session'. With `group_provider_states`, an 'interaction' scoped always
+    fixture is entered around each pact instead, so that it is still entered before the provider
+    states its interactions share.
+
+    Raises an UnsupportedProviderStateError before emulating anything if a pact tagged with one of
+    the `failon` tags requires a provider state that the provider doesn't support.
+
+    Each pact's results are announced to the notification gateway, interaction by interaction and
+    then as a whole. Without `stream`, pacts are only announced once every pact has been emulated
+    and verified, so nothing is announced until then, nor at all if the job is killed first. The
+    job is summarized once every pact has been announced and published.
+
+    With `stream`, each pact is emulated, verified, announced and published as soon as it has been
+    fetched, rather than every stage waiting on all pacts. Unsupported provider states are then
+    only caught once the offending pact arrives, and a pact whose pact_version was already verified
+    reuses those results instead of being emulated, published and announced again.
+
+    If the context has a verification ledger and a `fingerprint` of the provider's code is given,
+    pacts that already passed against that fingerprint aren't emulated or verified again. Their
+    recorded results are reused, with no emulator results, and still published.
+
+    With `dedupe_interactions`, interactions with identical requests and provider states are
+    emulated once, unless they use one of the `nondeterministic_provider_states`.
+
+    Only the pacts of `consumers` and the latest pacts for `tags` are fetched, when given. Only
+    interactions whose description matches the `interaction_description` regex and that use one of
+    `provider_states` are emulated, when given, and pacts with no such interaction are skipped.
+    Failing pacts still fail the job according to their own tags and `failon`. Results of pacts
+    narrowed down to some of their interactions can't be published, and aren't recorded in or
+    read from the verification ledger.
+    """
+    if options.workers > 1 and not options.faasport_module:
+        raise ValueError('A faasport_module is required to emulate with multiple workers.')
+
+    selects_interactions = (options.interaction_description is not None or
+                            bool(options.provider_states))
+    if selects_interactions:
+        if publish_results:
+            raise ValueError('Results of pacts narrowed down to some of their interactions can\'t '
+                             'be published.')
+        options = options._replace(fingerprint=None)
+
+    def select(pacts: Iterable[Pact]) -> Iterator[Pact]:
+        for pact in pacts:
+            selected_pact = selection.select_interactions(pact,
+                                                          options.interaction_description,
+                                                          options.provider_states)
+            if selected_pact:
+                yield selected_pact
+
+    # Closed however the job ends, so that reports written as pacts are announced are complete.
+    with contextlib.closing(context.notification_gateway):
+        if options.stream:
+            return _use_verifier_streaming(
+                context,
+                provider_state_fixture_by_descriptor,
+                faasport,
+                publish_results,
+                failon,
+                provider_version,
+                always,
+                options,
+                select(context.pact_broker_gateway.iter_provider_pacts(provider,
+                                                                       options.consumers,
+                                                                       options.tags))
+            )
+
+        return _use_verifier_batched(
+            context,
             provider_state_fixture_by_descriptor,
             faasport,
-            always
+            publish_results,
+            failon,
+            provider_version,
+            always,
+            options,
+            lambda: select(context.pact_broker_gateway.fetch_provider_pacts(provider,
+                                                                            options.consumers,
+                                                                            options.tags))
         )
-        for pact in pacts
-    ]
 
-    verification_results_list = [context.verifier.verify_pact(pact, emulator_results)
-                                 for pact, emulator_results in zip(pacts, emulator_results_list)]
+
+def announce_pact_results(context: Context,
+                          pact: Pact,
+                          emulator_results: List[EmulatorResult],
+                          verification_results: List[VerificationResult]) -> None:
+    """Announce each interaction's result and then the pact's results to the context's
+    notification gateway. Pacts whose results were reused from the ledger have no emulator
+    results.
+    """
+    for index, verification_result in enumerate(verification_results):
+        context.notification_gateway.announce_interaction_result(
+            pact,
+            index,
+            emulator_results[index] if emulator_results else None,
+            verification_result
+        )
+
+    context.notification_gateway.announce_pact_results(
+        pact,
+        emulator_results,
+        verification_results
+    )
+
+
+def _use_verifier_batched(context: Context,
+                          provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+                          faasport: Faasport,
+                          publish_results: bool,
+                          failon: FrozenSet,
+                          provider_version: str,
+                          always: Optional[AlwaysFixture],
+                          options: VerifierOptions,
+                          fetch_pacts: Callable[[], Iterable[Pact]]) -> bool:
+    with profiler.span('fetch', 'phase'):
+        pacts = list(fetch_pacts())
+
+    _check_provider_states(pacts, provider_state_fixture_by_descriptor, options, failon)
+
+    with profiler.span('load recorded results', 'phase'):
+        recorded_verification_results_list = [
+            _load_recorded_verification_results(context, pact, options.fingerprint)
+            for pact in pacts
+        ]
+    pacts_to_emulate = [pact for pact, recorded_verification_results
+                        in zip(pacts, recorded_verification_results_list)
+                        if recorded_verification_results is None]
+
+    with profiler.span('emulate', 'phase'):
+        if options.workers > 1:
+            emulated_results_list = emulator_pool.emulate_pacts_interactions(pacts_to_emulate,
+                                                                             options)
+        else:
+            emulated_results_list = emulator.emulate_pacts_interactions(
+                pacts_to_emulate,
+                provider_state_fixture_by_descriptor,
+                faasport,
+                always,
+                options
+            )
+
+    with profiler.span('verify', 'phase'):
+        verified_results_list = context.verifier.verify_pacts(pacts_to_emulate,
+                                                              emulated_results_list)
+
+    for pact, verification_results in zip(pacts_to_emulate, verified_results_list):
+        _record_verification_results(context, pact, options.fingerprint, verification_results)
+
+    emulated = iter(zip(emulated_results_list, verified_results_list))
+    emulator_results_list: List[List[EmulatorResult]] = []
+    verification_results_list: List[List[VerificationResult]] = []
+    for recorded_verification_results in recorded_verification_results_list:
+        if recorded_verification_results is None:
+            emulator_results, verification_results = next(emulated)
+        else:
+            emulator_results, verification_results = [], recorded_verification_results
+        emulator_results_list.append(emulator_results)
+        verification_results_list.append(verification_results)
+
+    with profiler.span('notify', 'phase'):
+        for pact, emulator_results, verification_results in zip(pacts,
+                                                                emulator_results_list,
+                                                                verification_results_list):
+            announce_pact_results(context, pact, emulator_results, verification_results)
 
     if publish_results:
-        for pact, verification_results in zip(pacts, verification_results_list):
-            context.pact_broker_gateway.provide_verification_results(
-                provider_version,
+        with profiler.span('publish', 'phase'):
+            _publish_verification_results(context,
+                                          provider_version,
+                                          pacts,
+                                          verification_results_list)
+
+    succeeded = job.succeeded(zip(pacts, verification_results_list), failon)
+
+    context.notification_gateway.announce_job_summary(
+        results_published=publish_results,
+        succeeded=succeeded
+    )
+
+    return succeeded
+
+
+def _use_verifier_streaming(context: Context,
+                            provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+                            faasport: Faasport,
+                            publish_results: bool,
+                            failon: FrozenSet,
+                            provider_version: str,
+                            always: Optional[AlwaysFixture],
+                            options: VerifierOptions,
+                            fetched_pacts: Iterator[Pact]) -> bool:
+    verification_results_by_pact_version: Dict[str, List[VerificationResult]] = {}
+    succeeded = True
+
+    def finish_pact(pact: Pact,
+                    emulator_results: List[EmulatorResult],
+                    verification_results: List[VerificationResult]) -> None:
+        nonlocal succeeded
+        verification_results_by_pact_version[pact.pact_version] = verification_results
+
+        announce_pact_results(context, pact, emulator_results, verification_results)
+
+        if publish_results:
+            _publish_verification_results(context, provider_version, [pact], [verification_results])
+
+        succeeded = job.succeeded([(pact, verification_results)], failon) and succeeded
+
+    def pacts_to_emulate() -> Iterator[Pact]:
+        nonlocal succeeded
+        for pact in fetched_pacts:
+            _check_provider_states([pact], provider_state_fixture_by_descriptor, options, failon)
+            if pact.pact_version in verification_results_by_pact_version:
+                verification_results = verification_results_by_pact_version[pact.pact_version]
+                succeeded = job.succeeded([(pact, verification_results)], failon) and succeeded
+                continue
+            recorded_verification_results = _load_recorded_verification_results(
+                context,
                 pact,
-                verification_results
+                options.fingerprint
             )
+            if recorded_verification_results is not None:
+                finish_pact(pact, [], recorded_verification_results)
+                continue
+            yield pact
 
-    succeeded = job.succeeded(zip(pacts, verification_results_list), failon)
+    if options.workers > 1:
+        emulated_pacts = emulator_pool.iter_emulate_pacts_interactions(pacts_to_emulate(), options)
+    else:
+        emulated_pacts = emulator.iter_emulate_pacts_interactions(
+            pacts_to_emulate(),
+            provider_state_fixture_by_descriptor,
+            faasport,
+            always,
+            options
+        )
+
+    with profiler.span('stream', 'phase'):
+        for pact, emulator_results in emulated_pacts:
+            with profiler.span('verify', 'pact', consumer=pact.consumer_name):
+                verification_results = context.verifier.verify_pact(pact, emulator_results)
+            _record_verification_results(context, pact, options.fingerprint, verification_results)
+            finish_pact(pact, emulator_results, verification_results)
 
-    context.notification_gateway.announce_job_results(
-        pacts=pacts,
-        emulator_results_list=emulator_results_list,
-        verification_results_list=verification_results_list,
+    context.notification_gateway.announce_job_summary(
         results_published=publish_results,
         succeeded=succeeded
     )
 
     return succeeded
+
+
+def _load_recorded_verification_results(context: Context,
+                                        pact: Pact,
+                                        fingerprint: Optional[str]
+                                        ) -> Optional[List[VerificationResult]]:
+    if not (context.verification_ledger and fingerprint):
+        return None
+
+    return context.verification_ledger.load(pact.pact_version, fingerprint)
+
+
+def _record_verification_results(context: Context,
+                                 pact: Pact,
+                                 fingerprint: Optional[str],
+                                 verification_results: List[VerificationResult]) -> None:
+    """Record a pact's results in the ledger if it passed, so that it is skipped until the
+    provider's code changes. Failed pacts are verified again on every run."""
+    if not (context.verification_ledger and fingerprint):
+        return
+
+    if all(verification_result.verified for verification_result in verification_results):
+        context.verification_ledger.record(pact.pact_version, fingerprint, verification_results)
+
+
+def _publish_verification_results(
+        context: Context,
+        provider_version: str,
+        pacts: List[Pact],
+        verification_results_list: List[List[VerificationResult]]
+) -> None:
+    """Publish verification results, announcing the pacts that failed to publish rather than
+    raising.
+    """
+    errors = context.pact_broker_gateway.provide_pacts_verification_results(
+        provider_version,
+        pacts,
+        verification_results_list
+    )
+    for pact, error in zip(pacts, errors):
+        if error:
+            context.notification_gateway.announce_publish_failure(pact, error)
+
+
+def _check_provider_states(pacts: List[Pact],
+                           provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture],
+                           options: VerifierOptions,
+                           failon: FrozenSet) -> None:
+    """Raise an UnsupportedProviderStateError before emulating anything if a pact that the job
+    fails on has an interaction with provider states that the provider doesn't support.
+    """
+    unsupported_provider_states = [
+        (pact, index, reason)
+        for pact, index, reason in emulator.find_unsupported_provider_states(
+            pacts,
+            provider_state_fixture_by_descriptor,
+            options.provider_state_parameter_names_by_descriptor
+        )
+        if job.fails_on(pact, failon)
+    ]
+    if unsupported_provider_states:
+        raise UnsupportedProviderStateError('\n'.join(
+            f'Interaction {pact.interaction_index(index)} of pact with consumer '
+            f'"{pact.consumer_name}" '
+            f'(tags: {set(pact.tags)}): {reason}'
+            for pact, index, reason in unsupported_provider_states
+        ))
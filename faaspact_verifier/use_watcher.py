@@ -0,0 +1,139 @@
+import contextlib
+import time
+import traceback
+from typing import FrozenSet, List, NoReturn, Optional, Tuple
+
+from faaspact_verifier.context import Context
+from faaspact_verifier.definitions import Pact, VerificationResult, VerifierOptions
+from faaspact_verifier.entities import emulator, job, selection
+from faaspact_verifier.entities.impact import CodeChange, CodeKey, CodeTracer
+from faaspact_verifier.types import EmulatorResult
+from faaspact_verifier.use_verifier import announce_pact_results
+from faaspact_verifier.user_defined.reloader import FaasportReloader
+
+
+def use_watcher(context: Context,
+                provider: str,
+                faasport_module: str,
+                failon: FrozenSet,
+                consumers: FrozenSet[str] = frozenset(),
+                tags: FrozenSet[str] = frozenset(),
+                interaction_description: Optional[str] = None,
+                provider_states: FrozenSet[str] = frozenset(),
+                poll_interval: float = 0.25) -> NoReturn:
+    """Verify a provider's pacts against its faasport, and again each time its source changes,
+    until interrupted.
+
+    Pacts are fetched once and kept in memory, and `faasport_module` stays imported. Its top level
+    package's source files are polled every `poll_interval` seconds. Changed modules, and the
+    modules that import them, are reloaded, and only the interactions that the changes could
+    affect are emulated and verified again (see `Watcher`). Each pact with re-verified
+    interactions is announced as soon as it is verified, followed by a summary of every pact's
+    latest results. Results are never published or recorded in the verification ledger.
+
+    Each interaction is emulated on its own so that the code it runs can be traced, so fixtures
+    and the always fixture are entered around every interaction whatever their scope.
+    """
+    reloader = FaasportReloader(faasport_module)
+    pacts: List[Pact] = []
+    for pact in context.pact_broker_gateway.fetch_provider_pacts(provider, consumers, tags):
+        selected_pact = selection.select_interactions(pact,
+                                                      interaction_description,
+                                                      provider_states)
+        if selected_pact:
+            pacts.append(selected_pact)
+    watcher = Watcher(context, reloader, pacts, failon)
+
+    # Closed on interruption, so that reports written as pacts are announced are complete.
+    with contextlib.closing(context.notification_gateway):
+        watcher.verify(frozenset(), None)
+        while True:
+            time.sleep(poll_interval)
+            changed_paths = reloader.poll()
+            if not changed_paths:
+                continue
+
+            try:
+                reload = reloader.reload(changed_paths)
+            except Exception:
+                context.notification_gateway.announce_reload_failure(traceback.format_exc())
+                continue
+            watcher.verify(reload.changed_paths, reload.code_change)
+
+
+class Watcher:
+    """Holds the latest results of every interaction of `pacts`, and the provider code that each
+    interaction ran when it was last emulated."""
+
+    def __init__(self,
+                 context: Context,
+                 reloader: FaasportReloader,
+                 pacts: List[Pact],
+                 failon: FrozenSet) -> None:
+        self.context = context
+        self.reloader = reloader
+        self.pacts = pacts
+        self.failon = failon
+        self.emulator_results_list: List[List[Optional[EmulatorResult]]] = [
+            [None] * len(pact.interactions) for pact in pacts
+        ]
+        self.verification_results_list: List[List[VerificationResult]] = [[] for _ in pacts]
+        self.code_keys_list: List[List[FrozenSet[CodeKey]]] = [
+            [frozenset()] * len(pact.interactions) for pact in pacts
+        ]
+
+    def affected_interactions(self, code_change: Optional[CodeChange]) -> List[Tuple[int, int]]:
+        """The (pact index, interaction index) of each interaction that `code_change` could
+        affect, or of every interaction if there is no change to judge by. Interactions that
+        haven't been emulated yet are always affected."""
+        return [(pact_index, index)
+                for pact_index, code_keys_by_index in enumerate(self.code_keys_list)
+                for index, code_keys in enumerate(code_keys_by_index)
+                if (code_change is None or
+                    self.emulator_results_list[pact_index][index] is None or
+                    code_change.affects(code_keys))]
+
+    def verify(self, changed_paths: FrozenSet[str], code_change: Optional[CodeChange]) -> bool:
+        """Emulate and verify again the interactions that `code_change` could affect, announcing
+        each pact they belong to. Returns whether the job succeeds with every pact's latest
+        results."""
+        affected = self.affected_interactions(code_change)
+        self.context.notification_gateway.announce_watch_cycle(
+            changed_paths,
+            len(affected),
+            sum(len(pact.interactions) for pact in self.pacts)
+        )
+
+        faasport_module = self.reloader.faasport_module
+        for pact_index, pact in enumerate(self.pacts):
+            indexes = [index for affected_pact_index, index in affected
+                       if affected_pact_index == pact_index]
+            if not indexes:
+                continue
+
+            for index in indexes:
+                with CodeTracer(self.reloader.source_paths) as tracer:
+                    [emulator_result] = emulator.emulate_interactions(
+                        [pact.interactions[index]],
+                        faasport_module.provider_state_fixture_by_descriptor,
+                        faasport_module.faasport,
+                        faasport_module.always,
+                        VerifierOptions(provider_state_parameter_names_by_descriptor=(
+                            faasport_module.provider_state_parameter_names_by_descriptor
+                        ))
+                    )
+                self.emulator_results_list[pact_index][index] = emulator_result
+                self.code_keys_list[pact_index][index] = tracer.code_keys
+
+            emulator_results = [emulator_result for emulator_result
+                                in self.emulator_results_list[pact_index]
+                                if emulator_result is not None]
+            verification_results = self.context.verifier.verify_pact(pact, emulator_results)
+            self.verification_results_list[pact_index] = verification_results
+
+            announce_pact_results(self.context, pact, emulator_results, verification_results)
+
+        succeeded = job.succeeded(zip(self.pacts, self.verification_results_list), self.failon)
+        self.context.notification_gateway.announce_job_summary(results_published=False,
+                                                               succeeded=succeeded)
+        return succeeded
@@ -1,21 +1,58 @@
-from contextlib import contextmanager
-from typing import Callable, Generator, Optional
+from typing import AsyncGenerator, Callable, Generator, Optional, Union, overload
 
 from faaspact_verifier.types import AlwaysFixture
+from faaspact_verifier.user_defined.context_managers import as_context_manager
 
 
+UserAlwaysFixture = Callable[[], Union[Generator, AsyncGenerator]]
+
+SCOPES = ('interaction', 'pact', 'session')
+
 user_always: Optional[AlwaysFixture] = None
+user_always_scope: str = 'interaction'
+user_always_deterministic: bool = True
+
+
+@overload
+def always(func: UserAlwaysFixture) -> AlwaysFixture:
+    ...
+
 
+@overload
+def always(*,
+           scope: str = ...,
+           deterministic: bool = ...) -> Callable[[UserAlwaysFixture], AlwaysFixture]:
+    ...
 
-def always(func: Callable[[], Generator]) -> AlwaysFixture:
+
+def always(func: Optional[UserAlwaysFixture] = None,
+           *,
+           scope: str = 'interaction',
+           deterministic: bool = True
+           ) -> Union[AlwaysFixture, Callable[[UserAlwaysFixture], AlwaysFixture]]:
     """Decorator that registers an 'always' fixture, which is always run before all provider
-    state fixtures and faasport call.
+    state fixtures and faasport call. The fixture may be a generator or an async generator.
+
+    Used as `@always`, the fixture is entered around every interaction. Used as
+    `@always(scope='pact')` or `@always(scope='session')`, it is entered once around each pact's
+    interactions or once around the whole run. With `deterministic=False`, identical interactions
+    are never deduplicated.
     """
-    global user_always
+    if scope not in SCOPES:
+        raise RuntimeError(f'Unknown always scope {scope}. Expected one of {SCOPES}.')
+
+    def always_collector(func: UserAlwaysFixture) -> AlwaysFixture:
+        global user_always, user_always_scope, user_always_deterministic
+
+        if user_always is not None:
+            raise RuntimeError('Multiple definitions of @always fixture.')
 
-    if user_always is not None:
-        raise RuntimeError('Multiple definitions of @always fixture.')
+        fixture = as_context_manager(func)
+        user_always = fixture
+        user_always_scope = scope
+        user_always_deterministic = deterministic
+        return fixture
 
-    as_context_manager = contextmanager(func)
-    user_always = as_context_manager
-    return as_context_manager
+    if func is None:
+        return always_collector
+    return always_collector(func)
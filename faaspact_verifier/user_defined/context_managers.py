@@ -0,0 +1,14 @@
+import inspect
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncContextManager, Callable, ContextManager, Union
+
+
+def as_context_manager(
+        func: Callable
+) -> Callable[..., Union[ContextManager, AsyncContextManager]]:
+    """Turn a user's generator function into a context manager, or an async generator function
+    into an async context manager.
+    """
+    if inspect.isasyncgenfunction(func):
+        return asynccontextmanager(func)
+    return contextmanager(func)
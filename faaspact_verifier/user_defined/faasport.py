@@ -1,17 +1,40 @@
-from typing import Optional
+from typing import Callable, Optional, Union, overload
 
 from faaspact_verifier.types import Faasport
 
 
 user_faasport: Optional[Faasport] = None
+user_faasport_deterministic: bool = True
 
 
+@overload
 def faasport(func: Faasport) -> Faasport:
-    """Decorator that registers the user's faasport function."""
-    global user_faasport
+    ...
 
-    if user_faasport is not None:
-        raise RuntimeError('Multiple definitions of faasport.')
 
-    user_faasport = func
-    return func
+@overload
+def faasport(*, deterministic: bool) -> Callable[[Faasport], Faasport]:
+    ...
+
+
+def faasport(func: Optional[Faasport] = None,
+             *,
+             deterministic: bool = True) -> Union[Faasport, Callable[[Faasport], Faasport]]:
+    """Decorator that registers the user's faasport function, which may be a coroutine function.
+
+    Use `@faasport(deterministic=False)` if the faasport may respond differently to the same
+    request, so that identical interactions are never deduplicated.
+    """
+    def faasport_collector(func: Faasport) -> Faasport:
+        global user_faasport, user_faasport_deterministic
+
+        if user_faasport is not None:
+            raise RuntimeError('Multiple definitions of faasport.')
+
+        user_faasport = func
+        user_faasport_deterministic = deterministic
+        return func
+
+    if func is None:
+        return faasport_collector
+    return faasport_collector(func)
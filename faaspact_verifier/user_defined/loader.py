@@ -0,0 +1,144 @@
+import functools
+import hashlib
+import importlib
+import os
+import site
+import sys
+import sysconfig
+from types import ModuleType
+from typing import Dict, FrozenSet, Iterator, NamedTuple, Optional, Tuple
+
+from faaspact_verifier.types import AlwaysFixture, Faasport, ProviderStateFixture
+
+
+class FaasportModule(NamedTuple):
+    faasport: Faasport
+    provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture]
+    always: Optional[AlwaysFixture] = None
+    provider_state_scope_by_descriptor: Dict[str, str] = {}
+    always_scope: str = 'interaction'
+    deterministic: bool = True
+    nondeterministic_provider_states: FrozenSet[str] = frozenset()
+    provider_state_parameter_names_by_descriptor: Dict[str, FrozenSet[str]] = {}
+
+
+def load_faasport_module(module_name: str) -> FaasportModule:
+    """Import the user's faasport module and collect everything it registered with the
+    @faasport, @provider_state and @always decorators.
+    """
+    module = importlib.import_module(module_name)
+    faasport_globals = module.faasport.__globals__  # type: ignore
+    user_faasport = faasport_globals['user_faasport']
+    user_faasport_deterministic = faasport_globals['user_faasport_deterministic']
+    user_provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture] = {}
+    user_provider_state_scope_by_descriptor: Dict[str, str] = {}
+    user_provider_state_deterministic_by_descriptor: Dict[str, bool] = {}
+    user_provider_state_parameter_names_by_descriptor: Dict[str, FrozenSet[str]] = {}
+    if hasattr(module, 'provider_state'):
+        provider_state_globals = module.provider_state.__globals__  # type: ignore
+        user_provider_state_fixture_by_descriptor = (
+            provider_state_globals['user_provider_state_fixture_by_descriptor']
+        )
+        user_provider_state_scope_by_descriptor = (
+            provider_state_globals['user_provider_state_scope_by_descriptor']
+        )
+        user_provider_state_deterministic_by_descriptor = (
+            provider_state_globals['user_provider_state_deterministic_by_descriptor']
+        )
+        user_provider_state_parameter_names_by_descriptor = (
+            provider_state_globals['user_provider_state_parameter_names_by_descriptor']
+        )
+    user_always: Optional[AlwaysFixture] = None
+    user_always_scope = 'interaction'
+    user_always_deterministic = True
+    if hasattr(module, 'always'):
+        always_globals = module.always.__globals__  # type: ignore
+        user_always = always_globals['user_always']
+        user_always_scope = always_globals['user_always_scope']
+        user_always_deterministic = always_globals['user_always_deterministic']
+
+    return FaasportModule(
+        faasport=user_faasport,
+        provider_state_fixture_by_descriptor=user_provider_state_fixture_by_descriptor,
+        always=user_always,
+        provider_state_scope_by_descriptor=user_provider_state_scope_by_descriptor,
+        always_scope=user_always_scope,
+        deterministic=user_faasport_deterministic and user_always_deterministic,
+        nondeterministic_provider_states=frozenset(
+            descriptor
+            for descriptor, deterministic in user_provider_state_deterministic_by_descriptor.items()
+            if not deterministic
+        ),
+        provider_state_parameter_names_by_descriptor=(
+            user_provider_state_parameter_names_by_descriptor
+        )
+    )
+
+
+def fingerprint_faasport_module(module_name: str, verifier: str) -> str:
+    """Hash the source of the provider's code, along with the name of the `verifier` that checks
+    its responses and the version of faaspact-verifier, as a fingerprint of everything a pact's
+    verification depends on.
+
+    The provider's code is the source of the faasport module's top level package, or of the
+    module alone if it isn't part of a package, and of every other project module imported so
+    far: any module loaded from outside the standard library, site-packages and faaspact-verifier
+    itself. Modules that the faasport only imports once it handles a request aren't included
+    unless they are in its package.
+    """
+    from faaspact_verifier import __version__
+
+    importlib.import_module(module_name)
+    top_level_module = importlib.import_module(module_name.split('.')[0])
+    module_path = top_level_module.__file__
+    assert module_path, f'Module {module_name} has no source file to fingerprint'
+
+    name_by_path: Dict[str, str] = {}
+    if os.path.basename(module_path) == '__init__.py':
+        root = os.path.dirname(module_path)
+        for source_path in _walk_python_sources(root):
+            name = f'{top_level_module.__name__}/{os.path.relpath(source_path, root)}'
+            name_by_path[os.path.abspath(source_path)] = name
+    for module in list(sys.modules.values()):
+        project_path = _project_source_path(module)
+        if project_path:
+            name_by_path.setdefault(project_path, module.__name__)
+
+    digest = hashlib.sha256()
+    digest.update(f'faaspact-verifier {__version__}\0verifier {verifier}\0'.encode())
+    for source_path, name in sorted(name_by_path.items(), key=lambda item: item[1]):
+        digest.update(name.encode())
+        with open(source_path, 'rb') as source:
+            digest.update(hashlib.sha256(source.read()).digest())
+    return digest.hexdigest()
+
+
+def _project_source_path(module: ModuleType) -> Optional[str]:
+    """The source file of a module if it belongs to the project rather than to the standard
+    library, an installed package or faaspact-verifier."""
+    source_path: Optional[str] = getattr(module, '__file__', None)
+    if not source_path or not source_path.endswith('.py'):
+        return None
+    source_path = os.path.abspath(source_path)
+    if source_path.startswith(_non_project_directories()):
+        return None
+    return source_path
+
+
+@functools.lru_cache(maxsize=1)
+def _non_project_directories() -> Tuple[str, ...]:
+    paths = sysconfig.get_paths()
+    directories = {paths[name] for name in ('stdlib', 'platstdlib', 'purelib', 'platlib')}
+    directories.update(site.getsitepackages() if hasattr(site, 'getsitepackages') else [])
+    directories.add(site.getusersitepackages())
+    directories.add(os.path.dirname(os.path.dirname(__file__)))
+    return tuple(os.path.join(os.path.abspath(directory), '') for directory in directories)
+
+
+def _walk_python_sources(root: str) -> Iterator[str]:
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories[:] = [subdirectory for subdirectory in subdirectories
+                             if not subdirectory.startswith(('.', '__pycache__'))]
+        for filename in filenames:
+            if filename.endswith('.py'):
+                yield os.path.join(directory, filename)
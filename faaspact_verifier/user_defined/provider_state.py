@@ -1,21 +1,51 @@
-from contextlib import contextmanager
-from typing import Callable, Dict
+import inspect
+from typing import Callable, Dict, FrozenSet
 
 from faaspact_verifier.types import ProviderStateFixture, UserProviderStateFixture
+from faaspact_verifier.user_defined.context_managers import as_context_manager
 
 
-user_provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture] = {}
-
+SCOPES = ('interaction', 'group')
 
-def provider_state(descriptor: str) -> Callable[[UserProviderStateFixture], ProviderStateFixture]:
+user_provider_state_fixture_by_descriptor: Dict[str, ProviderStateFixture] = {}
+user_provider_state_scope_by_descriptor: Dict[str, str] = {}
+user_provider_state_deterministic_by_descriptor: Dict[str, bool] = {}
+user_provider_state_parameter_names_by_descriptor: Dict[str, FrozenSet[str]] = {}
+
+
+def provider_state(
+        descriptor: str,
+        scope: str = 'interaction',
+        deterministic: bool = True
+) -> Callable[[UserProviderStateFixture], ProviderStateFixture]:
+    """Decorator that registers a provider state fixture for a provider state descriptor. The
+    fixture may be a generator or an async generator.
+
+    By default a fixture is set up around every interaction. A fixture with scope 'group' declares
+    that it is safe to share, so when provider states are grouped it is set up once for all
+    interactions that share it with the same params.
+
+    A fixture with `deterministic=False` sets up state that may differ between runs, so
+    interactions that use it are never deduplicated.
+    """
     global user_provider_state_fixture_by_descriptor
 
+    if scope not in SCOPES:
+        raise RuntimeError(f'Unknown provider_state scope {scope}. Expected one of {SCOPES}.')
+
     def provider_state_collector(func: UserProviderStateFixture) -> ProviderStateFixture:
         if descriptor in user_provider_state_fixture_by_descriptor:
             raise RuntimeError(f'A provider_state fixture for {descriptor} is already defined.')
 
-        as_context_manager = contextmanager(func)
-        user_provider_state_fixture_by_descriptor[descriptor] = as_context_manager
-        return as_context_manager
+        signature = inspect.signature(func)
+        fixture = as_context_manager(func)
+        fixture.__signature__ = signature  # type: ignore
+        user_provider_state_fixture_by_descriptor[descriptor] = fixture
+        user_provider_state_scope_by_descriptor[descriptor] = scope
+        user_provider_state_deterministic_by_descriptor[descriptor] = deterministic
+        user_provider_state_parameter_names_by_descriptor[descriptor] = frozenset(
+            signature.parameters
+        )
+        return fixture
 
     return provider_state_collector
@@ -0,0 +1,286 @@
+import ast
+import importlib
+import importlib.util
+import os
+import sys
+from types import ModuleType
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from faaspact_verifier.entities.impact import (
+    CodeChange,
+    CodeTracer,
+    SourceFingerprint,
+    diff_fingerprints,
+    fingerprint_source
+)
+from faaspact_verifier.user_defined.loader import (
+    FaasportModule,
+    _walk_python_sources,
+    load_faasport_module
+)
+
+
+REGISTRY_NAMES_BY_MODULE = {
+    'faaspact_verifier.user_defined.faasport': ('user_faasport', 'user_faasport_deterministic'),
+    'faaspact_verifier.user_defined.provider_state': (
+        'user_provider_state_fixture_by_descriptor',
+        'user_provider_state_scope_by_descriptor',
+        'user_provider_state_deterministic_by_descriptor',
+        'user_provider_state_parameter_names_by_descriptor'
+    ),
+    'faaspact_verifier.user_defined.always': (
+        'user_always',
+        'user_always_scope',
+        'user_always_deterministic'
+    )
+}
+
+_Stat = Tuple[int, int]
+
+
+class Reload(NamedTuple):
+    faasport_module: FaasportModule
+    changed_paths: FrozenSet[str]
+    reloaded_modules: Tuple[str, ...]
+    code_change: CodeChange
+
+
+class FaasportReloader:
+    """Keeps a faasport module imported and reloads it as its source changes.
+
+    The source files of the faasport module's top level package, or the faasport module alone if
+    it isn't part of a package, are watched by polling their modification times. When some change,
+    the modules they define are reloaded, along with every module of the package that imports them
+    directly or indirectly so that none keep calling stale code. Whatever the reloaded modules
+    registered with @faasport, @provider_state and @always is unregistered first, so that they can
+    register it again.
+
+    Changed functions that run while the modules are reloaded, such as a helper that sets a
+    module's constants, count as structural changes like the rest of a module's top level code.
+    """
+
+    def __init__(self, module_name: str) -> None:
+        self.module_name = module_name
+        self.faasport_module = load_faasport_module(module_name)
+
+        top_level_module = importlib.import_module(module_name.split('.')[0])
+        self._package_name = top_level_module.__name__
+        self._top_level_path = os.path.abspath(top_level_module.__file__ or '')
+
+        self._stats = self._stat_sources()
+        self._fingerprints = {path: _fingerprint_file(path) for path in self._stats}
+        self._pending_paths: Set[str] = set()
+
+    @property
+    def source_paths(self) -> FrozenSet[str]:
+        return frozenset(self._stats)
+
+    def poll(self) -> FrozenSet[str]:
+        """The source files added, removed or modified since the last poll, along with any that
+        failed to reload last time."""
+        stats = self._stat_sources()
+        changed_paths = {path for path in stats.keys() | self._stats.keys()
+                         if stats.get(path) != self._stats.get(path)}
+        self._stats = stats
+        return frozenset(changed_paths | self._pending_paths)
+
+    def reload(self, changed_paths: FrozenSet[str]) -> Reload:
+        """Reload the modules defined by `changed_paths` and the modules that import them, and
+        collect the faasport module's registrations again.
+
+        If a module fails to compile or import, the registrations from before the reload are
+        restored and the error is raised. The paths are then retried by the next reload.
+        """
+        self._pending_paths |= changed_paths
+        fingerprints = {path: _fingerprint_file(path) for path in self._pending_paths}
+
+        modules_by_path = self._imported_modules_by_path()
+        reloaded_modules = _with_importers(
+            {modules_by_path[path].__name__ for path in self._pending_paths
+             if path in modules_by_path},
+            modules_by_path.values(),
+            self._package_name
+        )
+
+        code_change = CodeChange()
+        for path in self._pending_paths:
+            if path in modules_by_path:
+                code_change |= diff_fingerprints(path,
+                                                 self._fingerprints.get(path),
+                                                 fingerprints[path])
+
+        snapshot = _snapshot_registries()
+        try:
+            for path in self._pending_paths:
+                if path in modules_by_path and os.path.exists(path):
+                    with open(path, 'rb') as source:
+                        compile(source.read(), path, 'exec')
+            _unregister(frozenset(reloaded_modules))
+            with CodeTracer(self.source_paths | self._pending_paths) as import_tracer:
+                for module_name in reloaded_modules:
+                    module = sys.modules[module_name]
+                    if os.path.exists(module.__file__ or ''):
+                        importlib.reload(module)
+                    else:
+                        # Its source is gone: forget it, so that modules still importing it fail
+                        # loudly.
+                        del sys.modules[module_name]
+                faasport_module = load_faasport_module(self.module_name)
+        except BaseException:
+            _restore_registries(snapshot)
+            raise
+
+        if not code_change.code_keys.isdisjoint(import_tracer.code_keys):
+            code_change = code_change._replace(structural=True)
+
+        self._fingerprints.update(fingerprints)
+        self.faasport_module = faasport_module
+        reloaded_paths = frozenset(self._pending_paths)
+        self._pending_paths.clear()
+        return Reload(faasport_module=faasport_module,
+                      changed_paths=reloaded_paths,
+                      reloaded_modules=reloaded_modules,
+                      code_change=code_change)
+
+    def _stat_sources(self) -> Dict[str, _Stat]:
+        if os.path.basename(self._top_level_path) == '__init__.py':
+            paths: Iterable[str] = _walk_python_sources(os.path.dirname(self._top_level_path))
+        else:
+            paths = [self._top_level_path]
+        stats: Dict[str, _Stat] = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stats[path] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def _imported_modules_by_path(self) -> Dict[str, ModuleType]:
+        """The watched modules that have been imported, by source file."""
+        watched_paths = self._stats.keys() | self._pending_paths
+        modules_by_path: Dict[str, ModuleType] = {}
+        for module in list(sys.modules.values()):
+            module_path = getattr(module, '__file__', None)
+            if module_path and os.path.abspath(module_path) in watched_paths:
+                modules_by_path[os.path.abspath(module_path)] = module
+        return modules_by_path
+
+
+def _fingerprint_file(path: str) -> Optional[SourceFingerprint]:
+    try:
+        with open(path, 'rb') as source:
+            return fingerprint_source(source.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+def _with_importers(module_names: Set[str],
+                    modules: Iterable[ModuleType],
+                    package_name: str) -> Tuple[str, ...]:
+    """`module_names` and every module among `modules` that imports one of them, directly or
+    indirectly, ordered so that modules come before the modules that import them."""
+    imports_by_module = {module.__name__: _imported_names(module, package_name)
+                         for module in modules}
+
+    to_reload = set(module_names)
+    grew = True
+    while grew:
+        importers = {name for name, imports in imports_by_module.items()
+                     if not imports.isdisjoint(to_reload)}
+        grew = not importers <= to_reload
+        to_reload |= importers
+
+    ordered: List[str] = []
+    visiting: Set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in ordered or name in visiting:
+            return
+        visiting.add(name)
+        for imported in sorted(imports_by_module.get(name, frozenset()) & to_reload):
+            visit(imported)
+        ordered.append(name)
+
+    for name in sorted(to_reload):
+        visit(name)
+    return tuple(ordered)
+
+
+def _imported_names(module: ModuleType, package_name: str) -> FrozenSet[str]:
+    """The modules of the package that `module`'s source imports, read from its syntax tree."""
+    try:
+        with open(module.__file__ or '', 'rb') as source:
+            tree = ast.parse(source.read())
+    except (OSError, SyntaxError, ValueError):
+        return frozenset()
+
+    package = module.__package__ or ''
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            try:
+                base = importlib.util.resolve_name('.' * node.level + (node.module or ''),
+                                                   package)
+            except (ImportError, ValueError):
+                continue
+            names.add(base)
+            names.update(f'{base}.{alias.name}' for alias in node.names)
+    return frozenset(name for name in names
+                     if name == package_name or name.startswith(f'{package_name}.'))
+
+
+def _registries() -> List[Tuple[ModuleType, Tuple[str, ...]]]:
+    return [(importlib.import_module(module_name), names)
+            for module_name, names in REGISTRY_NAMES_BY_MODULE.items()]
+
+
+def _snapshot_registries() -> Dict[Tuple[str, str], Any]:
+    return {(registry.__name__, name): _copy(getattr(registry, name))
+            for registry, names in _registries()
+            for name in names}
+
+
+def _restore_registries(snapshot: Dict[Tuple[str, str], Any]) -> None:
+    for registry, names in _registries():
+        for name in names:
+            value = snapshot[(registry.__name__, name)]
+            current = getattr(registry, name)
+            if isinstance(current, dict):
+                # Emptied and refilled in place, since the loader hands out these very dicts.
+                current.clear()
+                current.update(value)
+            else:
+                setattr(registry, name, value)
+
+
+def _unregister(module_names: FrozenSet[str]) -> None:
+    """Forget whatever the modules registered with @faasport, @provider_state and @always."""
+    faasport_registry = sys.modules['faaspact_verifier.user_defined.faasport']
+    if _registered_by(faasport_registry.user_faasport, module_names):
+        setattr(faasport_registry, 'user_faasport', None)
+        setattr(faasport_registry, 'user_faasport_deterministic', True)
+
+    provider_state_registry = sys.modules['faaspact_verifier.user_defined.provider_state']
+    registry_dicts = [getattr(provider_state_registry, name)
+                      for name in REGISTRY_NAMES_BY_MODULE[provider_state_registry.__name__]]
+    for descriptor, fixture in list(registry_dicts[0].items()):
+        if _registered_by(fixture, module_names):
+            for registry_dict in registry_dicts:
+                registry_dict.pop(descriptor, None)
+
+    always_registry = sys.modules['faaspact_verifier.user_defined.always']
+    if _registered_by(always_registry.user_always, module_names):
+        setattr(always_registry, 'user_always', None)
+        setattr(always_registry, 'user_always_scope', 'interaction')
+        setattr(always_registry, 'user_always_deterministic', True)
+
+
+def _registered_by(func: Any, module_names: FrozenSet[str]) -> bool:
+    return func is not None and getattr(func, '__module__', None) in module_names
+
+
+def _copy(value: Any) -> Any:
+    return dict(value) if isinstance(value, dict) else value
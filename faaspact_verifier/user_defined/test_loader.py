@@ -0,0 +1,46 @@
+import sys
+import textwrap
+from typing import Any, Generator
+
+import pytest
+
+from faaspact_verifier.user_defined.loader import fingerprint_faasport_module
+
+
+@pytest.fixture  # type: ignore
+def faasport_module(tmp_path: Any) -> Generator[Any, None, None]:
+    (tmp_path / 'fingerprinted_faasport.py').write_text(textwrap.dedent('''
+        from fingerprinted_handlers import handle
+
+        def port(request):
+            return handle(request)
+    '''))
+    (tmp_path / 'fingerprinted_handlers.py').write_text(textwrap.dedent('''
+        def handle(request):
+            return 200
+    '''))
+    sys.path.insert(0, str(tmp_path))
+    yield tmp_path
+    sys.path.remove(str(tmp_path))
+    for module_name in ('fingerprinted_faasport', 'fingerprinted_handlers'):
+        sys.modules.pop(module_name, None)
+
+
+class TestFingerprintFaasportModule:
+
+    def test_changes_with_the_modules_a_lone_faasport_module_imports(self,
+                                                                     faasport_module: Any) -> None:
+        # Given
+        fingerprint = fingerprint_faasport_module('fingerprinted_faasport', 'pactman')
+
+        # When
+        handlers = faasport_module / 'fingerprinted_handlers.py'
+        handlers.write_text(handlers.read_text().replace('200', '500'))
+        edited_fingerprint = fingerprint_faasport_module('fingerprinted_faasport', 'pactman')
+
+        # Then
+        assert edited_fingerprint != fingerprint
+
+    def test_changes_with_the_verifier(self, faasport_module: Any) -> None:
+        assert (fingerprint_faasport_module('fingerprinted_faasport', 'pactman') !=
+                fingerprint_faasport_module('fingerprinted_faasport', 'native'))
@@ -0,0 +1,113 @@
+import os
+import textwrap
+from typing import Any
+
+import pytest
+
+from faaspact_verifier.definitions import Request, Response
+from faaspact_verifier.user_defined.reloader import FaasportReloader
+
+
+IMPORT_TIME_HANDLERS_SOURCE = textwrap.dedent('''
+    from faaspact_verifier.definitions import Response
+
+    def _load_egg():
+        return 'hümpty'
+
+    EGG = _load_egg()
+
+    def get_egg(request):
+        return Response(headers={}, status=200, body={'egg': EGG})
+
+    def get_user(request):
+        return Response(headers={}, status=200, body={'user': 'gabe'})
+''')
+
+
+class TestFaasportReloader:
+
+    def test_reloads_changed_modules_and_their_importers(self, watched_provider: Any) -> None:
+        # Given
+        reloader = FaasportReloader('watched_provider.faasport')
+        _edit(watched_provider / 'handlers.py', "'hümpty'", "'dümpty'")
+
+        # When
+        changed_paths = reloader.poll()
+        reload = reloader.reload(changed_paths)
+
+        # Then
+        handlers_path = str(watched_provider / 'handlers.py')
+        assert changed_paths == {handlers_path}
+        assert reload.reloaded_modules == ('watched_provider.handlers', 'watched_provider.faasport')
+        assert reload.code_change.code_keys == {(handlers_path, 'get_egg')}
+        assert not reload.code_change.structural
+        assert reload.faasport_module.faasport(Request({}, '/egg', 'GET')) == Response(
+            headers={}, status=200, body={'egg': 'dümpty'}
+        )
+        assert list(reload.faasport_module.provider_state_fixture_by_descriptor) == [
+            'there is an egg'
+        ]
+        assert reloader.poll() == frozenset()
+
+    def test_flags_changed_registrations_as_structural(self, watched_provider: Any) -> None:
+        # Given
+        reloader = FaasportReloader('watched_provider.faasport')
+        _edit(watched_provider / 'faasport.py', "'there is an egg'", "'there are eggs'")
+
+        # When
+        reload = reloader.reload(reloader.poll())
+
+        # Then
+        assert reload.reloaded_modules == ('watched_provider.faasport',)
+        assert reload.code_change.structural
+        assert list(reload.faasport_module.provider_state_fixture_by_descriptor) == [
+            'there are eggs'
+        ]
+
+    def test_flags_changes_to_code_run_on_import_as_structural(self,
+                                                               watched_provider: Any) -> None:
+        # Given
+        (watched_provider / 'handlers.py').write_text(IMPORT_TIME_HANDLERS_SOURCE)
+        reloader = FaasportReloader('watched_provider.faasport')
+        _edit(watched_provider / 'handlers.py', "'hümpty'", "'dümpty'")
+
+        # When
+        reload = reloader.reload(reloader.poll())
+
+        # Then
+        assert reload.code_change.structural
+        assert reload.code_change.affects(frozenset())
+        assert reload.faasport_module.faasport(Request({}, '/egg', 'GET')) == Response(
+            headers={}, status=200, body={'egg': 'dümpty'}
+        )
+
+    def test_retries_after_a_failed_reload(self, watched_provider: Any) -> None:
+        # Given
+        reloader = FaasportReloader('watched_provider.faasport')
+        faasport = reloader.faasport_module.faasport
+        _edit(watched_provider / 'handlers.py', 'def get_user(request):', 'def get_user(request)')
+
+        # When
+        with pytest.raises(SyntaxError):
+            reloader.reload(reloader.poll())
+        faasport_after_failure = reloader.faasport_module.faasport
+        pending_paths = reloader.poll()
+        _edit(watched_provider / 'handlers.py', 'def get_user(request)', 'def get_user(request):')
+        reload = reloader.reload(reloader.poll())
+
+        # Then
+        assert faasport_after_failure is faasport
+        assert pending_paths == {str(watched_provider / 'handlers.py')}
+        assert reloader.faasport_module.faasport is not faasport
+        assert reload.faasport_module.faasport(Request({}, '/user', 'GET')) == Response(
+            headers={}, status=200, body={'user': 'gabe'}
+        )
+
+
+def _edit(path: Any, old: str, new: str) -> None:
+    source = path.read_text()
+    assert old in source
+    path.write_text(source.replace(old, new))
+    # Make sure the edit shows up on filesystems with coarse modification times.
+    stat = os.stat(str(path))
+    os.utime(str(path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
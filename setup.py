@@ -1,3 +1,5 @@
+import re
+
 from pipenv.project import Project
 from pipenv.utils import convert_deps_to_pip
 
@@ -9,12 +11,15 @@ requirements = convert_deps_to_pip(pipfile['packages'], r=False)
 with open('README.md', 'r') as readme:
     long_description = readme.read()
 
+with open('faaspact_verifier/__init__.py', 'r') as init:
+    version = re.search(r"^__version__ = '(.+)'$", init.read(), re.MULTILINE).group(1)
+
 setup(
     name='faaspact-verifier',
-    version='0.0.7',
+    version=version,
     description='Verify pacts for python faas microservices.',
     url='https://github.com/zhammer/faaspact-verifier',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks']),
     package_data={'faaspact_verifier': ['py.typed']},
     entry_points={
         'console_scripts': ['faaspact-verifier=faaspact_verifier.delivery.cli:cli']